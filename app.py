@@ -4,10 +4,8 @@
 import os, sys
 from functools import partial
 from numbers import Number
-import matplotlib
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget
-import qdarktheme
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QGridLayout
 
 __doc__     = "Calculator and Math Helper"
 __version__ = "0.1.3"
@@ -16,9 +14,8 @@ PTH_APP = os.path.dirname(os.path.realpath(__file__))
 sys.path.append(os.path.join(PTH_APP, 'data'))
 
 # ---- Local addins
+# generic_widgets (matplotlib, shapely) is imported when a tab is first shown; see MainWindow.loadTab
 from _global_ import *
-matplotlib.use('Qt5Agg')
-from generic_widgets import QCalcWidget, QTriangle_Solver
 import mainWindow
     
 class MainWindow(QMainWindow, mainWindow.Ui_MainWindow):
@@ -26,31 +23,75 @@ class MainWindow(QMainWindow, mainWindow.Ui_MainWindow):
         super().__init__(None)
         self.setupUi(self)
         self.setWindowTitle(__doc__)
-        self.show()
         self._app  = app
 
         # add custom widgets
         self.tabWidget:QTabWidget
         self.tabWidget.setTabText(0,'Calculator')
         self.tabWidget.setTabText(1,'Triangle solver')
+        self.tab_3 = QWidget()
+        self.gridLayout_4 = QGridLayout(self.tab_3)
+        self.tabWidget.addTab(self.tab_3, 'Graph')
 
+        # tab widgets are built the first time their tab is shown; the window comes up first
+        self._calc = None
+        self.triangle_solver = None
+        self.graph = None
+        self.__tabBuilders = {self.tabWidget.indexOf(self.tab):self.__buildCalculator,
+                              self.tabWidget.indexOf(self.tab_2):self.__buildTriangleSolver,
+                              self.tabWidget.indexOf(self.tab_3):self.__buildGraph}
+        self.tabWidget.currentChanged.connect(self.loadTab)
+        self.show()
+        self._app.processEvents() # paint the empty window before the current tab is built
+        QTimer.singleShot(0, partial(self.loadTab, self.tabWidget.currentIndex()))
+        return
+    
+    def loadTab(self, index:int):
+        '''build the widget of tab index if it has not been built yet'''
+        build = self.__tabBuilders.pop(index, None)
+        if build is not None:
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                build()
+            finally:
+                QApplication.restoreOverrideCursor()
+        return
+    
+    def __buildCalculator(self):
+        from generic_widgets import QCalcWidget
         self._calc = QCalcWidget(self.tab)
+        return
+    
+    def __buildTriangleSolver(self):
+        from generic_widgets import QTriangle_Solver
         self.triangle_solver = QTriangle_Solver(self.tab_2)
         return
     
+    def __buildGraph(self):
+        from generic_widgets import QGraphWidget
+        self.graph = QGraphWidget(self.tab_3)
+        return
+    
     def closeEvent(self, event):
         self._app.quit()
         return sys.exit()
 
 
+def setupTheme():
+    '''dark/light theme; qdarktheme is slow to import so this runs from the event loop once the window is up'''
+    try:
+        import qdarktheme
+        qdarktheme.setup_theme("auto")
+    except Exception as e:
+        QMessageBox.information(None,"System Information Notification",f'Could not utilize theme ...\n{e}')
+    return
+
+
 if __name__ == '__main__':
     try:
         app = QApplication(sys.argv)
-        try:
-            qdarktheme.setup_theme("auto")
-        except Exception as e:
-            QMessageBox.information(None,"System Information Notification",f'Could not utilize theme ...\n{e}')        
         navForm = MainWindow(app)
+        QTimer.singleShot(0, setupTheme) # after the first tab is built
         sys.exit(app.exec_())   
 
     except KeyboardInterrupt:
@@ -0,0 +1,160 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, csv, json, argparse, itertools, typing
+import numpy as np
+
+__doc__     = '''Headless batch triangle solver
+
+reads triangle specs from CSV or JSONL (a file or stdin) and streams the solved triangles out
+chunk by chunk, so memory stays the same however long the input is
+
+  CSV   : method,v1,v2,v3                       e.g. SSS,4,3,5
+          coords,"x1,y1","x2,y2","x3,y3"        e.g. coords,"0,0","3,4","3,0"
+          coords,x1,y1,x2,y2,x3,y3
+  JSONL : {"method": "SSS", "values": [4, 3, 5]}
+          {"method": "coords", "values": [[0, 0], [3, 4], [3, 0]]}
+
+methods: SSS, SAS, ASA, AAS, SSA (values in the same order as the Triangle.solve_* methods) and coords;
+lines starting with # and a "method" header line are skipped'''
+__version__ = "0.1.0"
+
+PTH_APP = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins (no Qt/matplotlib; only the geometry)
+from geometric_objects import TriangleBatch
+
+METHODS = ('SSS', 'SAS', 'ASA', 'AAS', 'SSA', 'coords')
+STATUS  = {TriangleBatch.STATUS_OK:'ok', TriangleBatch.STATUS_NOT_SOLVED:'not_solved', TriangleBatch.STATUS_SIDE:'side',
+           TriangleBatch.STATUS_INEQUALITY:'inequality', TriangleBatch.STATUS_ANGLE_SUM:'angle_sum',
+           TriangleBatch.STATUS_DOMAIN:'domain'}
+FIELDS  = ['row', 'method', 'status', 'side_a', 'side_b', 'side_c', 'angle_a', 'angle_b', 'angle_c',
+           'area', 'perimeter', 'inradius', 'ax', 'ay', 'bx', 'by', 'cx', 'cy']
+
+def parse_csv(line:str) -> tuple[str, list]:
+    fields = next(csv.reader([line]))
+    method, vals = fields[0].strip(), [f.strip() for f in fields[1:]]
+    if method == 'coords':
+        if len(vals) == 3: # "x,y" per point like the triangle solver coordinate entry
+            vals = list(itertools.chain.from_iterable(v.split(',') for v in vals))
+        if len(vals) != 6:
+            raise ValueError(f"coords needs 3 x,y points, got {len(vals)} values")
+        v = [float(i) for i in vals]
+        return method, [(v[0], v[1]), (v[2], v[3]), (v[4], v[5])]
+    if len(vals) != 3:
+        raise ValueError(f"{method} needs 3 values, got {len(vals)}")
+    return method, [float(i) for i in vals]
+
+def parse_jsonl(line:str) -> tuple[str, list]:
+    d = json.loads(line)
+    method, vals = d['method'], d['values']
+    if len(vals) != 3:
+        raise ValueError(f"{method} needs 3 values, got {len(vals)}")
+    if method == 'coords':
+        return method, [(float(x), float(y)) for x, y in vals]
+    return method, [float(i) for i in vals]
+
+def read_specs(lines:typing.Iterable[str], fmt:str) -> typing.Iterator[tuple[int, str, list|None, str|None]]:
+    '''(row number, method, values, error) per input line; values is None when the line could not be read'''
+    parse = parse_jsonl if fmt == 'jsonl' else parse_csv
+    for row, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#') or line.lower().startswith('method'):
+            continue
+        try:
+            method, vals = parse(line)
+            if method.startswith('solve_'): method = method[6:]
+            if method not in METHODS:
+                raise ValueError(f"unknown method '{method}'")
+            yield row, method, vals, None
+        except Exception as e:
+            yield row, None, None, f"{type(e).__name__}: {e}"
+
+def solve_chunk(chunk:list[tuple[int, str, list|None, str|None]]) -> list[dict]:
+    '''solve one chunk of specs, grouped by method through TriangleBatch; results in input order'''
+    out:list[dict] = [None]*len(chunk)
+    groups:dict[str, list[int]] = {}
+    for i, (row, method, vals, err) in enumerate(chunk):
+        if vals is None:
+            out[i] = {'row':row, 'method':method, 'status':'invalid_input', 'error':err}
+        else:
+            groups.setdefault(method, []).append(i)
+
+    for method, idx in groups.items():
+        vals = np.array([chunk[i][2] for i in idx], dtype=float)
+        tb = TriangleBatch()
+        getattr(tb, f'solve_{method}')(vals[:,0], vals[:,1], vals[:,2])
+        d  = tb.get_data()
+        xy = tb.triangle_coords.reshape(len(idx), 6)
+        cols = np.column_stack([d['side_a'], d['side_b'], d['side_c'], d['angle_a'], d['angle_b'], d['angle_c'],
+                                d['area'], d['perimeter'], d['inradius'], xy]).tolist()
+        for j, i in enumerate(idx):
+            rec = {'row':chunk[i][0], 'method':method, 'status':STATUS[int(tb.status[j])]}
+            rec.update(zip(FIELDS[3:], cols[j]))
+            out[i] = rec
+    return out
+
+class Writer():
+    '''streams result records out as CSV or JSONL'''
+    def __init__(self, stream:typing.TextIO, fmt:str) -> None:
+        self.__stream = stream
+        self.__fmt    = fmt
+        if fmt == 'csv':
+            self.__csv = csv.DictWriter(stream, FIELDS+['error'], restval='', lineterminator='\n')
+            self.__csv.writeheader()
+        return
+    
+    def write(self, records:list[dict]):
+        if self.__fmt == 'csv':
+            # NaN for unsolved rows is left blank
+            self.__csv.writerows({k:('' if isinstance(v, float) and v != v else v) for k, v in r.items()} for r in records)
+        else:
+            for r in records:
+                self.__stream.write(json.dumps({k:(None if isinstance(v, float) and v != v else v) for k, v in r.items()})+'\n')
+        self.__stream.flush()
+        return
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', nargs='?', default='-', help="CSV/JSONL file of triangle specs; '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="file to write results to; '-' for stdout (default)")
+    parser.add_argument('-f', '--format', choices=['csv', 'jsonl'], help='input format; from the file extension or the first line that is not blank or a # comment when not given')
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], help='output format; same as the input when not given')
+    parser.add_argument('-c', '--chunk-size', type=int, default=10_000, help='specs solved per chunk (default 10000)')
+    parser.add_argument('--version', action='version', version=__version__)
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == '-' else open(args.input, 'r', newline='', encoding='utf-8')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        lines = iter(src)
+        fmt   = args.format
+        if fmt is None and args.input != '-':
+            ext = os.path.splitext(args.input)[1].lower()
+            fmt = {'.jsonl':'jsonl', '.json':'jsonl', '.ndjson':'jsonl', '.csv':'csv'}.get(ext)
+        if fmt is None: # peek the first line with a spec (or the header) on it
+            skipped = []
+            for first in lines:
+                skipped.append(first)
+                if first.strip() and not first.lstrip().startswith('#'):
+                    break
+            fmt   = 'jsonl' if skipped and skipped[-1].lstrip().startswith('{') else 'csv'
+            lines = itertools.chain(skipped, lines)
+        
+        out   = Writer(dst, args.output_format or fmt)
+        specs = read_specs(lines, fmt)
+        while True:
+            chunk = list(itertools.islice(specs, max(args.chunk_size, 1)))
+            if not chunk:
+                break
+            out.write(solve_chunk(chunk))
+    except BrokenPipeError:
+        pass
+    finally:
+        if src is not sys.stdin: src.close()
+        if dst is not sys.stdout: dst.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
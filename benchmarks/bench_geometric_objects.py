@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+'''
+Benchmark suite for geometric_objects
+
+    python benchmarks/bench_geometric_objects.py                       run and print
+    python benchmarks/bench_geometric_objects.py -o results.json       also record the results
+    python benchmarks/bench_geometric_objects.py --save-baseline       record the results as the baseline
+    python benchmarks/bench_geometric_objects.py --threshold 0.25      fail when a case is 25% slower than the baseline
+
+every case runs over the same seeded random triangles; the time reported is the best of --repeat rounds,
+in microseconds per call. When the baseline file exists the run is compared against it and exits with 1
+if any case got slower than the threshold allows. The baseline (benchmarks/baseline_geometric_objects.json)
+is per machine and is not committed
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, argparse, json, math, platform, random, time, typing
+from datetime import datetime
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+PTH_BASELINE = os.path.join(PTH_APP, 'benchmarks', 'baseline_geometric_objects.json')
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+from geometric_objects import Line_Segment, Triangle
+
+#region seeded generators
+def random_points(rnd:random.Random, count:int) -> list[tuple[tuple[float,float],tuple[float,float],tuple[float,float]]]:
+    '''non-degenerate triangles as 3 points each'''
+    rtn = []
+    while len(rtn) < count:
+        A, B, C = [(rnd.uniform(-50, 50), rnd.uniform(-50, 50)) for _ in range(3)]
+        area = abs((B[0]-A[0])*(C[1]-A[1])-(C[0]-A[0])*(B[1]-A[1]))/2
+        if area > 1:
+            rtn.append((A, B, C))
+    return rtn
+
+def random_specs(seed:int, count:int) -> dict[str, list[tuple]]:
+    '''valid inputs for every solve method, all from the same random triangles'''
+    rnd   = random.Random(seed)
+    specs = {'SSS':[], 'SAS':[], 'ASA':[], 'AAS':[], 'SSA':[], 'coords':[]}
+    for A, B, C in random_points(rnd, count):
+        a, b, c = math.dist(B, C), math.dist(A, C), math.dist(A, B)
+        Aϴ = math.degrees(math.acos((b*b+c*c-a*a)/(2*b*c)))
+        Bϴ = math.degrees(math.acos((c*c+a*a-b*b)/(2*c*a)))
+        specs['SSS'].append((a, b, c))
+        specs['SAS'].append((b, Aϴ, c))
+        specs['ASA'].append((Aϴ, c, Bϴ))
+        specs['AAS'].append((Aϴ, Bϴ, a))
+        specs['SSA'].append((a, b, Aϴ))
+        specs['coords'].append((A, B, C))
+    return specs
+#endregion
+
+#region cases
+def cases(specs:dict[str, list[tuple]]) -> dict[str, tuple]:
+    '''
+    name: (function running the case once over every spec, calls per run[, setup run untimed before each round])
+    '''
+    n = len(specs['SSS'])
+    rtn = {}
+    for method, values in specs.items():
+        def solve(method=method, values=values):
+            for v in values:
+                getattr(Triangle(), f'solve_{method}')(*v)
+        rtn[f'Triangle.solve_{method}'] = (solve, n)
+
+    solved = []
+    def solve_all():
+        # fresh triangles every round; get_data is cached after its first call
+        solved.clear()
+        for v in specs['SSS']:
+            t = Triangle()
+            t.solve_SSS(*v)
+            solved.append(t)
+        return
+    solve_all()
+    
+    def get_data():
+        for t in solved:
+            t.get_data()
+    rtn['Triangle.get_data'] = (get_data, n, solve_all)
+
+    def get_data_fresh():
+        for v in specs['coords']:
+            t = Triangle()
+            t.solve_coords(*v)
+            t.get_data()
+    rtn['Triangle.solve_coords+get_data'] = (get_data_fresh, n)
+
+    def triangle_coords():
+        for t in solved:
+            t.triangle_coords
+    rtn['Triangle.triangle_coords'] = (triangle_coords, n)
+
+    lines = []
+    for A, B, C in specs['coords']:
+        l = Line_Segment()
+        l.solve_points(A, B)
+        lines.append(l)
+    for prop in ['length', 'mid_point', 'slope', 'y_intercept', 'coords', 'start_point', 'end_point']:
+        def line_prop(prop=prop):
+            for l in lines:
+                getattr(l, prop)
+        rtn[f'Line_Segment.{prop}'] = (line_prop, n)
+    
+    def line_data():
+        for l in lines:
+            l.get_data()
+    rtn['Line_Segment.get_data'] = (line_data, n)
+
+    psl = [(A, (B[1]-A[1])/(B[0]-A[0] or 1), math.dist(A, B)) for A, B, C in specs['coords']]
+    def get_psl():
+        seg = Line_Segment()
+        for p, m, d in psl:
+            seg.get_PSL_points(p, m, d)
+    rtn['Line_Segment.get_PSL_points'] = (get_psl, n)
+    return rtn
+#endregion
+
+def run(seed:int, count:int, repeat:int, only:str=None) -> dict[str, float]:
+    '''best microseconds per call of every case'''
+    rtn = {}
+    for name, (func, calls, *setup) in cases(random_specs(seed, count)).items():
+        if only and only not in name: continue
+        best = math.inf
+        for _ in range(repeat):
+            for prepare in setup:
+                prepare()
+            t = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter()-t)
+        rtn[name] = best/calls*1e6
+    return rtn
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--count', type=int, default=2_000, help='random triangles per case')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='rounds per case; the best is kept')
+    parser.add_argument('-s', '--seed', type=int, default=101)
+    parser.add_argument('-k', '--only', help='run only cases with this text in the name')
+    parser.add_argument('-o', '--output', help='JSON file to record the results in')
+    parser.add_argument('--baseline', default=PTH_BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='record this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.20, help='allowed slowdown over the baseline (0.20 = 20%%)')
+    args = parser.parse_args(argv)
+
+    results = run(args.seed, args.count, args.repeat, args.only)
+    record  = {'created':datetime.now().isoformat(timespec='seconds'), 'python':platform.python_version(),
+               'machine':platform.machine(), 'seed':args.seed, 'count':args.count, 'unit':'us/call', 'results':results}
+
+    baseline = None
+    if not args.save_baseline and os.path.isfile(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    failed = []
+    print(f"{'case':<34} {'us/call':>10} {'baseline':>10} {'change':>8}")
+    for name, us in results.items():
+        line = f"{name:<34} {us:>10.3f}"
+        if baseline and name in baseline:
+            change = us/baseline[name]-1
+            flag   = ''
+            if change > args.threshold:
+                flag = '  REGRESSION'
+                failed.append(name)
+            line += f" {baseline[name]:>10.3f} {change:>+7.1%}{flag}"
+        print(line)
+
+    for path in [args.output, args.baseline if args.save_baseline else None]:
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, indent=2)
+            print(f"\nresults written to {path}")
+    
+    if failed:
+        print(f"\n{len(failed)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+'''
+GUI latency benchmark; runs MainWindow headless on the Qt offscreen platform
+
+    python benchmarks/bench_gui.py [-n 200] [--json results.json]
+
+drives the widgets the same way a click would and reports p50/p95/p99 latency in milliseconds per interaction:
+    triangle : _solveTriangle (Solve button), _reloadValues (precision spinBox), _renderGraph (radio toggles)
+    calc     : keypad button clicks and calculate (= button, until the result is on the display; formulas that
+               don't fold to a constant are worked out in a worker process)
+"total" includes the matplotlib canvas draw and the Qt events that follow, i.e. until the pixels are updated
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, argparse, json, random, tempfile, time, typing
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('CALC_HISTORY', os.path.join(tempfile.mkdtemp(), 'history.sqlite3')) # keep the user's history out of it
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, PTH_APP)
+
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+def percentile(values:list[float], p:float) -> float:
+    s = sorted(values)
+    k = (len(s)-1)*p/100
+    f = int(k)
+    c = min(f+1, len(s)-1)
+    return s[f]+(s[c]-s[f])*(k-f)
+
+class Timings():
+    def __init__(self) -> None:
+        self.data:dict[str, dict[str, list[float]]] = {}
+    
+    def add(self, name:str, handler:float, draw:float):
+        d = self.data.setdefault(name, {'handler':[], 'draw':[], 'total':[]})
+        d['handler'].append(handler*1000)
+        d['draw'].append(draw*1000)
+        d['total'].append((handler+draw)*1000)
+        return
+
+    def report(self) -> dict[str, dict[str, float]]:
+        rtn = {}
+        print(f"{'interaction':<26} {'n':>5} {'handler p50':>12} {'draw p50':>9} {'total p50':>10} {'p95':>8} {'p99':>8}")
+        for name, d in self.data.items():
+            t = d['total']
+            rtn[name] = {'n':len(t), 'handler_p50':percentile(d['handler'], 50), 'draw_p50':percentile(d['draw'], 50),
+                         'p50':percentile(t, 50), 'p95':percentile(t, 95), 'p99':percentile(t, 99)}
+            r = rtn[name]
+            print(f"{name:<26} {r['n']:>5} {r['handler_p50']:>12.2f} {r['draw_p50']:>9.2f} {r['p50']:>10.2f} {r['p95']:>8.2f} {r['p99']:>8.2f}")
+        return rtn
+
+def measure(app:QApplication, timings:Timings, name:str, action:typing.Callable, canvas=None,
+            done:typing.Callable[[], bool]=None, timeout:float=10.):
+    '''
+    time action, then the canvas draw and pending Qt events it caused.
+    With `done` the handler time runs until done() is true (results that come back through Qt signals)
+    '''
+    t0 = time.perf_counter()
+    action()
+    if done is not None:
+        while not done() and time.perf_counter()-t0 < timeout:
+            app.processEvents()
+    t1 = time.perf_counter()
+    if canvas is not None:
+        canvas.draw()
+    app.processEvents()
+    t2 = time.perf_counter()
+    timings.add(name, t1-t0, t2-t1)
+    return
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--count', type=int, default=200, help='samples per interaction')
+    parser.add_argument('-s', '--seed', type=int, default=101)
+    parser.add_argument('--json', help='write the percentiles to this JSON file')
+    args = parser.parse_args(argv)
+
+    # nothing can click a message box here
+    for name in ('information', 'warning', 'critical'):
+        setattr(QMessageBox, name, staticmethod(lambda *a, **k: None))
+
+    import app as calc_app
+    qt  = QApplication(sys.argv[:1])
+    win = calc_app.MainWindow(qt)
+    for i in range(win.tabWidget.count()):
+        win.loadTab(i)
+    qt.processEvents()
+
+    timings = Timings()
+    rnd     = random.Random(args.seed)
+
+    # ---- triangle solver
+    ts     = win.triangle_solver
+    canvas = ts._cnvs.canvas
+    ts.radioButton_2.setChecked(True) # SSS
+    for _ in range(args.count):
+        a, b = rnd.uniform(1, 20), rnd.uniform(1, 20)
+        c = rnd.uniform(abs(a-b)+.1, a+b-.1)
+        ts.lineEdit.setText(f'{a:.3f}')
+        ts.lineEdit_2.setText(f'{b:.3f}')
+        ts.lineEdit_3.setText(f'{c:.3f}')
+        measure(qt, timings, 'triangle solve (new)', ts._solveTriangle, canvas)
+        measure(qt, timings, 'triangle solve (same)', ts._solveTriangle, canvas)
+        measure(qt, timings, 'triangle reload values', ts._reloadValues, canvas)
+        measure(qt, timings, 'triangle render graph', ts._renderGraph, canvas)
+        radio = rnd.choice([ts.radioButton_9, ts.radioButton_10, ts.radioButton_11, ts.radioButton_12])
+        measure(qt, timings, 'triangle point labels', radio.click, canvas)
+
+    # ---- calculator
+    calc = win._calc
+    keys = {'0':calc.pushButton, '1':calc.pushButton_4, '2':calc.pushButton_5, '3':calc.pushButton_6,
+            '4':calc.pushButton_7, '5':calc.pushButton_8, '6':calc.pushButton_9, '7':calc.pushButton_14,
+            '8':calc.pushButton_15, '9':calc.pushButton_16, '+':calc.pushButton_10, '-':calc.pushButton_11,
+            '*':calc.pushButton_12, '/':calc.pushButton_13, '.':calc.pushButton_2}
+    for _ in range(args.count):
+        for ch in f"{rnd.randint(1, 999)}{rnd.choice('+-*/')}{rnd.randint(1, 999)}":
+            measure(qt, timings, 'calc keypad', keys[ch].click)
+        measure(qt, timings, 'calc sin()', calc._pb_sin.click)
+        shown = calc.textEdit.toPlainText()
+        measure(qt, timings, 'calc calculate', calc.pushButton_28.click,
+                done=lambda: calc.pushButton_28.text() == 'SOLVE' and calc.textEdit.toPlainText() != shown)
+        # x/0 doesn't fold, so it makes the round trip through a worker; the error clears the display
+        calc.clear_current()
+        for ch in f"{rnd.randint(1, 999)}/0":
+            keys[ch].click()
+        qt.processEvents()
+        measure(qt, timings, 'calc calculate (worker)', calc.pushButton_28.click,
+                done=lambda: calc.pushButton_28.text() == 'SOLVE' and not calc.textEdit.toPlainText())
+
+    results = timings.report()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'unit':'ms', 'results':results}, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+'''
+Micro-benchmark of Line_Segment properties against the previous shapely-backed segment
+
+    python benchmarks/bench_line_segment.py [-n LOOPS]
+
+prints the per-call time of each property for both implementations and the memory used per instance
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, gc, argparse, timeit
+from shapely import LineString
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+from geometric_objects import Line_Segment
+
+class ShapelyLineSegment():
+    '''the old Line_Segment property code; everything is read back out of the LineString'''
+    def __init__(self):
+        self.__lineString:LineString = None
+
+    def solve_points(self, start_point, end_point):
+        self.__lineString = LineString([start_point, end_point])
+
+    @property
+    def coords(self):
+        return list(self.__lineString.coords)
+    @property
+    def start_point(self):
+        return self.coords[0]
+    @property
+    def end_point(self):
+        return self.coords[1]
+    @property
+    def mid_point(self):
+        x1, y1 = self.start_point
+        x2, y2 = self.end_point
+        return ((x1+x2)/2, (y1+y2)/2)
+    @property
+    def slope(self):
+        c = self.coords
+        if not None in c:
+            x1,y1 = self.start_point
+            x2,y2 = self.end_point
+            x,y   = (y2-y1),(x2-x1)
+            try:
+                return y/x
+            except Exception as e:
+                return f"{y}/{x}"
+        return None
+    @property
+    def y_intercept(self):
+        m   = self.slope
+        x,y = self.start_point
+        return y-(m*x)
+    @property
+    def length(self):
+        return self.__lineString.length
+
+PROPERTIES = ['coords', 'start_point', 'end_point', 'mid_point', 'slope', 'y_intercept', 'length']
+
+def _rss() -> int:
+    '''resident memory of this process in bytes; GEOS allocates outside of python so tracemalloc cant see it'''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1])*os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import psutil # non-linux; pip install psutil
+        return psutil.Process().memory_info().rss
+
+def instance_memory(cls, count:int=200_000) -> float:
+    '''average bytes of resident memory per solved instance'''
+    gc.collect()
+    before = _rss()
+    items = []
+    for i in range(count):
+        l = cls()
+        l.solve_points((i, 0.5*i), (i+3.0, 2.0*i+1))
+        items.append(l)
+    after = _rss()
+    del items
+    return (after-before)/count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--loops', type=int, default=20_000, help='calls per property')
+    args = parser.parse_args(argv)
+
+    old = ShapelyLineSegment()
+    old.solve_points((1.0, 2.0), (4.0, 8.0))
+    new = Line_Segment()
+    new.solve_points((1.0, 2.0), (4.0, 8.0))
+
+    print(f"{'property':<12} {'shapely (us)':>13} {'slots (us)':>11} {'speedup':>8}")
+    for name in PROPERTIES:
+        t_old = min(timeit.repeat(f'l.{name}', globals={'l':old}, number=args.loops, repeat=3))/args.loops*1e6
+        t_new = min(timeit.repeat(f'l.{name}', globals={'l':new}, number=args.loops, repeat=3))/args.loops*1e6
+        print(f"{name:<12} {t_old:>13.3f} {t_new:>11.3f} {t_old/t_new:>7.1f}x")
+
+    m_new = instance_memory(Line_Segment)
+    m_old = instance_memory(ShapelyLineSegment)
+    print(f"\nmemory per instance: shapely {m_old:,.0f} B, slots {m_new:,.0f} B, saved {m_old-m_new:,.0f} B")
+    return
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+'''
+Scaling benchmark of batch_parallel.solve_parallel
+
+    python benchmarks/bench_parallel.py [-n 5000000] [--workers 1 2 4 8] [--chunk-size 250000]
+
+solves the same seeded random SSS batch with each worker count and reports the throughput;
+the single process TriangleBatch time (solve plus every output column) is the baseline for the speedup column
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, argparse, time
+import numpy as np
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+from geometric_objects import TriangleBatch
+from batch_parallel import solve_parallel
+from triangle_store import batch_columns
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--count', type=int, default=5_000_000, help='triangles per run')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    parser.add_argument('--method', default='SSS', choices=['SSS', 'SAS', 'ASA', 'AAS', 'SSA'])
+    args = parser.parse_args(argv)
+
+    rng    = np.random.default_rng(0)
+    values = rng.uniform(1, 10, (args.count, 3))
+    if args.method in ('SAS', 'SSA'): values[:,1 if args.method == 'SAS' else 2] *= 10 # angle in degrees
+    if args.method in ('ASA', 'AAS'): values[:,[0, 2] if args.method == 'ASA' else [0, 1]] *= 8
+
+    t = time.perf_counter()
+    tb = TriangleBatch()
+    getattr(tb, f'solve_{args.method}')(values[:,0], values[:,1], values[:,2])
+    batch_columns(tb) # the workers fill every column too
+    base = time.perf_counter()-t
+    print(f"{os.cpu_count()} cpus; {args.count:,} {args.method} triangles, chunks of {args.chunk_size:,}")
+    print(f"{'workers':>8} {'seconds':>9} {'tri/s':>12} {'speedup':>8}")
+    print(f"{'inline':>8} {base:>9.3f} {args.count/base:>12,.0f} {1:>7.2f}x")
+    for w in args.workers:
+        t = time.perf_counter()
+        with solve_parallel(args.method, values, workers=w, chunk_size=args.chunk_size) as res:
+            elapsed = time.perf_counter()-t
+            assert np.array_equal(res['status'], tb.status)
+        print(f"{w:>8} {elapsed:>9.3f} {args.count/elapsed:>12,.0f} {base/elapsed:>7.2f}x")
+    return
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+'''
+Benchmark of the sweep_intersections sweep line against brute-force pairwise Line_Segment.crosses()
+
+    python benchmarks/bench_sweep.py [--sizes 1000 10000 100000] [--brute-limit 2000]
+
+segments are random in the unit square with length 2/√n, so the number of crossings grows with n.
+Brute force is timed in full up to --brute-limit segments; past that a sample of pairs is timed and scaled
+to the n(n-1)/2 pairs (marked with ~)
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, argparse, time, random
+import numpy as np
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+from geometric_objects import Line_Segment
+from geometric_sets import sweep_intersections
+
+def random_segments(n:int, seed:int=0) -> list[Line_Segment]:
+    rng   = np.random.default_rng(seed)
+    start = rng.uniform(0, 1, (n, 2))
+    ang   = rng.uniform(0, np.pi, n)
+    end   = start+(2/np.sqrt(n))*np.column_stack([np.cos(ang), np.sin(ang)])
+    end[:n//20, 0] = start[:n//20, 0] # some vertical segments too
+    rtn = []
+    for (x1, y1), (x2, y2) in zip(start.tolist(), end.tolist()):
+        l = Line_Segment()
+        l.solve_points((x1, y1), (x2, y2))
+        rtn.append(l)
+    return rtn
+
+def brute_force(segments:list[Line_Segment]) -> int:
+    geoms = [s.geometry for s in segments]
+    found = 0
+    for i in range(len(segments)):
+        s = segments[i]
+        for j in range(i+1, len(segments)):
+            if s.crosses(geoms[j]):
+                found += 1
+    return found
+
+def brute_force_estimate(segments:list[Line_Segment], sample:int=200_000) -> float:
+    '''seconds for all pairs, scaled from timing a random sample of pairs'''
+    n     = len(segments)
+    rnd   = random.Random(0)
+    pairs = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(sample)]
+    geoms = [s.geometry for s in segments]
+    t = time.perf_counter()
+    for i, j in pairs:
+        segments[i].crosses(geoms[j])
+    return (time.perf_counter()-t)/sample*(n*(n-1)/2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--brute-limit', type=int, default=2_000, help='largest n brute force is run in full')
+    args = parser.parse_args(argv)
+
+    print(f"{'n':>8} {'points':>8} {'sweep (s)':>10} {'brute (s)':>11} {'speedup':>9}")
+    for n in args.sizes:
+        segments = random_segments(n)
+        t = time.perf_counter()
+        found = sweep_intersections(segments)
+        t_sweep = time.perf_counter()-t
+
+        if n <= args.brute_limit:
+            t = time.perf_counter()
+            brute_force(segments)
+            t_brute = time.perf_counter()-t
+            mark = ' '
+        else:
+            t_brute = brute_force_estimate(segments)
+            mark = '~'
+        print(f"{n:>8} {len(found):>8} {t_sweep:>10.3f} {mark}{t_brute:>10.3f} {t_brute/t_sweep:>8.1f}x")
+    return
+
+if __name__ == '__main__':
+    main()
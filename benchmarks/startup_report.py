@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+'''
+Startup budget report for app.py
+
+    python benchmarks/startup_report.py [--window-budget 500] [--import-budget 300] [--top 15]
+
+runs app.py in a child process with `python -X importtime` (Qt offscreen platform unless --platform says
+otherwise) and reports
+    - time until the main window is shown, and until the first tab is built
+    - the import time spent before the window was shown, with the heaviest modules
+exits with 1 when a budget (milliseconds) is exceeded
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, argparse, subprocess, re
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# runs in the child: app.py as `python app.py` would, with marks written when the event loop starts (the window is
+# up by then) and when the first tab is built, then a quit. message boxes are swallowed so nothing waits on a click
+CHILD = r'''
+import sys, time, runpy
+t0 = time.perf_counter()
+sys.argv = [{script!r}]
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication, QMessageBox
+for name in ('information', 'warning', 'critical'):
+    setattr(QMessageBox, name, staticmethod(lambda *a, **k: None))
+def mark(name):
+    sys.stderr.write(f"STARTUP {{name}} {{(time.perf_counter()-t0)*1000:.1f}}\n")
+    sys.stderr.flush()
+exec_ = QApplication.exec_
+def timed_exec():
+    qt = QApplication.instance()
+    mark('window_shown')
+    def first_tab():
+        if any(getattr(w, '_calc', None) or getattr(w, 'triangle_solver', None) for w in qt.topLevelWidgets()):
+            mark('first_tab')
+            QTimer.singleShot(0, qt.quit) # after the deferred startup work (theme) already queued
+        else:
+            QTimer.singleShot(1, first_tab)
+    QTimer.singleShot(0, first_tab)
+    return exec_()
+QApplication.exec_ = staticmethod(timed_exec)
+try:
+    runpy.run_path({script!r}, run_name='__main__')
+except SystemExit:
+    pass
+'''
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def run(platform:str) -> tuple[dict[str, float], list[tuple[int, int, str]]]:
+    env = dict(os.environ, QT_QPA_PLATFORM=platform)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD.format(script=os.path.join(PTH_APP, 'app.py'))],
+                          env=env, cwd=PTH_APP, capture_output=True, text=True, timeout=300)
+    marks:dict[str, float] = {}
+    before:list[tuple[int, int, str]] = [] # (cumulative us, depth, module) imported before the window showed
+    for line in proc.stderr.splitlines():
+        if line.startswith('STARTUP '):
+            _, name, ms = line.split()
+            marks[name] = float(ms)
+            continue
+        m = IMPORT_LINE.match(line)
+        if m and 'window_shown' not in marks:
+            before.append((int(m.group(2)), len(m.group(3))//2, m.group(4)))
+    if proc.returncode != 0 or 'first_tab' not in marks:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"app did not start (exit {proc.returncode})")
+    return marks, before
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--window-budget', type=float, default=500, help='ms until the main window is shown')
+    parser.add_argument('--import-budget', type=float, default=300, help='ms of imports before the window is shown')
+    parser.add_argument('--top', type=int, default=15, help='heaviest imports to list')
+    parser.add_argument('--platform', default='offscreen', help='QT_QPA_PLATFORM for the child')
+    args = parser.parse_args(argv)
+
+    marks, before = run(args.platform)
+    top_level = sum(cum for cum, depth, _ in before if depth == 0)/1000
+
+    print(f"window shown      : {marks['window_shown']:>8.1f} ms (budget {args.window_budget:g})")
+    print(f"first tab built   : {marks['first_tab']:>8.1f} ms")
+    print(f"imports pre-window: {top_level:>8.1f} ms (budget {args.import_budget:g})")
+    print(f"\nheaviest imports before the window showed (cumulative ms)")
+    for cum, depth, name in sorted(before, reverse=True)[:args.top]:
+        print(f"  {cum/1000:>8.1f}  {'  '*depth}{name}")
+    slow = [name for name in ('matplotlib', 'shapely', 'qdarktheme', 'geometric_objects') if any(n == name for _, _, n in before)]
+    if slow:
+        print(f"\nheavy modules imported before the window showed: {', '.join(slow)}")
+
+    over = marks['window_shown'] > args.window_budget or top_level > args.import_budget
+    if over:
+        print("\nSTARTUP BUDGET EXCEEDED")
+    return 1 if over else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
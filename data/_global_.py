@@ -2,7 +2,7 @@
 # =============================================================================
 # CODE IMPORTS
 # =============================================================================
-import os, sys, logging, inspect, math, typing
+import os, sys, logging, logging.handlers, queue, atexit, inspect, math, typing
 from datetime import timedelta, datetime, date
 
 # -- PyQt UI Objects
@@ -16,68 +16,97 @@ PTH_GUI = os.path.join(PTH_DTA, 'ui')
 PTH_FNT = os.path.join(PTH_DTA, 'fonts')
 PTH_IMG = os.path.join(PTH_DTA, 'image')
 PTH_PKL = os.path.join(PTH_DTA, 'settings.pkl')
+PTH_HST = os.environ.get('CALC_HISTORY', os.path.join(PTH_DTA, 'history.sqlite3')) # '' keeps history in memory
 sys.path.insert(0, PTH_GUI)
 sys.path.insert(0, PTH_FNT)
 sys.path.insert(0, PTH_IMG)
 
 # -- logging info
-fmt = '%(asctime)-18s %(levelname)-8s %(message)s'
-dtf = '%m-%d-%Y %H:%M'
-logging.basicConfig(filename='errorLogger.txt',\
-                    format='%(levelname)-8s:%(message)s',\
-                    filemode='w', level=logging.DEBUG,\
-                    datefmt=dtf)
+# records are queued on the calling (GUI) thread and written by a QueueListener thread;
+# level from CALC_LOG_LEVEL (DEBUG, INFO, WARNING ...) or set_logging_level()
+fmt = '%(levelname)-8s:(%(asctime)s) %(objtype)s %(funcName)s() <Line: %(lineno)d>\n%(message)s\n'
+dtf = '%H:%M:%S'
+LOG_FILE = 'errorLogger.txt'
+
+logger = logging.getLogger('calculator')
+logger.propagate = False
+__logQueue = queue.SimpleQueue()
+__logFile = logging.FileHandler(LOG_FILE, mode='w', delay=True)
+__logFile.setFormatter(logging.Formatter(fmt, dtf))
+__logConsole = logging.StreamHandler(sys.stdout)
+__logConsole.setFormatter(logging.Formatter(fmt, dtf))
+__logListener = logging.handlers.QueueListener(__logQueue, __logFile, __logConsole, respect_handler_level=True)
+logger.addHandler(logging.handlers.QueueHandler(__logQueue))
+__logListener.start()
+atexit.register(__logListener.stop)
+
+def set_logging_level(level:int|str):
+    '''
+    set the level of the app logger; below it the log calls return before any record
+    or frame info is built. the console echo is only on at DEBUG
+    '''
+    logger.setLevel(level)
+    __logConsole.setLevel(logging.DEBUG if logger.level == logging.DEBUG else logging.CRITICAL+1)
+    return
 
 def get_logging_level():
-    val = logging.getLogger(__name__).getEffectiveLevel()
+    val = logger.getEffectiveLevel()
     return val
 
-def loggAssistMsg(object, frameRec):
+set_logging_level(os.environ.get('CALC_LOG_LEVEL', 'WARNING').upper())
+
+def loggAssistMsg(object, frameRec=None):
+    '''
+    header text for the message windows
+
+    Parameters
+    ----------
+    object : the caller; its type is shown
+    frameRec : frame, inspect.FrameInfo or None
+        None uses the caller of the function that called this
+    '''
     ts = datetime.now().strftime("%H:%M:%S")
-    frame = frameRec[0]
-    info = inspect.getframeinfo(frame)
-    return "({}) {} {}() <Line: {}>\n".format(ts, type(object), info.function, info.lineno)
+    if frameRec is None:
+        frameRec = sys._getframe(2)
+    elif isinstance(frameRec, inspect.FrameInfo):
+        frameRec = frameRec.frame
+    return "({}) {} {}() <Line: {}>\n".format(ts, type(object), frameRec.f_code.co_name, frameRec.f_lineno)
+
+def __log(level, object, msg):
+    # the caller's function/line are looked up by logging only when the record is made
+    if logger.isEnabledFor(level):
+        logger.log(level, msg, stacklevel=3, extra={'objtype':type(object)})
+    return
 
 # -- user notification windows
+# frameRec is kept for older callers; the caller is found by logging when a record is emitted
 def debugMessageLog(object, frameRec, msg):
-    txt = "{}{}\n".format(loggAssistMsg(object, frameRec), msg)
-    logging.debug(txt)
-    if get_logging_level() == logging.DEBUG:
-        print(txt)
+    __log(logging.DEBUG, object, msg)
     return
 
 def infoMessageLog(object, frameRec, msg):
-    txt = "{}{}\n".format(loggAssistMsg(object, frameRec), msg)
-    logging.info(txt)
-    if get_logging_level() == logging.INFO:
-        print(txt)
+    __log(logging.INFO, object, msg)
     return
 
 def warnMessageLog(object, frameRec, msg):
-    txt = "{}{}\n".format(loggAssistMsg(object, frameRec), msg)
-    logging.warning(txt)
-    if get_logging_level() == logging.WARNING:
-        print(txt)
+    __log(logging.WARNING, object, msg)
     return
 
 def critMessageLog(object, frameRec, msg):
-    txt = "{}{}\n".format(loggAssistMsg(object, frameRec), msg)
-    logging.critical(txt)
-    if get_logging_level() == logging.CRITICAL:
-        print(txt)
+    __log(logging.CRITICAL, object, msg)
     return
 
 def notificationMessageWindow(object, frameRec, msg):
+    __log(logging.INFO, object, msg)
     txt = "{}{}".format(loggAssistMsg(object, frameRec), msg)
-    logging.info("{}\n".format(txt))
     QMessageBox.information(None,"System Information Notification",txt)
 
 def warningMessageWindow(object, frameRec, msg):
+    __log(logging.WARNING, object, msg)
     txt = "{}{}".format(loggAssistMsg(object, frameRec), msg)
-    logging.warning("{}\n".format(txt))
     QMessageBox.warning(None,"System Warning Notification",txt)
 
 def errorMessageWindow(object, frameRec, msg):
+    __log(logging.CRITICAL, object, msg)
     txt = "{}{}".format(loggAssistMsg(object, frameRec), msg)
-    logging.critical("{}\n".format(txt))
-    QMessageBox.critical(None,"System Error Notification",txt)
\ No newline at end of file
+    QMessageBox.critical(None,"System Error Notification",txt)
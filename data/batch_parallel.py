@@ -0,0 +1,151 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+# ---- Local addins
+from geometric_objects import TriangleBatch
+from triangle_store import COLUMNS, TriangleStoreWriter, batch_columns
+
+# splits batch solves over worker processes; inputs and outputs live in shared memory so the workers
+# only get told which rows to work and nothing but the chunk bounds is pickled either way
+
+METHODS = ('SSS', 'SAS', 'ASA', 'AAS', 'SSA', 'coords')
+
+def _layout(count:int) -> tuple[dict[str, tuple[str, tuple[int,...], int]], int]:
+    '''(dtype, row shape, byte offset) of every output column in the shared block, and the block size'''
+    rtn, offset = {}, 0
+    for name, (dtype, shape) in COLUMNS.items():
+        rtn[name] = (dtype, shape, offset)
+        size   = count*np.dtype(dtype).itemsize*int(np.prod(shape, dtype=int))
+        offset = -(-(offset+size)//64)*64
+    return rtn, max(offset, 1)
+
+def _views(buf, count:int, layout:dict) -> dict[str, np.ndarray]:
+    return {name:np.ndarray((count, *shape), dtype=dtype, buffer=buf, offset=offset) for name, (dtype, shape, offset) in layout.items()}
+
+def _solve_chunk(method:str, in_name:str, in_shape:tuple, out_name:str, count:int, start:int, stop:int) -> int:
+    '''worker; solve rows start:stop of the shared input into the shared output'''
+    shm_in  = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        vals = np.ndarray(in_shape, dtype=float, buffer=shm_in.buf)[start:stop]
+        out  = _views(shm_out.buf, count, _layout(count)[0])
+        tb = TriangleBatch()
+        getattr(tb, f'solve_{method}')(vals[:,0], vals[:,1], vals[:,2])
+        for name, col in batch_columns(tb).items():
+            out[name][start:stop] = col
+        del vals, out # views must go before the blocks can close
+    finally:
+        shm_in.close()
+        shm_out.close()
+    return stop-start
+
+class ParallelResult():
+    '''
+    Output columns of solve_parallel; NumPy views over one shared memory block
+
+    Keep the object alive while using the columns, then close() it (or use it as a context manager)
+    '''
+    def __init__(self, shm:shared_memory.SharedMemory, count:int) -> None:
+        self.__shm   = shm
+        self.__count = count
+        self.__columns:dict[str, np.ndarray] = _views(shm.buf, count, _layout(count)[0])
+        return
+    
+    def __enter__(self) -> ParallelResult:
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+        return
+    
+    def __len__(self) -> int:
+        return self.__count
+    
+    def __getitem__(self, name:str) -> np.ndarray:
+        return self.__columns[name]
+    
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        return self.__columns
+    
+    @property
+    def valid(self) -> np.ndarray:
+        '''boolean mask of the rows that solved'''
+        return self.__columns['status'] == TriangleBatch.STATUS_OK
+    
+    def copy(self) -> dict[str, np.ndarray]:
+        '''the columns copied out of shared memory'''
+        return {name:col.copy() for name, col in self.__columns.items()}
+    
+    def save(self, path:str):
+        '''write the result to a triangle store file'''
+        with TriangleStoreWriter(path, self.__count) as out:
+            out.append(self.__columns)
+        return
+    
+    def close(self):
+        if self.__shm is None: return
+        self.__columns = {}
+        self.__shm.close()
+        self.__shm.unlink()
+        self.__shm = None
+        return
+
+def solve_parallel(method:str, values:np.ndarray, workers:int=None, chunk_size:int=250_000) -> ParallelResult:
+    '''
+    solve many triangles over a pool of worker processes
+
+    Parameters
+    ----------
+    method     : str
+        one of METHODS; 'SSS', 'solve_SSS', ...
+    values     : array_like
+        (n, 3) solve inputs in the same order as the Triangle.solve_* method, or (n, 3, 2) points for 'coords'
+    workers    : int
+        worker processes; os.cpu_count() when not given
+    chunk_size : int
+        rows per task handed to a worker
+
+    Returns
+    -------
+    ParallelResult
+        the triangle_store COLUMNS of every row, in shared memory
+    '''
+    if method.startswith('solve_'):
+        method = method[6:]
+    if method not in METHODS:
+        raise ValueError(f"unknown solve method '{method}'; expected one of {METHODS}")
+    values = np.asarray(values, dtype=float)
+    if values.shape[1:] != ((3, 2) if method == 'coords' else (3,)):
+        raise ValueError(f"solve_{method} values must be shaped (n, {'3, 2' if method == 'coords' else '3'}), got {values.shape}")
+    count = len(values)
+
+    shm_in  = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    shm_out = shared_memory.SharedMemory(create=True, size=_layout(count)[1])
+    try:
+        np.ndarray(values.shape, dtype=float, buffer=shm_in.buf)[:] = values
+        chunk_size = max(int(chunk_size), 1)
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            jobs = [pool.submit(_solve_chunk, method, shm_in.name, values.shape, shm_out.name, count, start, min(start+chunk_size, count))
+                    for start in range(0, count, chunk_size)]
+            for job in jobs:
+                job.result()
+    except BaseException:
+        shm_out.close()
+        shm_out.unlink()
+        raise
+    finally:
+        shm_in.close()
+        shm_in.unlink()
+    return ParallelResult(shm_out, count)
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    with solve_parallel('SSS', rng.uniform(1, 10, (1_000, 3)), workers=2, chunk_size=300) as res:
+        print(len(res), res.valid.mean(), res['area'][:3])
@@ -0,0 +1,270 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import os, sys, time, queue, atexit, itertools, threading, typing
+import multiprocessing as mp
+from multiprocessing.connection import Connection, wait
+
+# Calculator evaluation in worker processes
+#
+# a formula like 9**9**9 can run for minutes and eat gigabytes, and a thread can't be stopped, so formulas are sent to
+# a small pool of warm worker processes (started once, with their own compiled-expression cache). a supervisor
+# thread hands jobs to idle workers, reads the results and kills a worker that passes the wall-clock timeout or is
+# cancelled; a fresh worker replaces it. workers cap their own address space (POSIX) so a runaway allocation ends
+# in MemoryError instead of swapping the machine. results go to `callback(job, ok, value_or_message)` on the
+# supervisor thread
+#
+# workers are started with 'spawn', so scripts that use the pool need the usual `if __name__ == '__main__':` guard
+
+TIMEOUT      = 5.0      # seconds
+MEMORY_LIMIT = 256<<20  # bytes a worker may grow by
+
+def _limit_memory(limit:int):
+    '''cap this process' address space at its current size plus limit (no-op where unsupported)'''
+    try:
+        import resource
+    except ImportError: # Windows
+        return
+    current = 0
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[0])*os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        soft = current+limit
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+    except (ValueError, OSError):
+        pass
+    return
+
+def _worker(conn:Connection, memory_limit:int):
+    '''worker process: evaluate (job, formula, bindings) messages until None'''
+    import expressions
+    _limit_memory(memory_limit)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        job, text, bindings = msg
+        try:
+            val = expressions.compile_expression(text).evaluate(**bindings)
+            if isinstance(val, int) and val.bit_length() > 4096:
+                # too long to show; as a float or not at all
+                val = float(val)
+            conn.send((job, True, val))
+        except MemoryError:
+            conn.send((job, False, f"ran out of memory (limit {memory_limit>>20} MB)"))
+        except OverflowError:
+            conn.send((job, False, "result is too large"))
+        except Exception as e:
+            conn.send((job, False, str(e)))
+    return
+
+class _Worker():
+    __slots__ = ('process', 'conn', 'job', 'started')
+    def __init__(self, process, conn:Connection) -> None:
+        self.process = process
+        self.conn = conn
+        self.job:int = None
+        self.started:float = None
+
+class EvaluationPool():
+    '''
+    warm worker processes that evaluate calculator formulas with a timeout and memory limit
+
+    Example
+    -------
+        pool = EvaluationPool(callback=lambda job, ok, value: print(job, ok, value))
+        job = pool.submit('9**9**9')
+        pool.cancel(job)
+    '''
+    def __init__(self, workers:int=2, timeout:float=TIMEOUT, memory_limit:int=MEMORY_LIMIT,
+                 callback:typing.Callable[[int, bool, object], None]=None) -> None:
+        '''
+        Parameters
+        ----------
+        workers : int
+            processes kept running
+        timeout : float
+            seconds a formula may run before its worker is killed
+        memory_limit : int
+            bytes each worker may allocate
+        callback : (job, ok, value or message) -> None
+            called on the supervisor thread for every submitted job, including cancelled and timed out ones
+        '''
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.callback = callback
+        self.__ctx = mp.get_context('spawn')
+        self.__ids = itertools.count(1)
+        self.__commands:queue.SimpleQueue = queue.SimpleQueue()
+        self.__wakeRead, self.__wakeWrite = self.__ctx.Pipe(duplex=False)
+        self.__closed = False
+        # workers are started by the supervisor so the caller doesn't wait on them
+        self.__supervisor = threading.Thread(target=self.__supervise, name='EvaluationPool supervisor', daemon=True)
+        self.__supervisor.start()
+        atexit.register(self.close)
+        return
+
+    def submit(self, text:str, **bindings) -> int:
+        '''queue a formula; returns the job number passed to the callback'''
+        if self.__closed:
+            raise ValueError("EvaluationPool is closed")
+        job = next(self.__ids)
+        self.__command(('submit', job, text, bindings))
+        return job
+
+    def cancel(self, job:int):
+        '''stop a job; a running one has its worker killed. The callback gets (job, False, 'cancelled')'''
+        self.__command(('cancel', job))
+        return
+
+    def close(self):
+        '''kill the workers and stop the supervisor; queued jobs are dropped'''
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__command(None)
+        self.__supervisor.join()
+        atexit.unregister(self.close)
+        return
+
+    def __command(self, cmd):
+        self.__commands.put(cmd)
+        self.__wakeWrite.send_bytes(b'')
+        return
+
+    def __spawn(self) -> _Worker:
+        parent, child = self.__ctx.Pipe()
+        process = self.__ctx.Process(target=_worker, args=(child, self.memory_limit), name='EvaluationPool worker', daemon=True)
+        process.start()
+        child.close()
+        return _Worker(process, parent)
+
+    def __kill(self, worker:_Worker):
+        worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        return
+
+    def __report(self, job:int, ok:bool, value):
+        if self.callback is not None:
+            try:
+                self.callback(job, ok, value)
+            except Exception as e:
+                print(f"EvaluationPool callback failed: {e}", file=sys.stderr)
+        return
+
+    def __supervise(self):
+        '''supervisor thread: dispatch jobs, collect results, enforce timeouts and cancels'''
+        workers = [self.__spawn() for _ in range(self.workers)]
+        pending:list[tuple[int, str, dict]] = []
+        running = True
+        while running:
+            # ---- commands from the callers
+            while True:
+                try:
+                    cmd = self.__commands.get_nowait()
+                except queue.Empty:
+                    break
+                if cmd is None:
+                    running = False
+                    break
+                if cmd[0] == 'submit':
+                    pending.append(cmd[1:])
+                elif cmd[0] == 'cancel':
+                    job = cmd[1]
+                    for i, w in enumerate(workers):
+                        if w.job == job:
+                            self.__kill(w)
+                            workers[i] = self.__spawn()
+                            self.__report(job, False, 'cancelled')
+                            break
+                    else:
+                        for p in pending:
+                            if p[0] == job:
+                                pending.remove(p)
+                                self.__report(job, False, 'cancelled')
+                                break
+            if not running:
+                break
+
+            # ---- hand out queued jobs
+            for w in workers:
+                if w.job is None and pending:
+                    job, text, bindings = pending.pop(0)
+                    try:
+                        w.conn.send((job, text, bindings))
+                        w.job, w.started = job, time.monotonic()
+                    except (OSError, ValueError):
+                        pending.insert(0, (job, text, bindings))
+
+            # ---- wait for a result, a dead worker, a command or the next timeout
+            busy = [w for w in workers if w.job is not None]
+            deadline = min((w.started+self.timeout for w in busy), default=None)
+            timeout = None if deadline is None else max(deadline-time.monotonic(), 0)
+            ready = wait([self.__wakeRead]+[w.conn for w in busy]+[w.process.sentinel for w in workers], timeout)
+            if self.__wakeRead in ready:
+                while self.__wakeRead.poll():
+                    self.__wakeRead.recv_bytes()
+
+            now = time.monotonic()
+            for i, w in enumerate(workers):
+                if w.job is not None and w.conn in ready:
+                    try:
+                        job, ok, value = w.conn.recv()
+                    except (EOFError, OSError):
+                        pass # died; handled below
+                    else:
+                        w.job = w.started = None
+                        self.__report(job, ok, value)
+                        continue
+                if w.job is not None and now-w.started >= self.timeout:
+                    job = w.job
+                    self.__kill(w)
+                    workers[i] = self.__spawn()
+                    self.__report(job, False, f"took longer than {self.timeout:g} s")
+                elif not w.process.is_alive():
+                    job = w.job
+                    self.__kill(w)
+                    workers[i] = self.__spawn()
+                    if job is not None:
+                        self.__report(job, False, "worker stopped (out of memory?)")
+
+        for w in workers:
+            self.__kill(w)
+            if w.job is not None:
+                self.__report(w.job, False, 'cancelled')
+        for p in pending:
+            self.__report(p[0], False, 'cancelled')
+        return
+
+if __name__ == '__main__':
+    done = threading.Event()
+    results = {}
+    def report(job, ok, value):
+        results[job] = (ok, value, time.perf_counter())
+        if len(results) == 5:
+            done.set()
+    pool = EvaluationPool(workers=2, timeout=2, callback=report)
+    time.sleep(1) # let the workers start
+    t = time.perf_counter()
+    jobs = {pool.submit('9**9**9'):'9**9**9', pool.submit('math.sqrt(2)'):'math.sqrt(2)',
+            pool.submit('x**2', x=3):'x**2', pool.submit('1/0'):'1/0'}
+    slow = pool.submit('9**9**9')
+    jobs[slow] = '9**9**9 (cancelled)'
+    pool.cancel(slow)
+    done.wait(10)
+    for job, name in jobs.items():
+        ok, value, at = results[job]
+        print(f'{name:<20} ok={ok!s:<5} {str(value)[:40]:<40} after {(at-t)*1000:7.1f} ms')
+    pool.close()
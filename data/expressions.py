@@ -0,0 +1,712 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import bisect, math, re, typing
+from collections import OrderedDict
+from functools import partial
+from numbers import Number
+
+# Calculator expression engine
+#
+# formulas (as built by the QCalcWidget keypad, e.g. 'math.sqrt(3**2+4**2)') are tokenized, parsed into a small AST,
+# constant folded and compiled once into a Python function; only whitelisted functions and constants can be called.
+# compiled expressions are kept in an LRU cache keyed by the normalized formula, so pressing "=" on the same formula
+# or evaluating it again with new variable values only calls the compiled function
+#
+#   expr = compile_expression('math.sin(x)**2 + y')
+#   expr.evaluate(x=1, y=2)
+#   expr.evaluate_array(x=np.linspace(-10, 10, 1000), y=2)  # NumPy ufuncs over whole arrays
+
+# ---- whitelisted names; the 'math.' prefix is optional
+FUNCTIONS:dict[str, typing.Callable] = {
+    'sin':math.sin, 'cos':math.cos, 'tan':math.tan,
+    'asin':math.asin, 'acos':math.acos, 'atan':math.atan, 'atan2':math.atan2,
+    'sinh':math.sinh, 'cosh':math.cosh, 'tanh':math.tanh,
+    'asinh':math.asinh, 'acosh':math.acosh, 'atanh':math.atanh,
+    'sqrt':math.sqrt, 'exp':math.exp, 'log':math.log, 'log10':math.log10, 'log2':math.log2,
+    'abs':abs, 'fabs':math.fabs, 'floor':math.floor, 'ceil':math.ceil, 'hypot':math.hypot,
+    'degrees':math.degrees, 'radians':math.radians, 'factorial':math.factorial, 'pow':math.pow,
+}
+CONSTANTS:dict[str, float] = {'pi':math.pi, 'e':math.e, 'tau':math.tau, 'inf':math.inf, 'nan':math.nan}
+
+def _array_functions() -> dict[str, typing.Callable]:
+    '''NumPy ufunc for each whitelisted function; built on first array evaluation so numpy is only imported then'''
+    import numpy as np
+    def log(x, base=None):
+        return np.log(x) if base is None else np.log(x)/np.log(base)
+    def factorial(x):
+        # NaN off the non-negative integers, inf past the float range
+        x = np.asarray(x, dtype=float)
+        rtn = np.where((x >= 0) & (x == np.floor(x)), np.inf, np.nan)
+        ok = (rtn == np.inf) & (x <= 170)
+        rtn[ok] = _factorial(x[ok])
+        return rtn
+    _factorial = np.vectorize(lambda n: float(math.factorial(int(n))), otypes=[float])
+    return {
+        'sin':np.sin, 'cos':np.cos, 'tan':np.tan,
+        'asin':np.arcsin, 'acos':np.arccos, 'atan':np.arctan, 'atan2':np.arctan2,
+        'sinh':np.sinh, 'cosh':np.cosh, 'tanh':np.tanh,
+        'asinh':np.arcsinh, 'acosh':np.arccosh, 'atanh':np.arctanh,
+        'sqrt':np.sqrt, 'exp':np.exp, 'log':log, 'log10':np.log10, 'log2':np.log2,
+        'abs':np.abs, 'fabs':np.fabs, 'floor':np.floor, 'ceil':np.ceil, 'hypot':np.hypot,
+        'degrees':np.degrees, 'radians':np.radians, 'factorial':factorial, 'pow':np.power,
+    }
+ARRAY_FUNCTIONS:dict[str, typing.Callable] = None
+
+# constants that would fold to an int bigger than this (in bits) are left to evaluation time, where the
+# worker turns them into a float; the same cap as eval_worker so no folded value is too long to show
+_FOLD_INT_BITS = 4096
+
+def _foldable(value) -> bool:
+    '''a folded result that can be kept: a real number, and not a huge int'''
+    if isinstance(value, complex) or not isinstance(value, Number):
+        return False # (-8)**(1/3)
+    return not isinstance(value, int) or value.bit_length() <= _FOLD_INT_BITS
+
+class ExpressionError(ValueError):
+    '''formula could not be tokenized, parsed or evaluated'''
+    def __init__(self, msg:str, position:int=None) -> None:
+        self.position = position
+        if position is not None:
+            msg = f"{msg} (at {position})"
+        super().__init__(msg)
+
+#region tokenizer
+_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?) |
+        (?P<name>(?:math\.)?[A-Za-z_][A-Za-z_0-9]*)   |
+        (?P<op>\*\*|//|[-+*/%^(),])
+    )''', re.VERBOSE)
+
+def tokenize(text:str) -> list[tuple[str, object, int]]:
+    '''
+    split a formula into tokens
+
+    Returns
+    -------
+    list of (kind, value, position); kind is 'num', 'name' or 'op'. 'math.' is stripped from names and '^' is read as '**'
+    '''
+    return _tokenize(text, 0, [])
+
+def _tokenize(text:str, pos:int, rtn:list) -> list[tuple[str, object, int]]:
+    '''tokenize text[pos:] onto rtn'''
+    end = len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ExpressionError(f"unexpected character '{text[pos:].strip()[:1]}'", pos)
+        kind = m.lastgroup
+        val  = m.group(kind)
+        if kind == 'num':
+            val = float(val) if any(c in val for c in '.eE') else int(val)
+        elif kind == 'name' and val.startswith('math.'):
+            val = val[5:]
+            if val not in FUNCTIONS and val not in CONSTANTS:
+                raise ExpressionError(f"unknown name 'math.{val}'", m.start(kind))
+        elif val == '^':
+            val = '**'
+        rtn.append((kind, val, m.start(kind)))
+        pos = m.end()
+    return rtn
+
+def normalize(tokens:list[tuple[str, object, int]]) -> str:
+    '''
+    formula text from tokens without 'math.' prefixes or spacing; used as the cache key.
+    A space is kept only where two tokens would otherwise run together ('1 2', 'x y', '* *')
+    so different token lists never give the same text
+    '''
+    parts, last = [], None
+    for kind, val, _ in tokens:
+        text = repr(val) if kind == 'num' else val
+        if last is not None:
+            if kind != 'op' and last[0] != 'op':
+                parts.append(' ')
+            elif kind == 'op' and last[0] == 'op' and last[1][-1] in '*/' and text[0] == last[1][-1]:
+                parts.append(' ')
+        parts.append(text)
+        last = (kind, text)
+    return ''.join(parts)
+#endregion
+
+#region AST
+# binding strength of each node, for the brackets source() needs
+_PRECEDENCE = {'+':1, '-':1, '*':2, '/':2, '//':2, '%':2, 'unary':3, '**':4, 'atom':5}
+
+def _bracket(node:Node, precedence:int, literal:typing.Callable[[Number], str]) -> str:
+    src = node.source(literal)
+    return f'({src})' if node.precedence < precedence else src
+
+class Node():
+    __slots__ = ()
+    precedence = _PRECEDENCE['atom']
+    def source(self, literal:typing.Callable[[Number], str]=repr) -> str:
+        '''
+        Python source of the node; names refer to the function table and variables are prefixed with v_.
+        `literal` writes the numbers
+        '''
+        raise NotImplementedError
+    def fold(self) -> Node:
+        '''node with constant sub-trees evaluated'''
+        return self
+    def variables(self) -> set[str]:
+        return set()
+
+class Num(Node):
+    __slots__ = ('value',)
+    def __init__(self, value:Number) -> None:
+        self.value = value
+    @property
+    def precedence(self) -> int:
+        negative = isinstance(self.value, (int, float)) and self.value < 0
+        return _PRECEDENCE['unary'] if negative else _PRECEDENCE['atom']
+    def source(self, literal:typing.Callable[[Number], str]=repr) -> str:
+        return literal(self.value)
+    def __repr__(self) -> str:
+        return f'Num({self.value!r})'
+
+class Var(Node):
+    __slots__ = ('name',)
+    def __init__(self, name:str) -> None:
+        self.name = name
+    def source(self, literal:typing.Callable[[Number], str]=repr) -> str:
+        return f'v_{self.name}'
+    def variables(self) -> set[str]:
+        return {self.name}
+    def __repr__(self) -> str:
+        return f'Var({self.name!r})'
+
+class UnaryOp(Node):
+    __slots__ = ('op', 'operand')
+    precedence = _PRECEDENCE['unary']
+    def __init__(self, op:str, operand:Node) -> None:
+        self.op, self.operand = op, operand
+    def source(self, literal:typing.Callable[[Number], str]=repr) -> str:
+        return f'{self.op}{_bracket(self.operand, self.precedence, literal)}'
+    def fold(self) -> Node:
+        operand = self.operand.fold()
+        if isinstance(operand, Num):
+            return Num(-operand.value if self.op == '-' else +operand.value)
+        return UnaryOp(self.op, operand)
+    def variables(self) -> set[str]:
+        return self.operand.variables()
+    def __repr__(self) -> str:
+        return f'UnaryOp({self.op!r}, {self.operand!r})'
+
+class BinOp(Node):
+    '''
+    binary operator; a formula like 1+2+3+... is a long chain down the left operands so fold, source
+    and variables walk that chain in a loop instead of recursing into it
+    '''
+    __slots__ = ('op', 'left', 'right')
+    OPERATORS = {'+':lambda a,b: a+b, '-':lambda a,b: a-b, '*':lambda a,b: a*b, '/':lambda a,b: a/b,
+                 '//':lambda a,b: a//b, '%':lambda a,b: a%b, '**':lambda a,b: a**b}
+    def __init__(self, op:str, left:Node, right:Node) -> None:
+        self.op, self.left, self.right = op, left, right
+
+    @property
+    def precedence(self) -> int:
+        return _PRECEDENCE[self.op]
+
+    def __chain(self) -> tuple[Node, list[BinOp]]:
+        '''(left most operand, operators from the inner most out)'''
+        chain, node = [], self
+        while isinstance(node, BinOp):
+            chain.append(node)
+            node = node.left
+        chain.reverse()
+        return node, chain
+
+    def source(self, literal:typing.Callable[[Number], str]=repr) -> str:
+        first, chain = self.__chain()
+        parts = []
+        for i, node in enumerate(chain):
+            p = node.precedence
+            if i == 0:
+                # ** groups right to left; its left operand needs brackets at the same strength
+                parts.append(_bracket(first, p+1 if node.op == '**' else p, literal))
+            else:
+                # the chain so far is the left operand of this node
+                below = chain[i-1].precedence
+                if below < p or (node.op == '**' and below == p):
+                    parts.insert(0, '(')
+                    parts.append(')')
+            right = _PRECEDENCE['unary'] if node.op == '**' else p+1
+            parts.append(node.op)
+            parts.append(_bracket(node.right, right, literal))
+        return ''.join(parts)
+
+    def fold(self) -> Node:
+        first, chain = self.__chain()
+        left = first.fold()
+        for node in chain:
+            left = node.__foldPair(left, node.right.fold())
+        return left
+
+    def __foldPair(self, left:Node, right:Node) -> Node:
+        if isinstance(left, Num) and isinstance(right, Num):
+            a, b = left.value, right.value
+            # don't build huge ints (9**9**9) while compiling
+            big = self.op == '**' and isinstance(a, int) and isinstance(b, int) and b > 0 and a.bit_length()*b > _FOLD_INT_BITS
+            if not big:
+                try:
+                    val = self.OPERATORS[self.op](a, b)
+                    if _foldable(val):
+                        return Num(val)
+                except (ArithmeticError, ValueError):
+                    pass # left for evaluation to raise
+        return BinOp(self.op, left, right)
+
+    def variables(self) -> set[str]:
+        first, chain = self.__chain()
+        rtn = first.variables()
+        for node in chain:
+            rtn |= node.right.variables()
+        return rtn
+
+    def __repr__(self) -> str:
+        return f'BinOp({self.op!r}, {self.left!r}, {self.right!r})'
+
+class Call(Node):
+    __slots__ = ('name', 'args')
+    def __init__(self, name:str, args:tuple[Node, ...]) -> None:
+        self.name, self.args = name, tuple(args)
+    def source(self, literal:typing.Callable[[Number], str]=repr) -> str:
+        return f"f_{self.name}({', '.join(a.source(literal) for a in self.args)})"
+    def fold(self) -> Node:
+        args = tuple(a.fold() for a in self.args)
+        # factorial of a big constant is left to evaluation time
+        big = self.name == 'factorial' and isinstance(args[0], Num) and isinstance(args[0].value, (int, float)) and args[0].value > 1000
+        if not big and all(isinstance(a, Num) for a in args):
+            try:
+                val = FUNCTIONS[self.name](*(a.value for a in args))
+                if _foldable(val):
+                    return Num(val)
+            except (ArithmeticError, ValueError, TypeError):
+                pass # left for evaluation to raise
+        return Call(self.name, args)
+    def variables(self) -> set[str]:
+        rtn = set()
+        for a in self.args:
+            rtn |= a.variables()
+        return rtn
+    def __repr__(self) -> str:
+        return f'Call({self.name!r}, {list(self.args)!r})'
+#endregion
+
+#region parser
+class _Parser():
+    '''
+    recursive descent parser with Python's precedence:
+        expr  := term (('+'|'-') term)*
+        term  := unary (('*'|'/'|'//'|'%') unary)*
+        unary := ('+'|'-') unary | power
+        power := atom ('**' unary)?
+        atom  := number | constant | variable | function '(' expr (',' expr)* ')' | '(' expr ')'
+    '''
+    def __init__(self, tokens:list[tuple[str, object, int]], text:str, subtrees:dict[str, Node]=None) -> None:
+        '''
+        Parameters
+        ----------
+        subtrees : dict
+            folded bracket groups and calls by their text; groups found here are not parsed again and the ones
+            parsed are added, folded. None parses everything and leaves the tree unfolded
+        '''
+        self.__tokens = tokens
+        self.__text = text
+        self.__i = 0
+        self.__subtrees = subtrees
+        self.__closing:dict[int, int] = {} # index of each '(' -> index of its ')'
+        if subtrees is not None:
+            opened = []
+            for i, (kind, val, _) in enumerate(tokens):
+                if kind == 'op' and val == '(':
+                    opened.append(i)
+                elif kind == 'op' and val == ')' and opened:
+                    self.__closing[opened.pop()] = i
+        return
+
+    def __group(self, first:int, parse:typing.Callable[[], Node]) -> Node:
+        '''parse the group from token `first` to the ')' closing the '(' at or after it, through the subtree cache'''
+        close = self.__closing.get(first if self.__tokens[first][1] == '(' else first+1)
+        if close is None:
+            return parse()
+        key = self.__text[self.__tokens[first][2]:self.__tokens[close][2]+1]
+        node = self.__subtrees.get(key)
+        if node is not None:
+            self.__i = close+1
+            return node
+        node = self.__subtrees[key] = parse().fold()
+        return node
+
+    def __peek(self) -> tuple[str, object, int]:
+        if self.__i < len(self.__tokens):
+            return self.__tokens[self.__i]
+        return ('end', None, len(self.__text))
+
+    def __next(self) -> tuple[str, object, int]:
+        tkn = self.__peek()
+        self.__i += 1
+        return tkn
+
+    def __expect(self, op:str):
+        kind, val, pos = self.__next()
+        if kind != 'op' or val != op:
+            raise ExpressionError(f"expected '{op}'" if kind != 'end' else f"missing '{op}'", pos)
+        return
+
+    def parse(self) -> Node:
+        if not self.__tokens:
+            raise ExpressionError("empty formula")
+        node = self.__expr()
+        kind, val, pos = self.__peek()
+        if kind != 'end':
+            raise ExpressionError(f"unexpected '{val}'", pos)
+        return node
+
+    def __expr(self) -> Node:
+        node = self.__term()
+        while self.__peek()[0] == 'op' and self.__peek()[1] in ('+', '-'):
+            node = BinOp(self.__next()[1], node, self.__term())
+        return node
+
+    def __term(self) -> Node:
+        node = self.__unary()
+        while self.__peek()[0] == 'op' and self.__peek()[1] in ('*', '/', '//', '%'):
+            node = BinOp(self.__next()[1], node, self.__unary())
+        return node
+
+    def __unary(self) -> Node:
+        kind, val, _ = self.__peek()
+        if kind == 'op' and val in ('+', '-'):
+            self.__next()
+            return UnaryOp(val, self.__unary())
+        return self.__power()
+
+    def __power(self) -> Node:
+        node = self.__atom()
+        if self.__peek()[0] == 'op' and self.__peek()[1] == '**':
+            self.__next()
+            node = BinOp('**', node, self.__unary())
+        return node
+
+    def __atom(self) -> Node:
+        kind, val, pos = self.__next()
+        if kind == 'num':
+            return Num(val)
+        if kind == 'op' and val == '(':
+            if self.__subtrees is not None:
+                return self.__group(self.__i-1, self.__bracketed)
+            return self.__bracketed()
+        if kind == 'name':
+            is_call = self.__peek()[0] == 'op' and self.__peek()[1] == '('
+            if val in FUNCTIONS:
+                if not is_call:
+                    raise ExpressionError(f"'{val}' needs its arguments in brackets", pos)
+                if self.__subtrees is not None:
+                    return self.__group(self.__i-1, partial(self.__call, val))
+                return self.__call(val)
+            if is_call:
+                raise ExpressionError(f"unknown function '{val}'", pos)
+            if val in CONSTANTS:
+                return Num(CONSTANTS[val])
+            return Var(val)
+        if kind == 'end':
+            raise ExpressionError("formula ends early", pos)
+        raise ExpressionError(f"unexpected '{val}'", pos)
+
+    def __bracketed(self) -> Node:
+        '''rest of '(' expr ')' after the '(' '''
+        node = self.__expr()
+        self.__expect(')')
+        return node
+
+    def __call(self, name:str) -> Node:
+        '''rest of a function call after its name'''
+        self.__next()
+        args = [self.__expr()]
+        while self.__peek()[0] == 'op' and self.__peek()[1] == ',':
+            self.__next()
+            args.append(self.__expr())
+        self.__expect(')')
+        return Call(name, args)
+
+def parse(text:str) -> Node:
+    '''formula text to a (not folded) AST'''
+    return _Parser(tokenize(text), text).parse()
+#endregion
+
+class Expression():
+    '''
+    compiled formula; call evaluate() with a value for each name in `variables`
+
+    Build through compile_expression() so the compiled form is shared from the cache
+    '''
+    def __init__(self, text:str, tokens:list=None, subtrees:dict[str, Node]=None) -> None:
+        '''
+        Parameters
+        ----------
+        text : formula
+        tokens : tokenize(text) when already done
+        subtrees : folded bracket groups by text, shared between expressions (see _Parser)
+        '''
+        tokens = tokenize(text) if tokens is None else tokens
+        self.__text:str = text
+        self.__normalized:str = normalize(tokens)
+        try:
+            self.__tree:Node = _Parser(tokens, text, subtrees).parse().fold()
+            self.__variables:tuple[str, ...] = tuple(sorted(self.__tree.variables()))
+            if isinstance(self.__tree, Num):
+                # folded to its value; nothing to compile
+                value = self.__tree.value
+                self.__function = lambda: value
+            else:
+                self.__function = self.__compile(FUNCTIONS)
+        except (RecursionError, MemoryError, SyntaxError):
+            raise ExpressionError("formula is nested too deeply or is too long") from None
+        self.__arrayFunction:typing.Callable = None # compiled on the first evaluate_array
+        return
+
+    def __compile(self, functions:dict[str, typing.Callable], number:type=None) -> typing.Callable:
+        '''
+        compile the AST to a function of the variables (in `variables` order) using `functions` for calls;
+        with `number` the numbers in the formula are made that type (np.float64) instead of Python ints and floats
+        '''
+        args = ', '.join(f'v_{v}' for v in self.__variables)
+        namespace = {'__builtins__':{}, 'inf':math.inf, 'nan':math.nan} # repr of non-finite folded values
+        namespace.update({f'f_{k}':v for k,v in functions.items()})
+        literal = repr
+        if number is not None:
+            namespace['_number'] = number
+            literal = lambda v: f'_number({v!r})'
+        exec(f'def _expression({args}):\n    return {self.__tree.source(literal)}', namespace)
+        return namespace['_expression']
+
+    @property
+    def text(self) -> str:
+        return self.__text
+
+    @property
+    def normalized(self) -> str:
+        return self.__normalized
+
+    @property
+    def tree(self) -> Node:
+        '''constant folded AST'''
+        return self.__tree
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        '''free variable names, sorted'''
+        return self.__variables
+
+    @property
+    def is_constant(self) -> bool:
+        return isinstance(self.__tree, Num)
+
+    def evaluate(self, **bindings:Number) -> Number:
+        '''
+        value of the formula
+
+        Parameters
+        ----------
+        **bindings : value of each free variable, e.g. evaluate(x=2)
+
+        Raises
+        ------
+        ExpressionError for a missing variable or a math error (domain, divide by zero, overflow)
+        '''
+        try:
+            values = [bindings[v] for v in self.__variables]
+        except KeyError as e:
+            raise ExpressionError(f"no value for variable {e}") from None
+        try:
+            return self.__function(*values)
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise ExpressionError(f"{type(e).__name__}: {e}") from e
+
+    def evaluate_array(self, chunk_size:int=1<<16, **bindings) -> 'np.ndarray':
+        '''
+        value of the formula over arrays in one call, e.g. evaluate_array(x=np.linspace(-10, 10, 1000))
+
+        Functions are mapped to their NumPy ufuncs and the inputs are cast to float64. Domain errors
+        (sqrt(-1), asin(2), log(-1) ...) give NaN instead of raising, and poles give ±inf.
+        Large inputs are evaluated in chunks of `chunk_size` so the intermediate arrays stay in cache
+
+        Parameters
+        ----------
+        chunk_size : int
+            samples evaluated at a time
+        **bindings : array or scalar for each free variable; they are broadcast together
+
+        Returns
+        -------
+        float64 array of the broadcast shape of all the bindings (so '5' over x gives an array like x)
+        '''
+        import numpy as np
+        global ARRAY_FUNCTIONS
+        if self.__arrayFunction is None:
+            if ARRAY_FUNCTIONS is None:
+                ARRAY_FUNCTIONS = _array_functions()
+            # constants that weren't folded (9**9**9, (-8)**(1/3)) are worked out in float64 like the samples:
+            # inf or NaN rather than a huge int or a complex
+            self.__arrayFunction = self.__compile(ARRAY_FUNCTIONS, np.float64)
+        try:
+            values = [np.asarray(bindings[v], dtype=np.float64) for v in self.__variables]
+        except KeyError as e:
+            raise ExpressionError(f"no value for variable {e}") from None
+        shape = np.broadcast_shapes(*(np.shape(v) for v in bindings.values()))
+        # scalars stay scalars, arrays are flattened (a copy only if they need broadcasting)
+        values = [v if v.ndim == 0 else np.broadcast_to(v, shape).reshape(-1) for v in values]
+        out = np.empty(shape, dtype=np.float64)
+        flat = out.reshape(-1)
+        func = self.__arrayFunction
+        try:
+            with np.errstate(all='ignore'):
+                if not shape:
+                    out[...] = func(*values)
+                for i in range(0, flat.size if shape else 0, chunk_size):
+                    flat[i:i+chunk_size] = func(*(v if v.ndim == 0 else v[i:i+chunk_size] for v in values))
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise ExpressionError(f"{type(e).__name__}: {e}") from e
+        return out
+
+    def __call__(self, **bindings:Number) -> Number:
+        return self.evaluate(**bindings)
+
+    def __repr__(self) -> str:
+        return f'Expression({self.__normalized!r})'
+
+class ExpressionCache():
+    '''
+    LRU cache of compiled expressions keyed by the normalized formula ('math.sin( 1)' and 'sin(1)' share an entry)
+
+    A formula typed one key at a time is mostly the one before it: text that extends the last formula only
+    tokenizes the new end, and bracket groups and calls already parsed (in any formula) are reused folded, so
+    typing a digit only parses and folds the groups around it
+
+    Example
+    -------
+        cache = ExpressionCache(maxsize=256)
+        cache.compile('math.sqrt(x)').evaluate(x=9)
+    '''
+    def __init__(self, maxsize:int=256) -> None:
+        '''
+        Parameters
+        ----------
+        maxsize : int
+            most compiled expressions to keep; least recently used are dropped first
+        '''
+        self.__maxsize:int = maxsize
+        self.__cache:OrderedDict[str, Expression] = OrderedDict()
+        self.__texts:dict[str, str] = {} # formula text as typed -> normalized key; skips tokenizing on a repeat
+        self.__subtrees:dict[str, Node] = {} # folded bracket groups and calls by their text
+        self.__last:tuple[str, list] = ('', []) # text and tokens of the last formula tokenized
+        self.__hits:int      = 0
+        self.__misses:int    = 0
+        self.__evictions:int = 0
+        return
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+
+    @maxsize.setter
+    def maxsize(self, value:int):
+        self.__maxsize = value
+        self.__evict()
+        return
+
+    def cache_info(self) -> dict[str, int]:
+        '''hit/miss/eviction counters of the cache'''
+        return {'hits':self.__hits, 'misses':self.__misses, 'evictions':self.__evictions,
+                'size':len(self.__cache), 'maxsize':self.__maxsize}
+
+    def cache_clear(self):
+        '''drop every compiled expression and reset the counters'''
+        self.__cache.clear()
+        self.__texts.clear()
+        self.__subtrees.clear()
+        self.__last = ('', [])
+        self.__hits = self.__misses = self.__evictions = 0
+        return
+
+    def compile(self, text:str) -> Expression:
+        '''compiled expression of `text`; parse errors raise ExpressionError and are not cached'''
+        key = self.__texts.get(text)
+        tokens = None
+        if key is None:
+            tokens = self.__tokenize(text)
+            key = normalize(tokens)
+        expr = self.__cache.get(key)
+        if expr is not None:
+            self.__hits += 1
+            self.__cache.move_to_end(key)
+        else:
+            self.__misses += 1
+            if len(self.__subtrees) >= 16*max(self.__maxsize, 1):
+                self.__subtrees.clear()
+            expr = Expression(text, tokens, self.__subtrees)
+            self.__cache[key] = expr
+            self.__evict()
+        if tokens is not None:
+            if len(self.__texts) >= 4*max(self.__maxsize, 1):
+                self.__texts.clear()
+            self.__texts[text] = key
+        return expr
+
+    def __tokenize(self, text:str) -> list[tuple[str, object, int]]:
+        '''tokens of text; the tokens of the start it shares with the last formula are reused'''
+        last, tokens = self.__last
+        lo, hi = 0, min(len(last), len(text))
+        while lo < hi: # length of the shared start
+            mid = (lo+hi+1)//2
+            if text[:mid] == last[:mid]:
+                lo = mid
+            else:
+                hi = mid-1
+        # the three tokens before the change can merge with what follows ('1', 'e', '+' then '5' is 1e+5)
+        keep = bisect.bisect_left(tokens, lo, key=lambda t: t[2])-3
+        if keep > 0:
+            tokens = _tokenize(text, tokens[keep][2], tokens[:keep])
+        else:
+            tokens = tokenize(text)
+        self.__last = (text, tokens)
+        return tokens
+
+    def __evict(self):
+        while len(self.__cache) > max(self.__maxsize, 0):
+            self.__cache.popitem(last=False)
+            self.__evictions += 1
+        return
+
+# shared by the calculator widgets
+default_cache = ExpressionCache()
+
+def compile_expression(text:str) -> Expression:
+    '''compiled expression of `text` from the shared cache'''
+    return default_cache.compile(text)
+
+def evaluate(text:str, **bindings:Number) -> Number:
+    '''compile (or reuse) and evaluate `text` in one call'''
+    return default_cache.compile(text).evaluate(**bindings)
+
+if __name__ == '__main__':
+    import timeit
+    for f in ('1+2*3', '-2**2', '2**-1', 'math.sqrt(3**2+4**2)', '1/(math.sin(pi/6))', 'x**2 + 2*x + 1', 'hypot(x, y)'):
+        e = compile_expression(f)
+        print(f'{f:<24} -> {e.tree!r}  vars={e.variables}')
+    e = compile_expression('math.sin(x)**2 + math.cos(x)**2 * y')
+    n = 100_000
+    t = timeit.timeit(lambda: e.evaluate(x=1.2, y=3), number=n)
+    print(f'evaluate with new bindings: {t/n*1e6:.2f} us')
+    t = timeit.timeit(lambda: compile_expression('math.sin(x)**2 + math.cos(x)**2 * y'), number=n)
+    print(f'cached compile: {t/n*1e6:.2f} us', default_cache.cache_info())
+    import numpy as np
+    x = np.linspace(-10, 10, 10_000_000)
+    t = timeit.timeit(lambda: e.evaluate_array(x=x, y=3), number=3)
+    print(f'evaluate_array over {x.size:,} samples: {t/3*1000:.1f} ms')
@@ -0,0 +1,208 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import typing
+from numbers import Number
+
+# Calculator formula as a list of tokens
+#
+# every keypad press adds tokens that carry the evaluable text ('math.sqrt('), the display HTML ('&radic;') and the
+# plain text ('√') together, so the expression and the display can't drift apart. each change returns the edit to
+# make to the display (tokens to append at the end or insert at the start) so the widget only renders what changed.
+# tokens are rendered with the formatting of the groups they sit in (the overline of a square root) so each one is
+# a self-contained HTML fragment
+
+OVERLINE = '<span style="text-decoration:overline;">{}</span>'
+NOWRAP   = '<span style="white-space: nowrap">{}</span>'
+
+# ints with more digits are shown in scientific notation; python won't convert ints past 4300 digits to str
+MAX_DIGITS = 4000
+
+def int_text(value:int, max_digits:int=MAX_DIGITS, mantissa:int=10) -> str:
+    '''
+    decimal text of an int; past max_digits digits in scientific notation with a `mantissa` digits long mantissa,
+    worked out without converting the whole int to a string
+    '''
+    n = abs(value)
+    if n.bit_length() <= 3.33*max_digits + 4: # can have max_digits digits
+        if len(text := f'{n}') <= max_digits:
+            return f'-{text}' if value < 0 else text
+    exp = int((n.bit_length()-1)*0.30102999566398120) # log10(2); can be one off either way
+    while 10**exp > n:
+        exp -= 1
+    while 10**(exp+1) <= n:
+        exp += 1
+    digits = f'{n // 10**(exp-mantissa+1)}'
+    sign = '-' if value < 0 else ''
+    return f'{sign}{digits[0]}.{digits[1:]}e+{exp}'
+
+class Token():
+    __slots__ = ('formula', 'html', 'text')
+    def __init__(self, formula:str, html:str, text:str=None) -> None:
+        '''
+        Parameters
+        ----------
+        formula : evaluable text, e.g. 'math.sqrt('
+        html    : rendered display fragment
+        text    : plain display text; defaults to the formula
+        '''
+        self.formula = formula
+        self.html = html
+        self.text = formula if text is None else text
+        return
+
+    def __repr__(self) -> str:
+        return f'Token({self.formula!r}, {self.html!r})'
+
+class Edit(typing.NamedTuple):
+    '''display change of one model update; `at` is 'end', 'start' or 'replace' (the tokens are the whole display)'''
+    at:str
+    tokens:list[Token]
+
+class FormulaModel():
+    '''
+    token list behind the calculator display
+
+    Example
+    -------
+        model = FormulaModel()
+        model.sqrt_open()
+        model.append('2')
+        model.close()
+        model.expression   # 'math.sqrt(2)'
+    '''
+    def __init__(self) -> None:
+        self.__tokens:list[Token] = []
+        self.__groups:list[str] = []  # open groups, innermost last: 'paren' or 'sqrt'
+        self.__expression:str = None  # joined formula; rebuilt after a change
+        self.__isResult:bool = False  # only a calculated value so far (set_result)
+        return
+
+    def __len__(self) -> int:
+        return len(self.__tokens)
+
+    @property
+    def tokens(self) -> tuple[Token, ...]:
+        return tuple(self.__tokens)
+
+    @property
+    def expression(self) -> str:
+        '''evaluable formula'''
+        if self.__expression is None:
+            self.__expression = ''.join(t.formula for t in self.__tokens)
+        return self.__expression
+
+    @property
+    def closed_expression(self) -> str:
+        '''evaluable formula with the open groups closed, e.g. 'math.sin(2' -> 'math.sin(2)'; for previews'''
+        return self.expression+')'*len(self.__groups)
+
+    @property
+    def html(self) -> str:
+        return ''.join(t.html for t in self.__tokens)
+
+    @property
+    def text(self) -> str:
+        '''plain display text'''
+        return ''.join(t.text for t in self.__tokens)
+
+    def __style(self, html:str) -> str:
+        '''format a fragment for the groups it is typed in'''
+        if 'sqrt' in self.__groups:
+            html = OVERLINE.format(html)
+        return html
+
+    def __add(self, token:Token) -> Edit:
+        self.__tokens.append(token)
+        self.__expression = None
+        self.__isResult = False
+        return Edit('end', [token])
+
+    def __restart(self, formula:str) -> bool:
+        '''clear a calculated value that `formula` can't continue from (a digit, '.' or '('); True when cleared'''
+        if self.__isResult and formula[:1] in '0123456789.(':
+            self.clear()
+            return True
+        return False
+
+    def append(self, formula:str, html:str=None, text:str=None) -> Edit:
+        '''
+        add a keypad entry at the end; '(' (including '(-') opens a group.
+        After a calculated value a digit, '.' or '(' starts a new formula and an operator continues from it
+
+        Returns
+        -------
+        Edit to apply to the display
+        '''
+        restart = self.__restart(formula)
+        if formula.startswith('('):
+            self.__groups.append('paren')
+        html = formula if html is None else html
+        edit = self.__add(Token(formula, self.__style(html), text))
+        return Edit('replace', edit.tokens) if restart else edit
+
+    def close(self) -> Edit:
+        '''close the innermost group; closing a square root ends its overline'''
+        if self.__groups and self.__groups[-1] == 'sqrt':
+            token = Token(')', OVERLINE.format('&nbsp;'), ' ')
+            self.__groups.pop()
+            return self.__add(token)
+        if self.__groups:
+            self.__groups.pop()
+        return self.__add(Token(')', self.__style(')')))
+
+    def sqrt_open(self) -> Edit:
+        '''start a square root; what follows is overlined until it is closed'''
+        restart = self.__restart('(')
+        token = Token('math.sqrt(', NOWRAP.format('&radic;')+OVERLINE.format('&nbsp;'), '√ ')
+        self.__groups.append('sqrt')
+        edit = self.__add(token)
+        return Edit('replace', edit.tokens) if restart else edit
+
+    def wrap(self, prefix_formula:str, prefix_html:str, suffix_formula:str=')', suffix_html:str=')') -> list[Edit]:
+        '''
+        wrap everything entered so far, e.g. wrap('math.sin(', 'Sin(') turns 2+3 into Sin(2+3)
+
+        Returns
+        -------
+        the Edits to apply to the display; the prefix at the start and the suffix at the end
+        '''
+        prefix = Token(prefix_formula, prefix_html, _plain(prefix_html))
+        self.__tokens.insert(0, prefix)
+        self.__expression = None
+        return [Edit('start', [prefix]), self.__add(Token(suffix_formula, self.__style(suffix_html), _plain(suffix_html)))]
+
+    def set_result(self, value:Number) -> Edit:
+        '''replace the formula with a calculated value; an operator continues from it, a digit, '.' or '(' starts over'''
+        self.clear()
+        negative = isinstance(value, (int, float)) and value < 0
+        if isinstance(value, int):
+            # a huge int goes on as a float, its exact digits can't be shown
+            text = formula = int_text(value)
+        else:
+            text, formula = f'{value}', f'{value!r}'
+        if negative:
+            text, formula = f'({text})', f'({formula})'
+        edit = self.__add(Token(formula, f'<b>{text}</b>', text))
+        self.__isResult = True
+        return edit
+
+    def clear(self):
+        self.__tokens.clear()
+        self.__groups.clear()
+        self.__expression = None
+        self.__isResult = False
+        return
+
+def _plain(html:str) -> str:
+    '''rough plain text of a small fragment: tags dropped, superscripts marked with ^'''
+    rtn, inside = [], False
+    for c in html.replace('<sup>', '^<sup>'):
+        if c == '<':
+            inside = True
+        elif c == '>':
+            inside = False
+        elif not inside:
+            rtn.append(c)
+    return ''.join(rtn)
@@ -0,0 +1,266 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import math, typing
+from collections import OrderedDict
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    import expressions
+
+# Adaptive sampling of y = f(x) for plotting
+#
+# starts from a coarse uniform grid and, one level at a time, evaluates the midpoint of every interval that is
+# still a candidate; an interval is split again only while its midpoint is further than `tolerance` (a fraction of
+# the visible y range, about half a pixel) from the straight line between its ends, or it runs into NaN.
+# flat stretches stop after the first level, curves and poles are refined down to span/(initial*2**max_depth).
+# intervals at the finest level that still jump across most of the view (tan asymptotes) get a NaN between them
+# so matplotlib breaks the line there instead of drawing a vertical stroke
+#
+# TileSampleCache keeps those samples per x tile so panning and zooming only samples the newly exposed tiles
+
+def visible_range(y:np.ndarray, low:float=2, high:float=98, pad:float=.1) -> tuple[float, float]:
+    '''
+    y limits that show the curve without being stretched by poles; the low/high percentiles of the finite values padded by `pad`
+
+    Returns
+    -------
+    (y_min, y_max); (-1, 1) if nothing is finite
+    '''
+    y = y[np.isfinite(y)]
+    if not y.size:
+        return (-1., 1.)
+    y_min, y_max = np.percentile(y, [low, high])
+    span = y_max-y_min
+    if span <= 0:
+        span = max(abs(y_min), 1.)
+    return (float(y_min-span*pad), float(y_max+span*pad))
+
+def adaptive_sample(func:typing.Callable[[np.ndarray], np.ndarray], x_min:float, x_max:float,
+                    y_range:tuple[float, float]=None, tolerance:float=1e-3, initial:int=129,
+                    max_depth:int=10, max_samples:int=20_000, clip:bool=True) -> tuple[np.ndarray, np.ndarray, int]:
+    '''
+    samples of func on [x_min, x_max], dense where the curve bends and sparse where it is flat
+
+    Parameters
+    ----------
+    func : vectorized f(x), e.g. lambda x: expr.evaluate_array(x=x); NaN where undefined
+    x_min, x_max : float
+        sampled interval
+    y_range : (float, float)
+        visible y limits the tolerance is measured against; None uses visible_range of the first samples
+    tolerance : float
+        largest allowed distance of a midpoint from the chord, as a fraction of the y range
+    initial : int
+        points of the starting uniform grid
+    max_depth : int
+        most times an interval is halved; the finest spacing is (x_max-x_min)/((initial-1)*2**max_depth)
+    max_samples : int
+        stop refining once this many points have been evaluated
+    clip : bool
+        skip refining where the curve is above or below y_range, and only break jumps across its middle;
+        False makes the samples depend on the size of y_range only, not its position (for cached tiles)
+
+    Returns
+    -------
+    (x, y, evaluations); y has NaN inserted at detected discontinuities
+    '''
+    x = np.linspace(x_min, x_max, max(initial, 2))
+    y = np.asarray(func(x), dtype=np.float64)
+    evaluations = x.size
+    if y_range is None:
+        y_range = visible_range(y)
+    y_lo, y_hi = y_range
+    span = (y_hi-y_lo) or 1.
+    tol  = tolerance*span
+
+    # candidate[i] -> the interval x[i]..x[i+1] needs its midpoint checked
+    candidate = np.ones(x.size-1, dtype=bool)
+    refined   = np.zeros(x.size-1, dtype=bool) # midpoint was off the chord at the finest level
+    for _ in range(max_depth):
+        idx = np.flatnonzero(candidate)
+        if not idx.size or evaluations >= max_samples:
+            break
+        idx = idx[:max_samples-evaluations]
+        xl, xr = x[idx], x[idx+1]
+        yl, yr = y[idx], y[idx+1]
+        xm = (xl+xr)/2
+        ym = np.asarray(func(xm), dtype=np.float64)
+        evaluations += xm.size
+
+        with np.errstate(invalid='ignore'):
+            finite  = np.isfinite(yl) & np.isfinite(ym) & np.isfinite(yr)
+            bent    = np.abs(ym-(yl+yr)/2) > tol
+            # all three above or all below the view; the shape there is not seen
+            hidden  = clip & (((yl > y_hi) & (ym > y_hi) & (yr > y_hi)) | ((yl < y_lo) & (ym < y_lo) & (yr < y_lo)))
+        partial = ~finite & (np.isfinite(yl) | np.isfinite(ym) | np.isfinite(yr))
+        split   = (finite & bent & ~hidden) | partial
+
+        # insert the midpoints; each checked interval becomes two
+        x = np.insert(x, idx+1, xm)
+        y = np.insert(y, idx+1, ym)
+        flags = np.zeros(candidate.size+idx.size, dtype=bool)
+        new   = idx+np.arange(idx.size) # position of the left half after the insert
+        flags[new]   = split
+        flags[new+1] = split
+        candidate = flags
+        refined = candidate.copy()
+
+    # break the line across jumps that survived to the finest level and cross the middle of the view
+    with np.errstate(invalid='ignore'):
+        mid  = (y_lo+y_hi)/2
+        jump = refined & (np.abs(np.diff(y)) > span/2)
+        if clip:
+            jump &= (y[:-1] > mid) != (y[1:] > mid)
+        jump &= np.isfinite(y[:-1]) & np.isfinite(y[1:])
+    if jump.any():
+        at = np.flatnonzero(jump)+1
+        x = np.insert(x, at, (x[at-1]+x[at])/2)
+        y = np.insert(y, at, np.nan)
+    return x, y, evaluations
+
+class TileSampleCache():
+    '''
+    LRU cache of adaptive samples split into x tiles, keyed by (formula, x tile, resolution level)
+
+    The view is covered by about `tiles_per_view` tiles whose width is a power of two, so after a pan most
+    tiles are found again and only the newly exposed ones are sampled. The level is the pair of powers of two
+    nearest the tile width and the visible y span (the tolerance is measured against it), so zooming far
+    enough re-samples at the new resolution. Least recently used tiles are dropped past `max_bytes`
+
+    Example
+    -------
+        tiles = TileSampleCache()
+        x, y, evaluations = tiles.sample(expressions.compile_expression('tan(x)'), -10, 10, (-20, 20))
+    '''
+    def __init__(self, max_bytes:int=32<<20, tiles_per_view:int=8, tolerance:float=1e-3, initial:int=17, max_depth:int=10) -> None:
+        '''
+        Parameters
+        ----------
+        max_bytes : int
+            memory cap of the cached sample arrays
+        tiles_per_view : int
+            about how many tiles span the view
+        tolerance, initial, max_depth :
+            adaptive_sample settings of each tile
+        '''
+        self.__maxBytes:int = max_bytes
+        self.tiles_per_view:int = tiles_per_view
+        self.tolerance:float = tolerance
+        self.initial:int = initial
+        self.max_depth:int = max_depth
+        self.__cache:OrderedDict[tuple, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+        self.__bytes:int     = 0
+        self.__hits:int      = 0
+        self.__misses:int    = 0
+        self.__evictions:int = 0
+        return
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    @property
+    def max_bytes(self) -> int:
+        return self.__maxBytes
+
+    @max_bytes.setter
+    def max_bytes(self, value:int):
+        self.__maxBytes = value
+        self.__evict()
+        return
+
+    def cache_info(self) -> dict[str, int]:
+        '''hit/miss/eviction counters and memory use of the cache'''
+        return {'hits':self.__hits, 'misses':self.__misses, 'evictions':self.__evictions,
+                'size':len(self.__cache), 'bytes':self.__bytes, 'max_bytes':self.__maxBytes}
+
+    def cache_clear(self):
+        '''drop every tile and reset the counters'''
+        self.__cache.clear()
+        self.__bytes = self.__hits = self.__misses = self.__evictions = 0
+        return
+
+    def levels(self, x_min:float, x_max:float, y_span:float) -> tuple[int, int]:
+        '''(x level, y level); the tile width is 2**x_level and the tolerance is measured against 2**y_level'''
+        x_level = math.floor(math.log2((x_max-x_min)/self.tiles_per_view))
+        y_level = math.ceil(math.log2(y_span)) if y_span > 0 else 0
+        return (x_level, y_level)
+
+    def sample(self, expr:expressions.Expression, x_min:float, x_max:float, y_range:tuple[float, float]) -> tuple[np.ndarray, np.ndarray, int]:
+        '''
+        samples of expr (a function of x) covering [x_min, x_max]
+
+        Parameters
+        ----------
+        expr : compiled expression with x as its only variable
+        x_min, x_max : float
+            visible x range; whole tiles are returned so the ends reach a little past it
+        y_range : (float, float)
+            visible y limits; only their span is used
+
+        Returns
+        -------
+        (x, y, evaluations); evaluations counts only the tiles that were not cached
+        '''
+        x_level, y_level = self.levels(x_min, x_max, y_range[1]-y_range[0])
+        width = 2.0**x_level
+        y_span = 2.0**y_level
+        func = lambda x: expr.evaluate_array(x=x)
+
+        xs, ys = [], []
+        evaluations = 0
+        for k in range(math.floor(x_min/width), math.ceil(x_max/width)):
+            key = (expr.normalized, x_level, y_level, k)
+            tile = self.__cache.get(key)
+            if tile is not None:
+                self.__hits += 1
+                self.__cache.move_to_end(key)
+            else:
+                self.__misses += 1
+                x, y, n = adaptive_sample(func, k*width, (k+1)*width, (0., y_span), self.tolerance,
+                                          self.initial, self.max_depth, clip=False)
+                evaluations += n
+                tile = (x, y)
+                self.__cache[key] = tile
+                self.__bytes += x.nbytes+y.nbytes
+            xs.append(tile[0])
+            ys.append(tile[1])
+        self.__evict()
+        if not xs:
+            return np.empty(0), np.empty(0), 0
+        return np.concatenate(xs), np.concatenate(ys), evaluations
+
+    def __evict(self):
+        while self.__bytes > self.__maxBytes and self.__cache:
+            x, y = self.__cache.popitem(last=False)[1]
+            self.__bytes -= x.nbytes+y.nbytes
+            self.__evictions += 1
+        return
+
+if __name__ == '__main__':
+    import time, expressions
+    for f in ('math.sin(x)', 'math.tan(x)', 'math.sqrt(x)', 'x**3 - 2*x', 'math.sin(1/x)', '1/x'):
+        expr = expressions.compile_expression(f)
+        func = lambda x: expr.evaluate_array(x=x)
+        t = time.perf_counter()
+        x, y, n = adaptive_sample(func, -10, 10)
+        dt = time.perf_counter()-t
+
+        # distance from the 100k uniform reference as a fraction of the view, where it is drawn
+        xu = np.linspace(-10, 10, 100_000)
+        yu = func(xu)
+        y_lo, y_hi = visible_range(yu)
+        with np.errstate(invalid='ignore'):
+            ok = np.isfinite(yu) & (yu > y_lo) & (yu < y_hi)
+            err = np.abs(np.interp(xu, x[np.isfinite(y)], y[np.isfinite(y)])-yu)[ok]
+        print(f'{f:<14} evaluations={n:>6,} points={x.size:>6,} nan={int(np.isnan(y).sum()):>4} {dt*1000:6.1f} ms  '
+              f'99% error={np.percentile(err, 99)/(y_hi-y_lo):.1e} of view')
+
+    # pan by a tenth of the view; only the exposed tile is sampled
+    tiles = TileSampleCache()
+    expr = expressions.compile_expression('math.tan(x)')
+    for x_min in (-10, -8, -6):
+        t = time.perf_counter()
+        x, y, n = tiles.sample(expr, x_min, x_min+20, (-20, 20))
+        print(f'tiles view [{x_min}, {x_min+20}] evaluations={n:>5,} {(time.perf_counter()-t)*1000:5.1f} ms', tiles.cache_info())
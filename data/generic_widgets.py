@@ -1,12 +1,12 @@
 # =============================================================================
 # CODE IMPORTS
 # =============================================================================
-import os, sys, io, math, pickle
+from __future__ import annotations
+import os, sys, io, math, pickle, sqlite3, typing
+from collections import deque
+from itertools import islice
 from functools import partial
 from numbers import Number
-import matplotlib
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 # ---- PyQt UI Objects
 from PyQt5.QtWidgets import *
@@ -16,12 +16,18 @@ from PyQt5.QtWidgets import QWidget
 
 # ---- Local addins
 from _global_ import *
-import geometric_objects
+import expressions, formula_model, history_store, eval_worker
+
+# matplotlib and geometric_objects (shapely) are slow to import; they are imported by the widgets that use them
+# so the calculator and the main window can come up without them
+if typing.TYPE_CHECKING:
+    import geometric_objects
 
 # ---- PyQt UI Structs
 import wdg_matplot
 import wdg_calc
 import wdg_triangle
+import wdg_graph
 
 # lets use mathplot to show the graphing instead of PIL taht is not intended for stuff like this
 # https://www.pythonguis.com/tutorials/plotting-matplotlib/
@@ -35,6 +41,10 @@ class QMatplot(QWidget, wdg_matplot.Ui_Form):
         if lay is not None: lay.addWidget(self)
 
         # build the Matplot widget thing
+        import matplotlib
+        matplotlib.use('Qt5Agg')
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
         self.label.setText('coords: ')
         self.figure = Figure(figsize=(width, height), dpi=dpi)
         self.canvas = FigureCanvas(self.figure)
@@ -61,9 +71,10 @@ class QMatplot(QWidget, wdg_matplot.Ui_Form):
         return self.canvas.axes.plot(*args, scalex=scalex, scaley=scaley, data=data, **kwargs)
     
     def add_line(self, line:geometric_objects.Line_Segment, **kwargs):
+        from matplotlib.lines import Line2D
         x1,y1 = line.start_point
         x2,y2 = line.end_point
-        l = matplotlib.lines.Line2D([x1, x2], [y1, y2], **kwargs)
+        l = Line2D([x1, x2], [y1, y2], **kwargs)
         return self.canvas.axes.add_line(l)
     
     def annotate(self, text:str, point:tuple[Number, Number], xytext=None, xycoords='data', textcoords=None, arrowprops=None, annotation_clip=None, **kwargs):
@@ -73,6 +84,13 @@ class QMatplot(QWidget, wdg_matplot.Ui_Form):
         self.canvas.axes.clear()
         self.figure.canvas.draw_idle()        
         return
+    
+    def add_toolbar(self):
+        '''add the matplotlib pan/zoom toolbar under the canvas'''
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
+        self.toolbar = NavigationToolbar2QT(self.canvas, self)
+        self.widget.layout().addWidget(self.toolbar)
+        return self.toolbar
 
 class QPushbuttonRTF(QPushButton):
     def __init__(self, parent:QWidget, text_rtf:str):
@@ -198,15 +216,236 @@ class QColorSwatchLabel(QLabel):
         if not self.has_color():return None
         return f'rgba({self.color.red()}, {self.color.green()}, {self.color.blue()}, {self.color.alpha()})'
 
+def _preview_text(value) -> str:
+    '''short text of a result; long ints in scientific notation (they can be too big for a float)'''
+    if isinstance(value, int):
+        return formula_model.int_text(value, max_digits=20)
+    return f'{value}'
+
+class QEvaluator(QObject):
+    '''
+    Qt front of eval_worker.EvaluationPool; formulas run in warm worker processes with a timeout and memory
+    limit and the results come back on the GUI thread through `finished` and `failed`
+    '''
+    finished = pyqtSignal(int, object) # job, value
+    failed   = pyqtSignal(int, str)    # job, message ('cancelled' when cancelled)
+
+    def __init__(self, parent:QObject=None, workers:int=2, timeout:float=eval_worker.TIMEOUT, memory_limit:int=eval_worker.MEMORY_LIMIT):
+        super().__init__(parent)
+        # the callback runs on the pool's supervisor thread; emitting queues the signal to this object's thread
+        self.__pool = eval_worker.EvaluationPool(workers, timeout, memory_limit, self.__done)
+        return
+
+    def __done(self, job:int, ok:bool, value):
+        if ok:
+            self.finished.emit(job, value)
+        else:
+            self.failed.emit(job, str(value))
+        return
+
+    def submit(self, text:str, **bindings) -> int:
+        '''start evaluating a formula; returns the job number the signals carry'''
+        return self.__pool.submit(text, **bindings)
+
+    def cancel(self, job:int):
+        self.__pool.cancel(job)
+        return
+
+    def close(self):
+        self.__pool.close()
+        return
+
+class QHistoryListModel(QAbstractListModel):
+    '''
+    calculation history, newest first, kept in a ring buffer of `limit` entries
+
+    Adding is O(1); when full the oldest entry drops off the end. Each row is (id, formula text, result text).
+    With a HistoryStore the rows are also saved, and older saved rows are paged in as the view scrolls down
+    '''
+    PAGE = 200
+
+    def __init__(self, parent:QObject=None, limit:int=10_000, store:history_store.HistoryStore=None):
+        super().__init__(parent)
+        self.__rows:deque[tuple[int, str, str]] = deque(maxlen=limit)
+        self.store = store
+        # saved rows are paged in below this id; rows added from now on are above it
+        self.__before:int = None if store is None else store.last_id+1
+        self.__exhausted:bool = store is None
+        return
+
+    @property
+    def limit(self) -> int:
+        return self.__rows.maxlen
+
+    @limit.setter
+    def limit(self, value:int):
+        self.beginResetModel()
+        self.__rows = deque(islice(self.__rows, value), maxlen=value) # the newest, at the left
+        self.__trimmed()
+        self.endResetModel()
+        return
+
+    def rowCount(self, parent:QModelIndex=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.__rows)
+
+    def data(self, index:QModelIndex, role:int=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        _, text, result = self.__rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f'{text}={result}'
+        if role == Qt.ItemDataRole.UserRole:
+            return (text, result)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f'{text}={result}'
+        return None
+
+    def canFetchMore(self, parent:QModelIndex=QModelIndex()) -> bool:
+        return not parent.isValid() and not self.__exhausted and len(self.__rows) < self.limit
+
+    def fetchMore(self, parent:QModelIndex=QModelIndex()):
+        '''page the next older saved rows in at the bottom'''
+        want = min(self.PAGE, self.limit-len(self.__rows))
+        rows = self.store.page(self.__before, want)
+        if len(rows) < want:
+            self.__exhausted = True
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.__rows), len(self.__rows)+len(rows)-1)
+            self.__rows.extend((r.id, r.text, r.result) for r in rows)
+            self.__before = rows[-1].id
+            self.endInsertRows()
+        return
+
+    def add(self, text:str, result:str, formula:str=None):
+        '''
+        put a calculation at the top (and save it when there is a store)
+
+        Parameters
+        ----------
+        formula : normalized formula the store indexes for search; defaults to text
+        '''
+        row_id = None
+        if self.store is not None:
+            row_id = self.store.add(text, result, text if formula is None else formula)
+        if len(self.__rows) == self.__rows.maxlen:
+            last = len(self.__rows)-1
+            self.beginRemoveRows(QModelIndex(), last, last)
+            self.__rows.pop()
+            self.__trimmed()
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.__rows.appendleft((row_id, text, result))
+        self.endInsertRows()
+        return
+
+    def set_rows(self, rows:list[history_store.HistoryRow]):
+        '''show these rows (e.g. search results) instead'''
+        self.beginResetModel()
+        self.__rows.clear()
+        self.__rows.extend((r.id, r.text, r.result) for r in rows[:self.limit])
+        self.__exhausted = True
+        self.endResetModel()
+        return
+
+    def matching(self, term:str) -> list[history_store.HistoryRow]:
+        '''rows in memory whose formula text contains term'''
+        return [history_store.HistoryRow(i, 0., t, r, t) for i,t,r in self.__rows if term in t]
+
+    def __trimmed(self):
+        # rows dropped off the bottom can be paged back in from the store
+        if self.store is not None and self.__rows and self.__rows[-1][0] is not None:
+            self.__before = self.__rows[-1][0]
+            self.__exhausted = False
+        return
+
+    def clear(self):
+        '''empty the view; saved rows stay in the store'''
+        self.beginResetModel()
+        self.__rows.clear()
+        self.__exhausted = True
+        self.endResetModel()
+        return
+
+class QHistoryDelegate(QStyledItemDelegate):
+    '''draws a history row as "formula=" followed by the result in bold'''
+    def paint(self, painter:QPainter, option:QStyleOptionViewItem, index:QModelIndex):
+        text, result = index.data(Qt.ItemDataRole.UserRole)
+        self.initStyleOption(option, index)
+        option.text = ''
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget)
+
+        painter.save()
+        rect = option.rect.adjusted(4, 0, -4, 0)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(option.palette.highlightedText().color())
+        head = f'{text}='
+        painter.setFont(option.font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, head)
+        bold = QFont(option.font)
+        bold.setBold(True)
+        painter.setFont(bold)
+        rect.setLeft(rect.left()+QFontMetrics(option.font).horizontalAdvance(head))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, result)
+        painter.restore()
+        return
+
 class QCalcWidget(QWidget, wdg_calc.Ui_Form):
-    def __init__(self, parent:QWidget):
+    def __init__(self, parent:QWidget, history_limit:int=10_000, history_path:str=PTH_HST):
         super().__init__(parent)
         self.setupUi(self)
         self.show()
 
-        self.__frmla  = ''
-        self._sqrting = False
-        self._dpSqrt  = 0
+        # the display and the evaluable formula both come from this token list
+        self.__formula = formula_model.FormulaModel()
+
+        # history: a list view only lays out the visible rows; swap it in for the designer's text box.
+        # saved to history_path (None keeps it in memory only)
+        store = history_store.HistoryStore(history_path) if history_path else None
+        self.history = QHistoryListModel(self, history_limit, store)
+        self.__found = QHistoryListModel(self, history_limit) # search results
+        self.listView = QListView(self)
+        self.listView.setModel(self.history)
+        self.listView.setItemDelegate(QHistoryDelegate(self.listView))
+        self.listView.setUniformItemSizes(True)
+        self.listView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.gridLayout_2.replaceWidget(self.textEdit_2, self.listView)
+        self.textEdit_2.setParent(None)
+        self.textEdit_2.deleteLater()
+
+        self.lineEdit_search = QLineEdit(self)
+        self.lineEdit_search.setPlaceholderText('Search history, e.g. asin')
+        self.lineEdit_search.setClearButtonEnabled(True)
+        self.gridLayout_2.addWidget(self.lineEdit_search, 13, 4, 1, 1)
+        self.__searchTimer = QTimer(self)
+        self.__searchTimer.setSingleShot(True)
+        self.__searchTimer.setInterval(150)
+        self.__searchTimer.timeout.connect(self.search_history)
+        self.lineEdit_search.textChanged.connect(self.__searchTimer.start)
+
+        # formulas that don't fold to a constant while compiling run off the GUI thread; SOLVE turns into Cancel meanwhile
+        self.__evaluator = QEvaluator(self)
+        self.__evaluator.finished.connect(self.__evaluated)
+        self.__evaluator.failed.connect(self.__evaluationFailed)
+        self.__job:int = None
+        self.__running:tuple[str, expressions.Expression] = None # display text and formula of the job
+
+        # live result under the display; re-evaluated a moment after the last keypad press. formulas that
+        # fold to a constant show at once, the rest run in the evaluator and only the newest job's result is shown
+        self.label_preview = QLabel(self)
+        self.label_preview.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.label_preview.setStyleSheet('color: grey;')
+        self.gridLayout_2.removeWidget(self.textEdit)
+        self.gridLayout_2.addWidget(self.textEdit, 0, 0, 2, 3)
+        self.gridLayout_2.addWidget(self.label_preview, 2, 0, 1, 3)
+        self.__previewJob:int = None
+        self.__previewExpr:expressions.Expression = None
+        self.__previewTimer = QTimer(self)
+        self.__previewTimer.setSingleShot(True)
+        self.__previewTimer.setInterval(50)
+        self.__previewTimer.timeout.connect(self.preview)
+        self.__evaluator.finished.connect(self.__previewed)
+        self.__evaluator.failed.connect(self.__previewFailed)
 
         hstLy = parent.layout()
         hstLy.addWidget(self)
@@ -223,7 +462,7 @@ class QCalcWidget(QWidget, wdg_calc.Ui_Form):
 
         #region top row items
         self._pb_oox = QPushbuttonRTF(btn.parent(),"X<sup>-1</sup>")
-        self._pb_oox.clicked.connect(partial(self.eval_prefix_append, '1/(', '<sup>-1</sup>('))
+        self._pb_oox.clicked.connect(partial(self.eval_prefix_append, '1/(', '(', ')<sup>-1</sup>'))
         btn_layout.replaceWidget(btn, self._pb_oox)
         btn.setParent(None)
         btn.deleteLater()
@@ -316,85 +555,302 @@ class QCalcWidget(QWidget, wdg_calc.Ui_Form):
         return
     
     def sqrt_start(self):
-        self._sqrting = True
-        self.append_text(self.textEdit, '<span style="white-space: nowrap">&radic;<span style="text-decoration:overline;">&nbsp;')
-        self.__frmla = f'{self.__frmla}math.sqrt('
+        self.__render(self.__formula.sqrt_open())
         return
     
-    def eval_prefix_append(self, formula, html):
-        self.__frmla = f'{formula}{self.__frmla})'
-        self.textEdit.append({html})
+    def eval_prefix_append(self, formula, html, html_suffix=')'):
+        self.__render(*self.__formula.wrap(formula, html, ')', html_suffix))
         return
     
     def append_text(self, text_edit:QTextEdit, text:str):
-        text_edit.selectAll()
-        md:QMimeData = text_edit.createMimeDataFromSelection()        
-        text_edit.setText(f'{md.text()}{text}')
+        cursor = QTextCursor(text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertHtml(text)
         return
     
     def prefix_text(self, text_edit:QTextEdit, text:str):
-        text_edit.selectAll()
-        md:QMimeData = text_edit.createMimeDataFromSelection()
-        text_edit.setText(f'{text}{md.text()}')
+        cursor = QTextCursor(text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.insertHtml(text)
+        return
+    
+    def __render(self, *edits:formula_model.Edit):
+        '''apply the model edits to the display; only the new tokens are inserted'''
+        for edit in edits:
+            html = ''.join(t.html for t in edit.tokens)
+            if edit.at == 'replace':
+                self.textEdit.clear()
+                self.append_text(self.textEdit, html)
+            elif edit.at == 'start':
+                self.prefix_text(self.textEdit, html)
+            else:
+                self.append_text(self.textEdit, html)
+        self.__previewTimer.start()
         return
     
     def prefix_formula(self, formula, html):
-        self.__frmla = f'{formula}{self.__frmla})'
-        self.prefix_text(self.textEdit,html)
-        self.append_text(self.textEdit,')')
+        self.__render(*self.__formula.wrap(formula, html))
         return
     
     def append_formula(self, formula, html):
-        self.__frmla = f'{self.__frmla}{formula}'
-        if self._sqrting and html=='(':
-            self._dpSqrt += 1
-            self.append_text(self.textEdit,html)
-        elif self._sqrting and html==')':
-            self._sqrting = bool(self._dpSqrt > 0)
-            if self._dpSqrt > 0:
-                self._dpSqrt -= 1
-                self.append_text(self.textEdit,html)
-            else:
-                self._dpSqrt = 0
-                self.textEdit.selectAll()
-                md:QMimeData = self.textEdit.createMimeDataFromSelection()
-                vals = md.text().split('√')
-                self.textEdit.setText(f'{vals[0]}<span style="white-space: nowrap">&radic;<span style="text-decoration:overline;">&nbsp;{vals[1]}</span></span>')
-                self._sqrting = False
+        if formula == ')':
+            self.__render(self.__formula.close())
         else:
-            self.append_text(self.textEdit,html)
+            self.__render(self.__formula.append(formula, html))
         return
     
     def calculate(self):
-        if self.__frmla is not None:
+        if self.__job is not None:
+            # the button reads Cancel while a formula is running
+            self.__evaluator.cancel(self.__job)
+            return
+        if len(self.__formula):
             try:
-                self.textEdit.selectAll()
-                self.textEdit_2.selectAll()
-                md:QMimeData = self.textEdit.createMimeDataFromSelection()
-                mh:QMimeData = self.textEdit_2.createMimeDataFromSelection()
-
-                val = eval(self.__frmla)
-                if val < 0:
-                    val = f'({val})'
-                self.textEdit.setText(f'<b>{val}</b>')
-                self.textEdit_2.setText(f'{md.text()}=<b>{val}</b><br><br>{mh.text()}')
-            except Exception as e:
-                print(f"failed to eval: '{self.__frmla}'\n{e}")
-                return self.clear_current()
-            self.__frmla = ''
+                expr = expressions.compile_expression(self.__formula.expression)
+            except expressions.ExpressionError as e:
+                self.__reportFailure(str(e))
+                return
+            if expr.is_constant:
+                # folded to its value while compiling; nothing left to run
+                return self.__showResult(self.__formula.text, expr, expr.tree.value)
+            self.__running = (self.__formula.text, expr)
+            if self.__previewJob is not None and self.__previewExpr is expr:
+                # the preview is already running this formula; wait on it rather than starting over
+                self.__job, self.__previewJob = self.__previewJob, None
+            else:
+                self.__job = self.__evaluator.submit(expr.normalized)
+            self.__setBusy(True)
+        return
+    
+    def __showResult(self, text:str, expr:expressions.Expression, val):
+        result = self.__formula.set_result(val)
+        self.textEdit.clear()
+        self.__render(result)
+        self.__clearPreview()
+        self.history.add(text, result.tokens[0].text, expr.normalized)
+        return
+    
+    def preview(self):
+        '''evaluate the formula so far (open brackets closed) and show the result under the display'''
+        if self.__previewJob is not None:
+            # stale; newer input arrived
+            self.__evaluator.cancel(self.__previewJob)
+            self.__previewJob = None
+        self.__previewExpr = None
+        if self.__job is not None or not len(self.__formula):
+            self.label_preview.clear()
+            return
+        try:
+            expr = expressions.compile_expression(self.__formula.closed_expression)
+        except expressions.ExpressionError:
+            self.label_preview.clear() # not a whole formula yet, e.g. '2+'
+            return
+        if expr.is_constant:
+            self.label_preview.setText(f'= {_preview_text(expr.tree.value)}')
+            return
+        self.__previewExpr = expr
+        self.__previewJob = self.__evaluator.submit(expr.normalized)
+        return
+    
+    def __previewed(self, job:int, val):
+        if job == self.__previewJob:
+            self.__previewJob = None
+            self.label_preview.setText(f'= {_preview_text(val)}')
+        return
+    
+    def __previewFailed(self, job:int, msg:str):
+        if job == self.__previewJob:
+            self.__previewJob = None
+            self.label_preview.clear()
+        return
+    
+    def __clearPreview(self):
+        self.__previewTimer.stop()
+        if self.__previewJob is not None:
+            self.__evaluator.cancel(self.__previewJob)
+        self.__previewJob = self.__previewExpr = None
+        self.label_preview.clear()
+        return
+    
+    def __evaluated(self, job:int, val):
+        if job != self.__job:
+            return
+        text, expr = self.__running
+        self.__setBusy(False)
+        self.__showResult(text, expr, val)
+        return
+    
+    def __evaluationFailed(self, job:int, msg:str):
+        if job != self.__job:
+            return
+        self.__setBusy(False)
+        if msg != 'cancelled':
+            self.__reportFailure(msg)
+        return
+    
+    def __reportFailure(self, msg:str):
+        '''tell why the formula could not be calculated and clear it'''
+        warningMessageWindow(self, None, f"Could not calculate '{self.__formula.text}'\n{msg}")
+        self.clear_current()
+        return
+    
+    def __setBusy(self, busy:bool):
+        '''lock the keypad while a formula runs; SOLVE becomes Cancel'''
+        if not busy:
+            self.__job = self.__running = None
+        for btn in self.findChildren(QAbstractButton):
+            if btn is not self.pushButton_28:
+                btn.setEnabled(not busy)
+        self.pushButton_28.setText('Cancel' if busy else 'SOLVE')
         return
     
     def clear_history(self):
-        self.textEdit_2.setText('')        
+        self.history.clear()
+        return
+    
+    def search_history(self):
+        '''show the calculations matching the search box, or the history when it is empty'''
+        term = self.lineEdit_search.text().strip()
+        if not term:
+            self.listView.setModel(self.history)
+            return
+        if self.history.store is not None:
+            try:
+                self.history.store.flush()
+                rows = self.history.store.search(term, self.__found.limit)
+            except sqlite3.Error as e:
+                return warningMessageWindow(self, None, f"Could not search the history for '{term}'\n{e}")
+        else:
+            rows = self.history.matching(term)
+        self.__found.set_rows(rows)
+        self.listView.setModel(self.__found)
         return
     
     def clear_current(self):
+        if self.__job is not None:
+            self.__evaluator.cancel(self.__job)
+        self.__clearPreview()
         self.textEdit.setText('')
-        self.__frmla = ''
+        self.__formula.clear()
+        return
+
+class QGraphWidget(QWidget, wdg_graph.Ui_Form):
+    '''
+    plots y = f(x) from the formula box with adaptive sampling (see function_plot.adaptive_sample)
+
+    Panning or zooming (toolbar or mouse wheel) re-samples the new view after a short pause; samples are kept
+    per x tile (function_plot.TileSampleCache) so only the newly exposed tiles are evaluated
+    '''
+    def __init__(self, parent:QWidget):
+        super().__init__(parent)
+        self.setupUi(self)
+        self.show()
+        parent.layout().addWidget(self)
+
+        self._cnvs = QMatplot(self.widget, width=5, height=4, dpi=100)
+        self._cnvs.add_toolbar()
+        self.__axes = self._cnvs.canvas.axes
+        self.__axes.grid(True, alpha=.3)
+        self.__axes.axhline(0, color='grey', linewidth=.8)
+        self.__axes.axvline(0, color='grey', linewidth=.8)
+        self.__line, = self.__axes.plot([], [], linewidth=1.5)
+
+        self.__expr:expressions.Expression = None
+        self.__tiles = None     # function_plot.TileSampleCache; made with the first render
+        self.__updating = False # set while the widget itself changes the limits
+        self.evaluations = 0    # samples evaluated by the last render
+
+        # coalesce the limit changes of a pan/zoom drag into one re-sample
+        self.__resampleTimer = QTimer(self)
+        self.__resampleTimer.setSingleShot(True)
+        self.__resampleTimer.setInterval(30)
+        self.__resampleTimer.timeout.connect(self._resample)
+
+        self.pushButton.clicked.connect(self.plot)
+        self.lineEdit.returnPressed.connect(self.plot)
+        self.__axes.callbacks.connect('xlim_changed', self.__limitsChanged)
+        self.__axes.callbacks.connect('ylim_changed', self.__limitsChanged)
+        self._cnvs.canvas.mpl_connect('scroll_event', self.__scrollZoom)
+        self.plot()
+        return
+    
+    def plot(self):
+        '''compile the formula and plot it over the x range of the spin boxes'''
+        x_min, x_max = self.doubleSpinBox.value(), self.doubleSpinBox_2.value()
+        if x_min >= x_max:
+            return warningMessageWindow(self, None, "The x range is empty; the first value needs to be less than the second")
+        try:
+            expr = expressions.compile_expression(self.lineEdit.text())
+        except expressions.ExpressionError as e:
+            return warningMessageWindow(self, None, f"Could not read the formula\n{e}")
+        unknown = set(expr.variables)-{'x'}
+        if unknown:
+            return warningMessageWindow(self, None, f"Only x can be used as a variable; found {', '.join(sorted(unknown))}")
+        self.__expr = expr
+        self.__render(x_min, x_max, None)
+        return
+    
+    def _resample(self):
+        '''sample the formula again over the current view'''
+        if self.__expr is None:
+            return
+        self.__render(*self.__axes.get_xlim(), self.__axes.get_ylim())
+        return
+    
+    def __render(self, x_min:float, x_max:float, y_range:tuple[float, float]):
+        '''
+        sample and draw the formula on [x_min, x_max]
+
+        Parameters
+        ----------
+        y_range : (float, float)
+            visible y limits; None fits them to the curve
+        '''
+        import numpy as np
+        import function_plot
+        if self.__tiles is None:
+            self.__tiles = function_plot.TileSampleCache()
+        fit = y_range is None
+        try:
+            if fit:
+                # fit to uniform samples; the adaptive ones crowd around poles
+                y_range = function_plot.visible_range(self.__expr.evaluate_array(x=np.linspace(x_min, x_max, 257)))
+            x, y, self.evaluations = self.__tiles.sample(self.__expr, x_min, x_max, y_range)
+        except expressions.ExpressionError as e:
+            return warningMessageWindow(self, None, f"Could not evaluate the formula\n{e}")
+        self.__line.set_data(x, y)
+        self.__line.set_label(f'y = {self.__expr.normalized}')
+        self.__updating = True
+        try:
+            self.__axes.set_xlim(x_min, x_max)
+            if fit:
+                self.__axes.set_ylim(*y_range)
+        finally:
+            self.__updating = False
+        self.__axes.legend(loc='upper right')
+        self._cnvs.canvas.draw_idle()
+        return
+    
+    def __limitsChanged(self, axes):
+        if not self.__updating:
+            self.__resampleTimer.start()
+        return
+    
+    def __scrollZoom(self, event):
+        '''zoom about the mouse; wheel up zooms in'''
+        if event.inaxes is not self.__axes:
+            return
+        scale = 1/1.25 if event.button == 'up' else 1.25
+        x0, x1 = self.__axes.get_xlim()
+        y0, y1 = self.__axes.get_ylim()
+        self.__axes.set_xlim(event.xdata-(event.xdata-x0)*scale, event.xdata+(x1-event.xdata)*scale)
+        self.__axes.set_ylim(event.ydata-(event.ydata-y0)*scale, event.ydata+(y1-event.ydata)*scale)
+        self._cnvs.canvas.draw_idle()
         return
 
 class QTriangle_Solver(QWidget, wdg_triangle.Ui_Form):
     def __init__(self, parent:QWidget):
+        import geometric_objects
         super().__init__(parent)
         self.setupUi(self)
         self.show()
@@ -404,8 +860,9 @@ class QTriangle_Solver(QWidget, wdg_triangle.Ui_Form):
         # load in the matplot canvas
         self._cnvs = QMatplot(self.tab, width=5, height=4, dpi=100)
 
-        # link to an empty triangle to get used later
+        # link to an empty triangle to get used later; solved triangles come from the cache
         self.__t = geometric_objects.Triangle()
+        self.__solveCache = geometric_objects.TriangleSolveCache(maxsize=64)
 
         # load in the Wiki
         self.textEdit.setText(self.__t.wiki_html)
@@ -606,34 +1063,36 @@ class QTriangle_Solver(QWidget, wdg_triangle.Ui_Form):
                 y2 = v[3]
                 x3 = v[4]
                 y3 = v[5]
-                self.__t.solve_coords((x1,y1), (x2,y2), (x3,y3))
+                self.__t = self.__solveCache.solve('coords', (x1,y1), (x2,y2), (x3,y3))
                 return self._reloadValues()
             except Exception as ex:
-                return warningMessageWindow(self, inspect.stack()[0], f"Could not cast provided values as CSV x,y coords; please try again\n{ex}")
+                return warningMessageWindow(self, None, f"Could not cast provided values as CSV x,y coords; please try again\n{ex}")
         else:
             try:
                 p1 = float(p1)
                 p2 = float(p2)
                 p3 = float(p3)
             except Exception as ex:
-                return warningMessageWindow(self, inspect.stack()[0], "This does not do symbol solves at this time ... speak with dev")
+                return warningMessageWindow(self, None, "This does not do symbol solves at this time ... speak with dev")
 
         # determin what way to solve the triangle
-        # then have the class solve it
-        t = self.__t
+        # then have the cache solve it (or hand back the one already solved)
+        method = None
+        if self.radioButton_2.isChecked():    # SSS
+            method = 'SSS'
+        elif self.radioButton_3.isChecked():  # AAS
+            method = 'AAS'
+        elif self.radioButton_6.isChecked():  # ASA
+            method = 'ASA'
+        elif self.radioButton_5.isChecked():  # SSA
+            method = 'SSA'
+        elif self.radioButton.isChecked():    # SAS
+            method = 'SAS'
         try:
-            if self.radioButton_2.isChecked():    # SSS
-                t.solve_SSS(p1, p2, p3)
-            elif self.radioButton_3.isChecked():  # AAS
-                t.solve_AAS(p1, p2, p3)
-            elif self.radioButton_6.isChecked():  # ASA
-                t.solve_ASA(p1, p2, p3)
-            elif self.radioButton_5.isChecked():  # SSA
-                t.solve_SSA(p1, p2, p3)
-            elif self.radioButton.isChecked():    # SAS
-                t.solve_SAS(p1, p2, p3)
+            if method is not None:
+                self.__t = self.__solveCache.solve(method, p1, p2, p3)
         except Exception as e:
-            return warningMessageWindow(self, inspect.stack()[0], f"Could not solve triangle; please ensure you've selected the right option to solve.\nError: '{e}'")
+            return warningMessageWindow(self, None, f"Could not solve triangle; please ensure you've selected the right option to solve.\nError: '{e}'")
         
         # now that its solved load that info on the form        
         return self._reloadValues()
@@ -717,7 +1176,7 @@ class QTriangle_Solver(QWidget, wdg_triangle.Ui_Form):
         return
     
     def test_triangle(self):
-        self.__t.solve_SSA(12,9,87)
+        self.__t = self.__solveCache.solve('SSA', 12, 9, 87)
         self._renderGraph()
         # x,y = self.__t.coords_list
 
@@ -2,19 +2,56 @@
 # CODE IMPORTS
 # =============================================================================
 from __future__ import annotations
-import math, copy
+import math, typing
+from collections import OrderedDict
 from numbers import Number
+import numpy as np
 from shapely import Point, LineString, Polygon, GeometryCollection
 from shapely.geometry.base import BaseGeometry
     
 class Line_Segment():
+    '''
+    Line between two points
+
+    Stores the four coordinate values directly and does the line math with plain arithmetic;
+    the shapely LineString is only built the first time intersection, crosses or geometry is used
+
+    freeze() makes the line read-only so it can be shared without copying (Triangle hands out frozen lines)
+    '''
+    __slots__ = ('__x1', '__y1', '__x2', '__y2', '__lineString', '__frozen')
+
     def __init__(self, *args, **kwargs):
-        self.__lineString:LineString = None
+        self.__x1:float = None
+        self.__y1:float = None
+        self.__x2:float = None
+        self.__y2:float = None
+        self.__lineString:LineString = None # built on demand by the geometry property
+        self.__frozen:bool = False
         return
     
     def __str__(self):
         return f"{self.length}"
     
+    def __copy__(self):
+        if self.__frozen: return self
+        rtn = Line_Segment()
+        if self.__x1 is not None:
+            rtn.solve_points(self.start_point, self.end_point)
+        return rtn
+    
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+    
+    def freeze(self) -> Line_Segment:
+        '''make the line read-only; any solve after this raises AttributeError. Returns itself'''
+        self.__frozen = True
+        return self
+    
+    @property
+    def frozen(self) -> bool:
+        '''True when the line is read-only'''
+        return self.__frozen
+    
     def get_data(self) -> dict:
         rtn = {}
         rtn['length']      = self.length
@@ -28,34 +65,35 @@ class Line_Segment():
     #region checks
     def intersection(self, geometry:BaseGeometry):
         '''Returns the points that is shared between this and provided geometry.'''
-        return self.__lineString.intersection(geometry)
+        return self.geometry.intersection(geometry)
 
     def crosses(self, geometry:BaseGeometry) -> bool:
         '''does this line and geometry intersect'''
-        return self.__lineString.crosses(geometry)       
+        return self.geometry.crosses(geometry)       
     #endregion
 
     #region properties
     @property
-    def geometry(self):
-        return LineString(self.coords)
+    def geometry(self) -> LineString:
+        '''shapely LineString of the line; built once and reused until the line is solved again'''
+        if self.__lineString is None:
+            self.__lineString = LineString(self.coords)
+        return self.__lineString
     
     @property
     def start_point(self) -> tuple[Number,Number]:
         '''line start-point coordinate'''
-        return self.coords[0]
+        return (self.__x1, self.__y1)
     
     @property
     def end_point(self) -> tuple[Number,Number]:
         '''line end-point coordinate'''
-        return self.coords[1]
+        return (self.__x2, self.__y2)
     
     @property
     def mid_point(self) -> tuple[Number,Number]:
         '''line mid-point coordinate'''
-        x1, y1 = self.start_point
-        x2, y2 = self.end_point
-        return ((x1+x2)/2, (y1+y2)/2)
+        return ((self.__x1+self.__x2)/2, (self.__y1+self.__y2)/2)
     
     @property
     def coords(self) -> list[tuple[Number,Number],tuple[Number,Number]]:
@@ -66,7 +104,7 @@ class Line_Segment():
         -------
         [(start_x, start_y), (end_x, end_y)]
         '''
-        return list(self.__lineString.coords)
+        return [(self.__x1, self.__y1), (self.__x2, self.__y2)]
     
     @property
     def y_intercept(self) -> Number|str:
@@ -79,10 +117,11 @@ class Line_Segment():
         Returns
         -------
             Number : value of equation
-            str    : when there is a value error, string format of equation
+            str    : vertical line (slope is a string), string format of equation
         '''
-        m   = self.slope
-        x,y = self.start_point
+        m = self.slope
+        x = self.__x1
+        y = self.__y1
         if isinstance(m, Number):
             return y-(m*x)
         return f"{y}-({m}*{x})"
@@ -98,18 +137,15 @@ class Line_Segment():
         Returns
         -------
             Number : value of equation
-            str    : when there is a value error, string format of equation
+            str    : vertical line (x₂=x₁), string format of the equation '(y₂-y₁)/0'
         '''
-        c = self.coords
-        if not None in c:
-            x1,y1 = self.start_point
-            x2,y2 = self.end_point
-            x,y   = (y2-y1),(x2-x1)
-            try:
-                return y/x
-            except Exception as e:
-                return f"{y}/{x}"
-        return None
+        if self.__x1 is None:
+            return None
+        y = self.__y2-self.__y1
+        x = self.__x2-self.__x1
+        if x == 0:
+            return f"{y}/{x}"
+        return y/x
     
     @property
     def length(self):
@@ -118,9 +154,20 @@ class Line_Segment():
 
         this is defined algebraically as d=√( (x2-x1)² + (y2-y1)² )
         '''
-        return self.__lineString.length
+        return math.hypot(self.__x2-self.__x1, self.__y2-self.__y1)
     #endregion
 
+    def __setPoints(self, start_point, end_point):
+        '''store the coordinate values; accepts (x,y) pairs or shapely Points'''
+        if self.__frozen:
+            raise AttributeError("Line_Segment is frozen; solve a new Line_Segment instead")
+        if isinstance(start_point, Point): start_point = (start_point.x, start_point.y)
+        if isinstance(end_point, Point):   end_point   = (end_point.x, end_point.y)
+        self.__x1, self.__y1 = float(start_point[0]), float(start_point[1])
+        self.__x2, self.__y2 = float(end_point[0]), float(end_point[1])
+        self.__lineString = None
+        return
+
     #region solvers
     def get_PSL_points(self, point:tuple[Number,Number], slope:Number, length:Number) -> list[tuple[Number,Number],tuple[Number,Number]]:
         '''
@@ -172,7 +219,7 @@ class Line_Segment():
             length of the line to define
         '''
         points = self.get_PSL_points(point, slope, length)
-        self.__lineString = LineString([point, points[1]])
+        self.__setPoints(point, points[1])
         return
     
     def solve_end_SL(self, point:tuple[Number,Number], slope:Number, length:Number):
@@ -191,7 +238,7 @@ class Line_Segment():
             length of the line to define
         '''
         points = self.get_PSL_points(point, slope, length)
-        self.__lineString = LineString([points[0], point])
+        self.__setPoints(points[0], point)
         return
     
     def solve_points(self, start_point:tuple[Number,Number], end_point:tuple[Number,Number]):
@@ -207,7 +254,7 @@ class Line_Segment():
         end_point   : tuple[Number,Number]
             end point of the line to define
         '''
-        self.__lineString = LineString([start_point, end_point])
+        self.__setPoints(start_point, end_point)
         return
     #endregion
         
@@ -284,6 +331,50 @@ class Triangle():
 
         # to get set to the colection of lAC, lAB, lBC everytime they're redefined
         self.__tri:GeometryCollection = None
+
+        # derived values (area, perimeter, coords, ...) computed once per solve; emptied by every solve_*
+        self.__cache:dict[str, object] = {}
+        self.__cacheHits:int   = 0
+        self.__cacheMisses:int = 0
+
+        # set by freeze(); solving a frozen triangle raises so solved snapshots can be shared
+        self.__frozen:bool = False
+        return
+    
+    def freeze(self) -> Triangle:
+        '''make the triangle read-only; any solve after this raises AttributeError. Returns itself'''
+        self.__frozen = True
+        return self
+    
+    @property
+    def frozen(self) -> bool:
+        '''True when the triangle is read-only'''
+        return self.__frozen
+    
+    def cache_info(self) -> dict[str, int]:
+        '''hit/miss counters of the derived value cache; counters are kept across solves'''
+        return {'hits':self.__cacheHits, 'misses':self.__cacheMisses, 'size':len(self.__cache)}
+    
+    def __cached(self, key:str, func:typing.Callable[[], object]) -> object:
+        '''return the cached value for key, computing it with func on the first call after a solve'''
+        try:
+            val = self.__cache[key]
+        except KeyError:
+            self.__cacheMisses += 1
+            val = self.__cache[key] = func()
+            return val
+        self.__cacheHits += 1
+        return val
+    
+    def __clearCache(self):
+        self.__cache.clear()
+        return
+    
+    def __startSolve(self):
+        '''every solve_* entry point; refuse frozen triangles and drop the derived values of the last solve'''
+        if self.__frozen:
+            raise AttributeError("Triangle is frozen; solve a new Triangle instead")
+        self.__clearCache()
         return
     
     def get_data(self) -> dict[str, object]:
@@ -295,36 +386,33 @@ class Triangle():
                     'lmA':self.lmA, 'lmB':self.lmB, 'lmC':self.lmC}
     
     # region matplotlib_helpers
+    # the cached coordinate values are tuples so the shared values cannot be changed by callers
     @property
     def triangle_matplotlib_coords(self) -> list[list[Number], list[Number]]:
         '''Separate arrays of X and Y coordinate values of triangle geometry'''        
         # the built in XY feature throws and error 'NotImplementedError'
         # self.__tri.xy -- doing this myself
-        x,y = [],[]
-        for coord in self.triangle_coords:
-            x.append(coord[0])
-            y.append(coord[1])
-        return [x,y]
+        x,y = self.__cached('matplotlib_coords', lambda: tuple(zip(*self.triangle_coords)))
+        return [list(x),list(y)] # new lists; the cached values can't be changed by the caller
     @property
     def triangle_matplotlib_midpoint_coords(self) -> list[list[Number], list[Number]]:
         '''Separate arrays of X and Y coordinate values of triangle geometry midpoints'''
-        x,y = [],[]
-        for coord in self.triangle_midpoint_coords:
-            x.append(coord[0])
-            y.append(coord[1])
-        return [x,y]
+        x,y = self.__cached('matplotlib_midpoint_coords', lambda: tuple(zip(*self.triangle_midpoint_coords)))
+        return [list(x),list(y)]
     # endregion
 
     # region property defs
     @property
     def perimeter(self) -> Number:        
-        return self.__tri.length
+        return self.__cached('perimeter', lambda: self.__tri.length)
     @property
     def area(self) -> Number:
         '''Unitless area of the triangle geometry'''
-        a = self.side_a.length
-        b = self.side_b.length
-        c = self.side_c.length
+        return self.__cached('area', self.__area)
+    def __area(self) -> Number:
+        a = self.__lBC.length
+        b = self.__lAC.length
+        c = self.__lAB.length
         s = self.perimeter/2
         # Area = Square root of √( s(s-a)(s-b)(s-c) ) where s is half the perimeter
         return math.sqrt(s*(s-a)*(s-b)*(s-c))
@@ -337,21 +425,23 @@ class Triangle():
         -------
         (min_x, min_y, max_x, max_y)
         '''
-        return self.__tri.bounds
+        return self.__cached('bounds', lambda: self.__tri.bounds)
     @property
     def inradius(self):
         '''triangle geometry area/perimeter'''
-        return self.area/self.perimeter
+        return self.__cached('inradius', lambda: self.area/self.perimeter)
     @property
     def centroid(self) -> Point:
         '''geometric center of the triangle geometry'''
-        return self.__tri.centroid
+        return self.__cached('centroid', lambda: self.__tri.centroid)
     @property
     def circumradius(self):
         '''the distance from centroid to A,B, or C points of triangle'''
-        cr = Line_Segment()
-        cr.solve_points(self.centroid, self.__lAC.end_point)
-        return cr.length
+        return self.__cached('circumradius', self.__circumradius)
+    def __circumradius(self) -> Number:
+        c    = self.centroid
+        x, y = self.__lAC.end_point
+        return math.hypot(x-c.x, y-c.y)
     @property
     def Aϴ(self) -> Number:
         '''the angle (in degrees) at point A between lAC & lAB'''
@@ -364,18 +454,19 @@ class Triangle():
     def Cϴ(self) -> Number:
         '''the angle (in degrees) at point C between lAC & lBC'''
         return self.__Cϴ    
+    # the lines are frozen (read-only) Line_Segments so they are handed out as-is, no copies
     @property
     def lAC(self) -> Line_Segment:
         '''the line between point A and C (side b)'''
-        return copy.deepcopy(self.__lAC)
+        return self.__lAC
     @property
     def lBC(self) -> Line_Segment:
         '''the line between point B and C (side a)'''
-        return copy.deepcopy(self.__lBC)
+        return self.__lBC
     @property
     def lAB(self) -> Line_Segment:
         '''the line between point A and B (side c)'''
-        return copy.deepcopy(self.__lAB)
+        return self.__lAB
     @property
     def side_a(self):
         '''side a: the line between point B and C'''
@@ -391,26 +482,28 @@ class Triangle():
     @property
     def lmA(self) -> Line_Segment:
         '''the line between point A and midpoint lBC'''
-        return copy.deepcopy(self.__lmA)
+        return self.__lmA
     @property
     def lmB(self) -> Line_Segment:
         '''the line between point B and midpoint lAC'''
-        return copy.deepcopy(self.__lmB)
+        return self.__lmB
     @property
     def lmC(self) -> Line_Segment:
         '''the line between point C and midpoint lAB'''
-        return copy.deepcopy(self.__lmC)
+        return self.__lmC
     @property
     def triangle_coords(self) -> list[Point]:
         '''triangle geometry coordinates'''
+        return list(self.__cached('coords', self.__triangleCoords))
+    def __triangleCoords(self) -> tuple[Point]:
         A,C = self.__lAC.coords
-        B   = self.__lBC.coords[0]
+        B   = self.__lBC.start_point
         # WTF; self.__tri.coords returns NotImplementedError
-        return [A,B,C]
+        return (A,B,C)
     @property
     def triangle_midpoint_coords(self) -> list[Point]:
         '''triangle geometry midpoint coordinates'''
-        return [self.side_a.mid_point,self.side_b.mid_point,self.side_c.mid_point]
+        return list(self.__cached('midpoint_coords', lambda: (self.__lBC.mid_point,self.__lAC.mid_point,self.__lAB.mid_point)))
     @property
     def medians(self) -> dict[str, Line_Segment]:
         '''medians of triangle geometry'''
@@ -512,6 +605,7 @@ class Triangle():
         self.__lAC.solve_start_SL((0,0), 0, B)
         self.__lBC = Line_Segment()
         self.__lBC.solve_points(self.__lAB.end_point, self.__lAC.end_point)
+        self.__freezeLines(self.__lAB, self.__lAC, self.__lBC)
 
         # place lines into a collection for properties
         self.__tri = GeometryCollection([self.__lAC.geometry, self.__lBC.geometry, self.__lAB.geometry])
@@ -527,6 +621,7 @@ class Triangle():
         self.__lBC.solve_points(coord_B, coord_C)
         self.__lAB = Line_Segment()
         self.__lAB.solve_points(coord_A, coord_B)
+        self.__freezeLines(self.__lAC, self.__lBC, self.__lAB)
 
         self.__tri = GeometryCollection([self.__lAC.geometry, self.__lBC.geometry, self.__lAB.geometry])
         return
@@ -541,6 +636,13 @@ class Triangle():
         self.__lmB.solve_points(B, self.__lAC.mid_point)
         self.__lmC = Line_Segment()
         self.__lmC.solve_points(C, self.__lAB.mid_point)
+        self.__freezeLines(self.__lmA, self.__lmB, self.__lmC)
+        return
+    
+    def __freezeLines(self, *lines:Line_Segment):
+        '''lines are shared with callers from here on; make sure they cant change the solved triangle'''
+        for line in lines:
+            line.freeze()
         return
     
     def __solveAnglesFromSides(self,A,B,C):
@@ -572,6 +674,7 @@ class Triangle():
             find Cϴ: 180-(Aϴ+Bϴ)
             then The Law of Sines "a/sin(A) = b/sin(B) = c/sin(C)" to find each of the other two sides.
         '''
+        self.__startSolve()
         self.__Aϴ = Aϴ
         self.__Bϴ = Bϴ
         self.__Cϴ = 180-(Aϴ+Bϴ)
@@ -599,6 +702,7 @@ class Triangle():
             then use the three angles add to 180° to find the other angle
             finally use The Law of Sines again to find the unknown side
         '''
+        self.__startSolve()
         sa        = round((B*math.sin(math.radians(Aϴ)))/A,4)
         self.__Aϴ = Aϴ
         self.__Bϴ = math.degrees(math.asin(sa))
@@ -627,6 +731,7 @@ class Triangle():
             find the third angle using the three angles add to 180°
             then use The Law of Sines to find each of the other two sides.
         '''
+        self.__startSolve()
         self.__Aϴ = Aϴ
         self.__Bϴ = Bϴ
         self.__Cϴ = 180-(Aϴ+Bϴ)
@@ -658,6 +763,7 @@ class Triangle():
             then use The Law of Sines to find the smaller of the other two angles
             and then use the three angles add to 180° to find the last angle.
         '''
+        self.__startSolve()
         A = math.sqrt((B**2)+(C**2)-((2*B*C)*math.cos(math.radians(Aϴ))))
         return self.solve_SSS(A,B,C)
     
@@ -684,6 +790,7 @@ class Triangle():
             then use The Law of Cosines again to find another angle
             and finally use angles of a triangle add to 180° to find the last angle.
         '''
+        self.__startSolve()
         self.__solveAnglesFromSides(A, B, C)
         self.__finishSolve(A)
         return
@@ -711,6 +818,7 @@ class Triangle():
                 then use The Law of Cosines again to find another angle
                 and finally use angles of a triangle add to 180° to find the last angle.
         '''
+        self.__startSolve()
         # build the line segments on the coords ...
         self.__linesPerimeter(coord_A, coord_B, coord_C)
 
@@ -722,6 +830,436 @@ class Triangle():
         return
     #endregion
 
+class TriangleSolveCache():
+    '''
+    LRU cache of solved triangles keyed by the solve method and its inputs
+
+    Solving the same inputs again hands back the same frozen (read-only) Triangle instead of solving from scratch.
+    Failed solves are not cached; the error is raised every time
+
+    Example
+    -------
+        cache = TriangleSolveCache(maxsize=64)
+        t = cache.solve('SSS', 4, 3, 5)
+    '''
+    METHODS = ('SSS', 'SAS', 'ASA', 'AAS', 'SSA', 'coords')
+
+    def __init__(self, maxsize:int=128, bypass:bool=False) -> None:
+        '''
+        Parameters
+        ----------
+        maxsize : int
+            most solved triangles to keep; least recently used are dropped first
+        bypass  : bool
+            solve every call without reading or filling the cache (for benchmarking)
+        '''
+        self.__maxsize:int = maxsize
+        self.bypass:bool   = bypass
+        self.__cache:OrderedDict[tuple, Triangle] = OrderedDict()
+        self.__hits:int      = 0
+        self.__misses:int    = 0
+        self.__evictions:int = 0
+        return
+    
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+    
+    @maxsize.setter
+    def maxsize(self, value:int):
+        self.__maxsize = value
+        self.__evict()
+        return
+    
+    def cache_info(self) -> dict[str, int]:
+        '''hit/miss/eviction counters of the cache'''
+        return {'hits':self.__hits, 'misses':self.__misses, 'evictions':self.__evictions,
+                'size':len(self.__cache), 'maxsize':self.__maxsize}
+    
+    def cache_clear(self):
+        '''drop every cached triangle and reset the counters'''
+        self.__cache.clear()
+        self.__hits = self.__misses = self.__evictions = 0
+        return
+    
+    @classmethod
+    def key(cls, method:str, *values) -> tuple:
+        '''
+        cache key of a solve; the method name (with or without 'solve_') and the inputs as floats
+
+        Parameters
+        ----------
+        method : str
+            one of METHODS; 'SSS', 'solve_SSS', ...
+        values : Number | tuple[Number, Number]
+            the three solve inputs; (x,y) pairs for 'coords'
+        '''
+        if method.startswith('solve_'):
+            method = method[6:]
+        if method not in cls.METHODS:
+            raise ValueError(f"unknown solve method '{method}'; expected one of {cls.METHODS}")
+        if len(values) != 3:
+            raise ValueError(f"solve_{method} takes 3 values, got {len(values)}")
+        if method == 'coords':
+            return (method,)+tuple((float(v[0]), float(v[1])) for v in values)
+        return (method,)+tuple(float(v) for v in values)
+    
+    def solve(self, method:str, *values) -> Triangle:
+        '''
+        frozen Triangle solved via Triangle.solve_<method>(*values); from the cache when already solved
+
+        Parameters
+        ----------
+        method : str
+            one of METHODS; 'SSS', 'solve_SSS', ...
+        values : Number | tuple[Number, Number]
+            the three solve inputs; (x,y) pairs for 'coords'
+        '''
+        key = self.key(method, *values)
+        if not self.bypass:
+            t = self.__cache.get(key)
+            if t is not None:
+                self.__hits += 1
+                self.__cache.move_to_end(key)
+                return t
+            self.__misses += 1
+        
+        t = Triangle()
+        getattr(t, f'solve_{key[0]}')(*key[1:])
+        t.freeze()
+        if not self.bypass:
+            self.__cache[key] = t
+            self.__evict()
+        return t
+    
+    def __evict(self):
+        while len(self.__cache) > max(self.__maxsize, 0):
+            self.__cache.popitem(last=False)
+            self.__evictions += 1
+        return
+
+class TriangleBatch():
+    '''
+    Array companion of Triangle; solves many triangles at once
+
+    Holds sides, angles and vertex coordinates as NumPy arrays (one row per triangle) and runs the same
+    solvers as Triangle over whole arrays, placing the vertices exactly the way Triangle does.
+    Nothing here builds Line_Segment or shapely objects; use to_triangle() to get a single Triangle back.
+
+    Rows that cannot be solved are not raised, they are flagged in `status` and left as NaN
+    '''
+    # per-row status codes
+    STATUS_OK         = 0 # solved
+    STATUS_NOT_SOLVED = 1 # no solve has been run on this row
+    STATUS_SIDE       = 2 # a side is not a positive number
+    STATUS_INEQUALITY = 3 # sides fail the triangle inequality
+    STATUS_ANGLE_SUM  = 4 # an angle is not positive or the angles sum to 180° or more
+    STATUS_DOMAIN     = 5 # asin/acos argument out of range (no triangle for the given SSA)
+
+    def __init__(self, size:int=0) -> None:
+        self.__Aϴ:np.ndarray     = np.full(size, np.nan) # the angle at point A between lAC & lAB
+        self.__Bϴ:np.ndarray     = np.full(size, np.nan) # the angle at point B between lAB & lBC
+        self.__Cϴ:np.ndarray     = np.full(size, np.nan) # the angle at point C between lAC & lBC
+        self.__coords:np.ndarray = np.full((size, 3, 2), np.nan) # [A, B, C] points per row
+        self.__status:np.ndarray = np.full(size, self.STATUS_NOT_SOLVED, dtype=np.uint8)
+        return
+
+    def __len__(self) -> int:
+        return len(self.__status)
+
+    def get_data(self) -> dict[str, np.ndarray]:
+        '''quick way to get the batch geometry as arrays; same keys as Triangle.get_data where it makes sense'''
+        return {"side_a":self.side_a, "side_b":self.side_b, "side_c":self.side_c,
+                "angle_a":self.Aϴ, "angle_b":self.Bϴ, "angle_c":self.Cϴ,
+                "area":self.area, "perimeter":self.perimeter, "inradius":self.inradius,
+                "coords":self.triangle_coords, "status":self.status}
+
+    def to_triangle(self, index:int) -> Triangle:
+        '''build a full Triangle for a single solved row'''
+        if self.__status[index] != self.STATUS_OK:
+            raise ValueError(f"row {index} is not solved (status {self.__status[index]})")
+        A,B,C = (tuple(float(v) for v in p) for p in self.__coords[index])
+        t = Triangle()
+        t.solve_coords(A, B, C)
+        return t
+
+    # region property defs
+    @property
+    def status(self) -> np.ndarray:
+        '''per-row status code; see the STATUS_* class attributes'''
+        return self.__status
+    @property
+    def valid(self) -> np.ndarray:
+        '''boolean mask of the rows that solved'''
+        return self.__status == self.STATUS_OK
+    @property
+    def Aϴ(self) -> np.ndarray:
+        '''the angles (in degrees) at point A between lAC & lAB'''
+        return self.__Aϴ
+    @property
+    def Bϴ(self) -> np.ndarray:
+        '''the angles (in degrees) at point B between lAB & lBC'''
+        return self.__Bϴ
+    @property
+    def Cϴ(self) -> np.ndarray:
+        '''the angles (in degrees) at point C between lAC & lBC'''
+        return self.__Cϴ
+    @property
+    def triangle_coords(self) -> np.ndarray:
+        '''triangle geometry coordinates; shape (n, 3, 2) as [A, B, C] per row'''
+        return self.__coords
+    @property
+    def side_a(self) -> np.ndarray:
+        '''side a: length of the line between point B and C'''
+        return self.__length(1, 2)
+    @property
+    def side_b(self) -> np.ndarray:
+        '''side b: length of the line between point A and C'''
+        return self.__length(0, 2)
+    @property
+    def side_c(self) -> np.ndarray:
+        '''side c: length of the line between point A and B'''
+        return self.__length(0, 1)
+    @property
+    def perimeter(self) -> np.ndarray:
+        return self.side_a+self.side_b+self.side_c
+    @property
+    def area(self) -> np.ndarray:
+        '''Unitless area of the triangle geometry [Heron's Formula]'''
+        a,b,c = self.side_a, self.side_b, self.side_c
+        s = (a+b+c)/2
+        with np.errstate(invalid='ignore'):
+            return np.sqrt(s*(s-a)*(s-b)*(s-c))
+    @property
+    def inradius(self) -> np.ndarray:
+        '''triangle geometry area/perimeter'''
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.area/self.perimeter
+    @property
+    def triangle_midpoint_coords(self) -> np.ndarray:
+        '''midpoints of side a, b and c; shape (n, 3, 2)'''
+        p = self.__coords
+        return np.stack([(p[:,1]+p[:,2])/2, (p[:,0]+p[:,2])/2, (p[:,0]+p[:,1])/2], axis=1)
+    @property
+    def medians(self) -> np.ndarray:
+        '''lengths of the medians lmA, lmB and lmC; shape (n, 3)'''
+        d = self.__coords-self.triangle_midpoint_coords
+        return np.hypot(d[...,0], d[...,1])
+
+    def __length(self, i:int, j:int) -> np.ndarray:
+        d = self.__coords[:,j]-self.__coords[:,i]
+        return np.hypot(d[:,0], d[:,1])
+    # endregion
+
+    #region solvers
+    @staticmethod
+    def __arrays(*values) -> list[np.ndarray]:
+        arrs = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in values])
+        return [np.atleast_1d(a).ravel() for a in arrs]
+
+    def __reset(self, size:int):
+        self.__init__(size)
+        return
+
+    def __finishSolve(self, A:np.ndarray, ok:np.ndarray):
+        # same steps as Triangle.__finishSolve; a/sin(A) = b/sin(B) = c/sin(C)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sa = np.round(A/np.sin(np.radians(self.__Aϴ)),2)
+            C  = np.sin(np.radians(self.__Cϴ))*sa
+            B  = np.sin(np.radians(self.__Bϴ))*sa
+
+            # lAB from (0,0) with the slope of Aϴ (Line_Segment.get_PSL_points) and lAC along the x axis
+            m = np.tan(np.radians(self.__Aϴ))
+            c = 1/np.sqrt(1+(m**2))
+            s = m/np.sqrt(1+(m**2))
+
+        coords = self.__coords
+        coords[:,0] = 0
+        coords[:,1,0] = np.round(C*c,6)
+        coords[:,1,1] = np.round(C*s,6)
+        coords[:,2,0] = np.round(B,6)
+        coords[:,2,1] = 0
+
+        ok &= np.isfinite(coords).all(axis=(1,2))
+        self.__finalize(ok)
+        return
+
+    def __finalize(self, ok:np.ndarray):
+        self.__flag(~ok, self.STATUS_DOMAIN)
+        self.__status[ok & (self.__status == self.STATUS_NOT_SOLVED)] = self.STATUS_OK
+        bad = ~ok
+        self.__Aϴ[bad] = np.nan
+        self.__Bϴ[bad] = np.nan
+        self.__Cϴ[bad] = np.nan
+        self.__coords[bad] = np.nan
+        return
+
+    def __flag(self, mask:np.ndarray, status:int) -> np.ndarray:
+        '''flag rows not already flagged; returns the still good rows mask'''
+        self.__status[mask & (self.__status == self.STATUS_NOT_SOLVED)] = status
+        return self.__status == self.STATUS_NOT_SOLVED
+
+    def __checkSides(self, *sides:np.ndarray) -> np.ndarray:
+        bad = np.zeros(len(sides[0]), dtype=bool)
+        for s in sides:
+            bad |= ~(s > 0)
+        return self.__flag(bad, self.STATUS_SIDE)
+
+    def __checkAngles(self) -> np.ndarray:
+        bad = ~((self.__Aϴ > 0) & (self.__Bϴ > 0) & (self.__Cϴ > 0))
+        return self.__flag(bad, self.STATUS_ANGLE_SUM)
+
+    def __solveAnglesFromSides(self, A:np.ndarray, B:np.ndarray, C:np.ndarray):
+        self.__checkSides(A, B, C)
+        self.__flag((A >= B+C) | (B >= A+C) | (C >= A+B), self.STATUS_INEQUALITY)
+        a2,b2,c2 = A**2, B**2, C**2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.__Aϴ = np.degrees(np.arccos((b2+c2-a2)/(2*B*C)))
+            self.__Bϴ = np.degrees(np.arccos((c2+a2-b2)/(2*C*A)))
+        self.__Cϴ = 180-(self.__Aϴ+self.__Bϴ)
+        return self.__checkAngles()
+
+    def solve_AAS(self, Aϴ, Bϴ, A):
+        '''
+        solve triangles via Angle-Angle-Side (AAS); see Triangle.solve_AAS
+
+        Parameters
+        ----------
+        Aϴ : array_like
+            angles (in degrees) at point A
+        Bϴ : array_like
+            angles (in degrees) at point B
+        A  : array_like
+            lengths of line BC (side a)
+        '''
+        Aϴ, Bϴ, A = self.__arrays(Aϴ, Bϴ, A)
+        self.__reset(len(A))
+        self.__Aϴ = Aϴ.copy()
+        self.__Bϴ = Bϴ.copy()
+        self.__Cϴ = 180-(Aϴ+Bϴ)
+        self.__checkSides(A)
+        ok = self.__checkAngles()
+        self.__finishSolve(A, ok)
+        return
+
+    def solve_SSA(self, A, B, Aϴ):
+        '''
+        solve triangles via Side-Side-Angle (SSA); see Triangle.solve_SSA
+
+        Parameters
+        ----------
+        A  : array_like
+            lengths of line BC (side a)
+        B  : array_like
+            lengths of line AC (side b)
+        Aϴ : array_like
+            angles (in degrees) at point A
+        '''
+        A, B, Aϴ = self.__arrays(A, B, Aϴ)
+        self.__reset(len(A))
+        self.__checkSides(A, B)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sa = np.round((B*np.sin(np.radians(Aϴ)))/A,4)
+            self.__flag(~(np.abs(sa) <= 1), self.STATUS_DOMAIN)
+            self.__Aϴ = Aϴ.copy()
+            self.__Bϴ = np.degrees(np.arcsin(sa))
+        self.__Cϴ = 180-(Aϴ+self.__Bϴ)
+        ok = self.__checkAngles()
+        self.__finishSolve(A, ok)
+        return
+
+    def solve_ASA(self, Aϴ, C, Bϴ):
+        '''
+        solve triangles via Angle-Side-Angle (ASA); see Triangle.solve_ASA
+
+        Parameters
+        ----------
+        Aϴ : array_like
+            angles (in degrees) at point A
+        C  : array_like
+            lengths of line AB (side c)
+        Bϴ : array_like
+            angles (in degrees) at point B
+        '''
+        Aϴ, C, Bϴ = self.__arrays(Aϴ, C, Bϴ)
+        self.__reset(len(C))
+        self.__Aϴ = Aϴ.copy()
+        self.__Bϴ = Bϴ.copy()
+        self.__Cϴ = 180-(Aϴ+Bϴ)
+        self.__checkSides(C)
+        ok = self.__checkAngles()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sa = C/np.sin(np.radians(self.__Cϴ))
+            A  = np.sin(np.radians(Aϴ))*sa
+        self.__finishSolve(A, ok)
+        return
+
+    def solve_SAS(self, B, Aϴ, C):
+        '''
+        solve triangles via Side-Angle-Side (SAS); see Triangle.solve_SAS
+
+        Parameters
+        ----------
+        B  : array_like
+            lengths of line AC (side b)
+        Aϴ : array_like
+            angles (in degrees) at point A
+        C  : array_like
+            lengths of line AB (side c)
+        '''
+        B, Aϴ, C = self.__arrays(B, Aϴ, C)
+        self.__reset(len(B))
+        self.__flag(~((Aϴ > 0) & (Aϴ < 180)), self.STATUS_ANGLE_SUM)
+        with np.errstate(invalid='ignore'):
+            A = np.sqrt((B**2)+(C**2)-((2*B*C)*np.cos(np.radians(Aϴ))))
+        ok = self.__solveAnglesFromSides(A, B, C)
+        self.__finishSolve(A, ok)
+        return
+
+    def solve_SSS(self, A, B, C):
+        '''
+        solve triangles via Side-Side-Side (SSS); see Triangle.solve_SSS
+
+        Parameters
+        ----------
+        A  : array_like
+            lengths of line BC (side a)
+        B  : array_like
+            lengths of line AC (side b)
+        C  : array_like
+            lengths of line AB (side c)
+        '''
+        A, B, C = self.__arrays(A, B, C)
+        self.__reset(len(A))
+        ok = self.__solveAnglesFromSides(A, B, C)
+        self.__finishSolve(A, ok)
+        return
+
+    def solve_coords(self, coord_A, coord_B, coord_C):
+        '''
+        solve triangles from their points; see Triangle.solve_coords
+
+        Parameters
+        ----------
+        coord_A : array_like
+            coordinates for point A; shape (n, 2)
+        coord_B : array_like
+            coordinates for point B; shape (n, 2)
+        coord_C : array_like
+            coordinates for point C; shape (n, 2)
+        '''
+        coords = np.stack(np.broadcast_arrays(*[np.asarray(c, dtype=float).reshape(-1, 2) for c in (coord_A, coord_B, coord_C)]), axis=1)
+        self.__reset(len(coords))
+        self.__coords = coords
+        ok = self.__solveAnglesFromSides(self.side_a, self.side_b, self.side_c)
+        ok &= np.isfinite(coords).all(axis=(1,2))
+        self.__finalize(ok)
+        return
+    #endregion
+
 if __name__ == '__main__':
     # CoordinateSequence
     l1 = LineString([(0,0), (9,9)])
@@ -0,0 +1,512 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import math, heapq
+from numbers import Number
+import numpy as np
+import shapely
+from shapely import STRtree, Point, Polygon
+from shapely.geometry.base import BaseGeometry
+
+# ---- Local addins
+from geometric_objects import Line_Segment, Triangle, TriangleBatch
+
+class SegmentSet():
+    '''
+    Collection of many line segments for bulk intersection checks
+
+    Segments are kept as one shapely geometry array indexed by an STRtree, so the questions that
+    Line_Segment.intersection/crosses answer one pair at a time are answered for the whole set in one query.
+    Results come back as NumPy index arrays (positions in the set) plus the intersection coordinates
+    '''
+    def __init__(self, segments:list[Line_Segment]|np.ndarray=None) -> None:
+        '''
+        Parameters
+        ----------
+        segments : list[Line_Segment] | array_like
+            Line_Segments or coordinates shaped (n, 2, 2) as [[(start_x, start_y), (end_x, end_y)], ...]
+        '''
+        if segments is None:
+            segments = np.empty((0, 2, 2))
+        elif len(segments) and isinstance(segments[0], Line_Segment):
+            segments = [s.coords for s in segments]
+        self.__coords:np.ndarray = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+        self.__geoms:np.ndarray  = shapely.linestrings(self.__coords)
+        self.__tree:STRtree      = None # built on first query
+        return
+    
+    def __len__(self) -> int:
+        return len(self.__geoms)
+    
+    def __getitem__(self, index:int) -> Line_Segment:
+        '''the segment at index as a Line_Segment'''
+        (x1, y1), (x2, y2) = self.__coords[index]
+        l = Line_Segment()
+        l.solve_points((x1, y1), (x2, y2))
+        return l.freeze()
+
+    #region properties
+    @property
+    def coords(self) -> np.ndarray:
+        '''segment coordinates; shape (n, 2, 2)'''
+        return self.__coords
+    
+    @property
+    def geometries(self) -> np.ndarray:
+        '''shapely LineString array of the segments'''
+        return self.__geoms
+    
+    @property
+    def tree(self) -> STRtree:
+        '''STRtree over the segments'''
+        if self.__tree is None:
+            self.__tree = STRtree(self.__geoms)
+        return self.__tree
+    #endregion
+
+    #region checks
+    def intersecting_pairs(self, predicate:str='intersects') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        every pair of segments in the set that meet
+
+        Parameters
+        ----------
+        predicate : str
+            'intersects' for any shared point (touching ends included) or 'crosses' for proper crossings only
+        
+        Returns
+        -------
+        pairs : np.ndarray
+            (k, 2) int array of segment indexes, first index always lower than the second
+        points : np.ndarray
+            (m, 2) float array of the intersection coordinates
+        point_pair : np.ndarray
+            (m,) int array; row of `pairs` each point belongs to (overlapping segments give more than one point)
+        '''
+        left, right = self.tree.query(self.__geoms, predicate=predicate)
+        keep  = left < right
+        pairs = np.column_stack([left[keep], right[keep]])
+        return (pairs,) + self.__intersectionPoints(self.__geoms[pairs[:,0]], self.__geoms[pairs[:,1]])
+    
+    def crossings(self, geometry:BaseGeometry|Line_Segment, predicate:str='intersects') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''
+        every segment in the set that meets the given geometry
+
+        Parameters
+        ----------
+        geometry : BaseGeometry | Line_Segment
+            shapely geometry (or Line_Segment) to check against
+        predicate : str
+            'intersects' for any shared point or 'crosses' for proper crossings only
+        
+        Returns
+        -------
+        indexes : np.ndarray
+            (k,) int array of the segments that meet the geometry
+        points : np.ndarray
+            (m, 2) float array of the intersection coordinates
+        point_index : np.ndarray
+            (m,) int array; row of `indexes` each point belongs to
+        '''
+        if isinstance(geometry, Line_Segment):
+            geometry = geometry.geometry
+        indexes = np.sort(self.tree.query(geometry, predicate=predicate))
+        return (indexes,) + self.__intersectionPoints(self.__geoms[indexes], geometry)
+    
+    @staticmethod
+    def __intersectionPoints(a:np.ndarray, b:np.ndarray|BaseGeometry) -> tuple[np.ndarray, np.ndarray]:
+        shared = shapely.intersection(a, b)
+        points, index = shapely.get_coordinates(shared, return_index=True)
+        return points, index
+    #endregion
+
+def sweep_intersections(segments:list[Line_Segment]|np.ndarray, tolerance:float=1e-9) -> list[tuple[tuple[float,float], tuple[int,...]]]:
+    '''
+    every intersection among the segments via a Bentley-Ottmann sweep line
+
+    The sweep moves left to right over the segment end points and found crossings, only checking segments that
+    are next to each other along the sweep line; so it takes O((n+k) log n) comparisons for n segments and k crossings
+    instead of checking every pair. The sweep line order is a plain list searched by bisection, not a balanced tree,
+    so each event also moves up to s list entries (s segments on the sweep line at once): O((n+k)(log n + s)) in all,
+    O((n+k) n) at worst. The moves are memmoves, which beat a blocked list (sortedcontainers style) in Python
+    at every size measured, up to 200k segments on the sweep line at once.
+    Vertical segments (where Line_Segment.slope returns a string) are handled by the sweep itself as are segments
+    sharing end points and several segments through one point.
+
+    Parameters
+    ----------
+    segments  : list[Line_Segment] | array_like
+        Line_Segments or coordinates shaped (n, 2, 2) as [[(start_x, start_y), (end_x, end_y)], ...]
+    tolerance : float
+        distance under which points are taken as the same point
+    
+    Returns
+    -------
+    list[tuple[tuple[float,float], tuple[int,...]]]
+        [((x, y), (index, index, ...)), ...] one entry per intersection point, with the indexes of every
+        segment passing through it; ordered left to right
+    '''
+    if len(segments) and isinstance(segments[0], Line_Segment):
+        segments = [s.coords for s in segments]
+    return _SweepLine(np.asarray(segments, dtype=float).reshape(-1, 2, 2).tolist(), tolerance).run()
+
+def intersection_pairs(found:list[tuple[tuple[float,float], tuple[int,...]]]) -> np.ndarray:
+    '''expand the sweep_intersections result into (k, 2) segment index pairs'''
+    pairs = set()
+    for _, ids in found:
+        for i in range(len(ids)):
+            for j in range(i+1, len(ids)):
+                pairs.add((ids[i], ids[j]))
+    return np.array(sorted(pairs), dtype=int).reshape(-1, 2)
+
+class _SweepLine():
+    '''state of one sweep_intersections run'''
+    def __init__(self, coords:list, tolerance:float) -> None:
+        self.__tol    = tolerance
+        self.__digits = max(0, -int(math.floor(math.log10(tolerance))))
+
+        # segments as (x1, y1, x2, y2, slope) with the start point left of (or below) the end point
+        self.__segs:list[tuple] = []
+        self.__queue:list[tuple[float,float]] = [] # heap of event points
+        self.__points:dict[tuple, tuple[float,float]] = {} # snapped key -> queued event point
+        self.__upper:dict[tuple, list[int]] = {} # snapped key -> segments starting at the point
+        for i, ((x1, y1), (x2, y2)) in enumerate(coords):
+            if (x2, y2) < (x1, y1):
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            m = (y2-y1)/(x2-x1) if x2 != x1 else math.inf
+            self.__segs.append((x1, y1, x2, y2, m))
+            self.__upper.setdefault(self.__push((x1, y1)), []).append(i)
+            self.__push((x2, y2))
+        
+        # segment ids ordered bottom to top along the sweep line
+        self.__status:list[int] = []
+        return
+    
+    def __key(self, point:tuple[float,float]) -> tuple:
+        return (round(point[0], self.__digits), round(point[1], self.__digits))
+    
+    def __push(self, point:tuple[float,float]) -> tuple:
+        '''queue an event point unless (about) the same point is queued already; returns its snapped key'''
+        k = self.__key(point)
+        if k not in self.__points:
+            self.__points[k] = point
+            heapq.heappush(self.__queue, point)
+        return k
+    
+    def __y_at(self, i:int, x:float, y:float) -> float:
+        '''height of segment i where the sweep line is at event point (x, y)'''
+        x1, y1, x2, y2, m = self.__segs[i]
+        if m == math.inf:
+            return min(max(y, y1), y2)
+        return y1+(x-x1)*m
+    
+    def __bisect(self, x:float, y:float, bound:float, right:bool) -> int:
+        status = self.__status
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo+hi)//2
+            v = self.__y_at(status[mid], x, y)
+            if v < bound or (right and v == bound):
+                lo = mid+1
+            else:
+                hi = mid
+        return lo
+    
+    def __check(self, a:int, b:int, point:tuple[float,float]):
+        '''queue the crossing of segments a and b when it is past the current event point'''
+        x1, y1, x2, y2, _ = self.__segs[a]
+        x3, y3, x4, y4, _ = self.__segs[b]
+        dx1, dy1 = x2-x1, y2-y1
+        dx2, dy2 = x4-x3, y4-y3
+        d = dx1*dy2-dy1*dx2
+        if d == 0: return # parallel; overlaps show up through the end point events
+        t = ((x3-x1)*dy2-(y3-y1)*dx2)/d
+        u = ((x3-x1)*dy1-(y3-y1)*dx1)/d
+        tol = self.__tol
+        if not (-tol <= t <= 1+tol and -tol <= u <= 1+tol): return
+        q = (x1+t*dx1, y1+t*dy1)
+        if self.__key(q) > self.__key(point):
+            self.__push(q)
+        return
+    
+    def run(self) -> list[tuple[tuple[float,float], tuple[int,...]]]:
+        found  = []
+        status = self.__status
+        segs   = self.__segs
+        tol    = self.__tol
+        while self.__queue:
+            p = heapq.heappop(self.__queue)
+            k = self.__key(p)
+            if self.__points.get(k) is not p: continue # same point queued twice before the snap
+            del self.__points[k]
+            x, y = p
+
+            # segments starting here (U), and those on the sweep line through here; ending (L) or passing (C)
+            U  = self.__upper.pop(k, [])
+            lo = self.__bisect(x, y, y-tol, False)
+            hi = self.__bisect(x, y, y+tol, True)
+            L, C = [], []
+            for i in status[lo:hi]:
+                x2, y2 = segs[i][2:4]
+                (L if abs(x2-x) <= tol and abs(y2-y) <= tol else C).append(i)
+            
+            if len(U)+len(L)+len(C) > 1:
+                found.append((p, tuple(sorted(set(U+L+C)))))
+            
+            # swap in the order just right of the point; lowest slope first, verticals on top
+            del status[lo:hi]
+            UC = sorted([i for i in U if segs[i][:2] != segs[i][2:4]]+C, key=lambda i: segs[i][4])
+            status[lo:lo] = UC
+            if not UC:
+                if 0 < lo < len(status):
+                    self.__check(status[lo-1], status[lo], p)
+            else:
+                if lo > 0:
+                    self.__check(status[lo-1], UC[0], p)
+                top = lo+len(UC)
+                if top < len(status):
+                    self.__check(UC[-1], status[top], p)
+        return found
+
+class TriangleSet():
+    '''
+    Collection of many solved triangles for point and overlap queries
+
+    Triangles are kept as one shapely Polygon array indexed by an STRtree over their bounds.
+    Query results are NumPy arrays of positions in the list (or rows of the TriangleBatch) the set was built from;
+    unsolved TriangleBatch rows are left out of the set
+    '''
+    def __init__(self, triangles:list[Triangle]|TriangleBatch) -> None:
+        if isinstance(triangles, TriangleBatch):
+            self.__index:np.ndarray  = np.flatnonzero(triangles.valid)
+            self.__coords:np.ndarray = triangles.triangle_coords[self.__index]
+        else:
+            self.__index  = np.arange(len(triangles))
+            self.__coords = np.array([t.triangle_coords for t in triangles], dtype=float).reshape(-1, 3, 2)
+        self.__geoms:np.ndarray = shapely.polygons(self.__coords)
+        self.__tree:STRtree     = STRtree(self.__geoms)
+
+        # typical triangle size; first search radius for nearest()
+        self.__size:float = float(np.median(np.ptp(self.__coords, axis=1).max(axis=1))) if len(self) else 0.0
+        return
+    
+    def __len__(self) -> int:
+        return len(self.__geoms)
+
+    #region properties
+    @property
+    def coords(self) -> np.ndarray:
+        '''triangle coordinates; shape (n, 3, 2) as [A, B, C] per triangle'''
+        return self.__coords
+    
+    @property
+    def index(self) -> np.ndarray:
+        '''position in the source list/batch of each triangle in the set'''
+        return self.__index
+    
+    @property
+    def geometries(self) -> np.ndarray:
+        '''shapely Polygon array of the triangles'''
+        return self.__geoms
+    
+    @property
+    def tree(self) -> STRtree:
+        '''STRtree over the triangles'''
+        return self.__tree
+    #endregion
+
+    #region checks
+    def containing(self, point:tuple[Number,Number]|Point) -> np.ndarray:
+        '''triangles that contain the point (edges included)'''
+        if not isinstance(point, Point):
+            point = Point(point)
+        hits = self.__tree.query(point, predicate='intersects')
+        return np.sort(self.__index[hits])
+    
+    def overlapping(self, triangle:Triangle|BaseGeometry, predicate:str='intersects') -> np.ndarray:
+        '''
+        triangles that overlap the given triangle
+
+        Parameters
+        ----------
+        triangle  : Triangle | BaseGeometry
+            solved Triangle or any shapely geometry
+        predicate : str
+            shapely predicate to check with; 'intersects' counts touching edges, 'overlaps' only shared area
+        '''
+        if isinstance(triangle, Triangle):
+            triangle = Polygon(triangle.triangle_coords)
+        hits = self.__tree.query(triangle, predicate=predicate)
+        return np.sort(self.__index[hits])
+    
+    def nearest(self, point:tuple[Number,Number]|Point, k:int=1) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        the k triangles closest to the point
+
+        Returns
+        -------
+        indexes : np.ndarray
+            (k,) int array, closest first
+        distances : np.ndarray
+            (k,) distance of each; 0 when the point is inside
+        '''
+        if not isinstance(point, Point):
+            point = Point(point)
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=int), np.empty(0)
+        
+        # grow a search box from the closest triangle until it holds k triangles that are within its radius;
+        # anything outside the box is further away than that radius
+        _, dist = self.__tree.query_nearest(point, return_distance=True, all_matches=False)
+        r = max(float(dist[0]), self.__size, 1e-9)
+        x, y = point.x, point.y
+        while True:
+            cand = self.__tree.query(shapely.box(x-r, y-r, x+r, y+r))
+            d    = shapely.distance(self.__geoms[cand], point)
+            if np.count_nonzero(d <= r) >= k or len(cand) == len(self):
+                break
+            r *= 2
+        order = np.argsort(d, kind='stable')[:k]
+        return self.__index[cand[order]], d[order]
+    #endregion
+
+def points_in_triangles(points:np.ndarray, triangles:list[Triangle]|TriangleBatch|np.ndarray, chunk_size:int=4096,
+                        block_size:int=1<<20, prefilter:int=1024) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    which triangles contain each point; barycentric coordinates worked out in NumPy blocks
+
+    Points are handled chunk_size at a time and each chunk is checked against at most block_size
+    point/triangle pairs at once, so memory stays flat however many points and triangles there are.
+    With more than `prefilter` triangles the triangle bounds are first put on a grid and each point is
+    only checked against the triangles whose bounds cover its grid cell.
+
+    Parameters
+    ----------
+    points     : array_like
+        (n, 2) point coordinates
+    triangles  : list[Triangle] | TriangleBatch | array_like
+        solved Triangles, a TriangleBatch or (m, 3, 2) vertex coordinates like Triangle.triangle_coords
+    chunk_size : int
+        points per chunk
+    block_size : int
+        largest number of point/triangle pairs worked at once
+    prefilter  : int
+        triangle count above which the bounds grid is used
+
+    Returns
+    -------
+    point_index    : np.ndarray
+        (k,) int array of points that fall in (or on the edge of) a triangle, in order
+    triangle_index : np.ndarray
+        (k,) int array of the containing triangle for each entry of point_index
+    '''
+    if isinstance(triangles, TriangleBatch):
+        tri = triangles.triangle_coords
+    elif len(triangles) and isinstance(triangles[0], Triangle):
+        tri = np.array([t.triangle_coords for t in triangles], dtype=float)
+    else:
+        tri = np.asarray(triangles, dtype=float)
+    tri = tri.reshape(-1, 3, 2)
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    if not len(pts) or not len(tri):
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    # per triangle constants of the barycentric weights; the weights are linear in the point so only
+    # the per-point products are left for the blocks
+    ax, ay = tri[:,0,0], tri[:,0,1]
+    bx, by = tri[:,1,0], tri[:,1,1]
+    cx, cy = tri[:,2,0], tri[:,2,1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1/((by-cy)*(ax-cx)+(cx-bx)*(ay-cy)) # inf for flat triangles; they never match
+    coef = np.column_stack([(by-cy)*inv, (cx-bx)*inv, (cy-ay)*inv, (ax-cx)*inv, cx, cy])
+
+    found_p, found_t = [], []
+    if len(tri) > prefilter:
+        pairs = _grid_pairs(pts, tri, chunk_size, block_size)
+    else:
+        pairs = _dense_pairs(len(pts), len(tri), chunk_size, block_size)
+    for p, t in pairs:
+        inside = _inside(pts[p], coef[t])
+        found_p.append(p[inside])
+        found_t.append(t[inside])
+    
+    pi = np.concatenate(found_p)
+    ti = np.concatenate(found_t)
+    s  = np.lexsort((ti, pi))
+    return pi[s], ti[s]
+
+def _inside(p:np.ndarray, k:np.ndarray) -> np.ndarray:
+    '''barycentric check of point/triangle pairs (broadcast); k rows from the points_in_triangles constants'''
+    eps = 1e-12
+    dx = p[...,0]-k[...,4]
+    dy = p[...,1]-k[...,5]
+    w1 = k[...,0]*dx+k[...,1]*dy
+    w2 = k[...,2]*dx+k[...,3]*dy
+    return (w1 >= -eps) & (w2 >= -eps) & (w1+w2 <= 1+eps)
+
+def _dense_pairs(n:int, m:int, chunk_size:int, block_size:int):
+    '''every point against every triangle, block by block'''
+    step = max(1, block_size//min(chunk_size, n))
+    for p0 in range(0, n, chunk_size):
+        p = np.arange(p0, min(p0+chunk_size, n))
+        for t0 in range(0, m, step):
+            t = np.arange(t0, min(t0+step, m))
+            yield np.repeat(p, len(t)), np.tile(t, len(p))
+
+def _grid_pairs(pts:np.ndarray, tri:np.ndarray, chunk_size:int, block_size:int):
+    '''only the point/triangle pairs sharing a grid cell, at most block_size pairs at a time'''
+    lo = tri.min(axis=1)
+    hi = tri.max(axis=1)
+    g0 = lo.min(axis=0)
+    g1 = hi.max(axis=0)
+    w, h = np.maximum(g1-g0, 1e-12)
+
+    # about one triangle size per cell, capped so the cell table stays small
+    size = max(float(np.median((hi-lo).max(axis=1))), math.sqrt(w*h/len(tri)), 1e-12)
+    nx = int(min(max(w/size, 1), 2048))
+    ny = int(min(max(h/size, 1), 2048))
+
+    def cell(xy:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        ix = np.clip(((xy[...,0]-g0[0])/w*nx).astype(np.int64), 0, nx-1)
+        iy = np.clip(((xy[...,1]-g0[1])/h*ny).astype(np.int64), 0, ny-1)
+        return ix, iy
+    
+    # every cell each triangle's bounds cover, grouped by cell
+    x0, y0 = cell(lo)
+    x1, y1 = cell(hi)
+    span   = x1-x0+1
+    counts = span*(y1-y0+1)
+    t_rep  = np.repeat(np.arange(len(tri)), counts)
+    off    = np.arange(counts.sum())-np.repeat(np.cumsum(counts)-counts, counts)
+    cells  = (np.repeat(y0, counts)+off//np.repeat(span, counts))*nx+np.repeat(x0, counts)+off%np.repeat(span, counts)
+    order  = np.argsort(cells, kind='stable')
+    cell_t = t_rep[order]
+    starts = np.searchsorted(cells[order], np.arange(nx*ny+1))
+
+    # points outside every triangle bound cant match
+    keep = np.flatnonzero((pts[:,0] >= g0[0]) & (pts[:,0] <= g1[0]) & (pts[:,1] >= g0[1]) & (pts[:,1] <= g1[1]))
+    px, py = cell(pts[keep])
+    pc = py*nx+px
+    keep, pc = keep[np.argsort(pc, kind='stable')], np.sort(pc)
+    first  = starts[pc]
+    counts = starts[pc+1]-first
+
+    # split the points so each piece expands to no more than block_size pairs (and chunk_size points)
+    total = np.cumsum(counts)
+    i = 0
+    while i < len(keep):
+        base = total[i-1] if i else 0
+        j = int(np.searchsorted(total, base+block_size, side='right'))
+        j = min(max(j, i+1), i+chunk_size, len(keep))
+        c = counts[i:j]
+        off = np.arange(c.sum())-np.repeat(np.cumsum(c)-c, c)
+        yield np.repeat(keep[i:j], c), cell_t[np.repeat(first[i:j], c)+off]
+        i = j
+
+if __name__ == '__main__':
+    ss = SegmentSet([[(0,0), (9,9)], [(0,9), (9,0)], [(20,20), (21,21)]])
+    print(ss.intersecting_pairs())
+    print(ss.crossings(shapely.LineString([(0,4), (9,4)])))
+    print(sweep_intersections([[(0,0), (9,9)], [(0,9), (9,0)], [(4,-1), (4,10)], [(20,20), (21,21)]]))
@@ -0,0 +1,249 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import os, sys, time, queue, atexit, sqlite3, threading, typing
+
+# Calculation history kept in SQLite
+#
+# rows are only ever appended. add() hands the row to a writer thread that inserts them in batches and commits
+# every `batch_size` rows or `flush_interval` seconds, so pressing "=" never waits on the disk. the database is in
+# WAL mode so the GUI thread can page and search on its own connection while the writer commits.
+# the formula (normalized, e.g. 'asin(0.5)') is indexed with an FTS5 table for word and prefix search;
+# without FTS5 the search falls back to LIKE over the rows
+#
+#   store = HistoryStore('history.sqlite3')
+#   store.add('Sin^-1(0.5)', '0.5235987755982989', 'asin(0.5)')
+#   store.search('asin')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS history (
+    id      INTEGER PRIMARY KEY,
+    time    REAL NOT NULL,
+    text    TEXT NOT NULL,
+    result  TEXT NOT NULL,
+    formula TEXT NOT NULL
+);
+'''
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(formula, content='history', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS history_fts_add AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts(rowid, formula) VALUES (new.id, new.formula);
+END;
+'''
+
+class HistoryRow(typing.NamedTuple):
+    id:int
+    time:float
+    text:str
+    result:str
+    formula:str
+
+class HistoryStore():
+    '''
+    append-only calculation history in a SQLite file with write-behind commits
+
+    Ids are handed out by add() straight away (newest is largest) so a row can be referenced before it is written.
+    When another HistoryStore (a second app) writes to the same file, a batch whose ids were taken is saved
+    under the next free ids instead
+    '''
+    def __init__(self, path:str, batch_size:int=64, flush_interval:float=1.0) -> None:
+        '''
+        Parameters
+        ----------
+        path : str
+            database file; created if missing
+        batch_size : int
+            rows per commit
+        flush_interval : float
+            most seconds a row waits before being committed
+        '''
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.__reader = self.__connect()
+        self.__reader.executescript(SCHEMA)
+        try:
+            self.__reader.executescript(FTS_SCHEMA)
+            self.__fts = True
+        except sqlite3.OperationalError: # sqlite built without FTS5
+            self.__fts = False
+        self.__reader.commit()
+        self.__lastId:int = self.__reader.execute('SELECT COALESCE(MAX(id), 0) FROM history').fetchone()[0]
+        self.__idLock = threading.Lock()
+
+        self.__queue:queue.Queue = queue.Queue()
+        self.__writer = threading.Thread(target=self.__writeBehind, name='HistoryStore writer', daemon=True)
+        self.__writer.start()
+        self.__closed = False
+        atexit.register(self.close)
+        return
+
+    def __connect(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self.path, check_same_thread=False)
+        con.execute('PRAGMA journal_mode=WAL')
+        con.execute('PRAGMA synchronous=NORMAL')
+        return con
+
+    @property
+    def full_text(self) -> bool:
+        '''True when search uses the FTS5 index'''
+        return self.__fts
+
+    @property
+    def last_id(self) -> int:
+        '''id of the newest row added (written or not)'''
+        return self.__lastId
+
+    def add(self, text:str, result:str, formula:str) -> int:
+        '''
+        queue a calculation to be written; returns its id
+
+        Parameters
+        ----------
+        text    : formula as displayed
+        result  : result as displayed
+        formula : normalized formula; this is what search looks at
+        '''
+        if self.__closed:
+            raise ValueError("HistoryStore is closed")
+        with self.__idLock:
+            self.__lastId += 1
+            row_id = self.__lastId
+        self.__queue.put((row_id, time.time(), text, result, formula))
+        return row_id
+
+    def flush(self):
+        '''block until every queued row is committed'''
+        done = threading.Event()
+        self.__queue.put(done)
+        done.wait()
+        return
+
+    def close(self):
+        '''commit what is queued and stop the writer'''
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__queue.put(None)
+        self.__writer.join()
+        self.__reader.close()
+        atexit.unregister(self.close)
+        return
+
+    def __writeBehind(self):
+        '''writer thread: insert queued rows and commit in batches'''
+        con = self.__connect()
+        rows, events = [], []
+        deadline = None
+        stop = False
+        while not stop:
+            timeout = None if deadline is None else max(deadline-time.monotonic(), 0)
+            try:
+                item = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                stop = True
+            elif isinstance(item, threading.Event):
+                events.append(item)
+            elif item:
+                rows.append(item)
+                if deadline is None:
+                    deadline = time.monotonic()+self.flush_interval
+            if rows and (stop or events or len(rows) >= self.batch_size or time.monotonic() >= deadline):
+                try:
+                    self.__write(con, rows)
+                except sqlite3.Error as e:
+                    con.rollback()
+                    print(f"HistoryStore: could not save {len(rows)} rows to '{self.path}': {e}", file=sys.stderr)
+                rows.clear()
+                deadline = None
+            for e in events:
+                e.set()
+            events.clear()
+        con.close()
+        return
+
+    def __write(self, con:sqlite3.Connection, rows:list[tuple]):
+        '''insert a batch in one transaction'''
+        con.execute('BEGIN IMMEDIATE') # hold the write lock from reading the largest id until the commit
+        top = con.execute('SELECT COALESCE(MAX(id), 0) FROM history').fetchone()[0]
+        if top >= rows[0][0]:
+            # another HistoryStore on the file took these ids; move the batch (and later ids) past its rows
+            shift = top+1-rows[0][0]
+            rows[:] = [(r[0]+shift,)+r[1:] for r in rows]
+            with self.__idLock:
+                self.__lastId = max(self.__lastId, rows[-1][0])
+        con.executemany('INSERT INTO history (id, time, text, result, formula) VALUES (?, ?, ?, ?, ?)', rows)
+        con.commit()
+        return
+
+    def __len__(self) -> int:
+        '''committed rows'''
+        return self.__reader.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+
+    def page(self, before:int=None, limit:int=200) -> list[HistoryRow]:
+        '''
+        committed rows newest first
+
+        Parameters
+        ----------
+        before : int
+            only rows with a smaller id (the id of the last row of the previous page); None starts at the newest
+        limit : int
+            most rows returned
+        '''
+        if before is None:
+            cur = self.__reader.execute('SELECT * FROM history ORDER BY id DESC LIMIT ?', (limit,))
+        else:
+            cur = self.__reader.execute('SELECT * FROM history WHERE id < ? ORDER BY id DESC LIMIT ?', (before, limit))
+        return [HistoryRow(*r) for r in cur]
+
+    def search(self, term:str, limit:int=1000) -> list[HistoryRow]:
+        '''
+        committed rows whose formula contains `term`, newest first
+
+        With FTS5 each word of term matches a whole name or number in the formula, or the start of one when
+        it ends with '*' ('asin' finds asin(0.5), 'as*' finds asin and asinh)
+        '''
+        term = term.strip()
+        if not term:
+            return []
+        if self.__fts:
+            words = [w for w in term.replace('(', ' ').replace(')', ' ').split() if w.strip('*')]
+            if not words: # only brackets or '*'; nothing to match
+                return []
+            query = ' '.join('"{}"{}'.format(w.rstrip('*').replace('"', '""'), '*' if w.endswith('*') else '') for w in words)
+            # newest first straight off the index (FTS5 walks rowids backwards) so only `limit` matches are read
+            cur = self.__reader.execute(
+                'SELECT * FROM history WHERE id IN '
+                '(SELECT rowid FROM history_fts WHERE history_fts MATCH ? ORDER BY rowid DESC LIMIT ?) '
+                'ORDER BY id DESC', (query, limit))
+        else:
+            pattern = '%{}%'.format(term.rstrip('*').replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_'))
+            cur = self.__reader.execute("SELECT * FROM history WHERE formula LIKE ? ESCAPE '\\' ORDER BY id DESC LIMIT ?", (pattern, limit))
+        return [HistoryRow(*r) for r in cur]
+
+if __name__ == '__main__':
+    import random, tempfile
+    path = os.path.join(tempfile.mkdtemp(), 'history.sqlite3')
+    store = HistoryStore(path, batch_size=10_000)
+    funcs = ['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'sqrt', 'log']
+    t = time.perf_counter()
+    for i in range(1_000_000):
+        f = f'{random.choice(funcs)}({random.random():.3f})+{i}'
+        store.add(f, '1', f)
+    t_add = time.perf_counter()-t
+    store.flush()
+    print(f'1,000,000 rows: add {t_add:.1f}s, written by {time.perf_counter()-t:.1f}s, {os.path.getsize(path)/2**20:.0f} MB')
+    for term in ('asin', 'as*', 'sqrt'):
+        t = time.perf_counter()
+        found = store.search(term, limit=1000)
+        print(f'search {term!r}: {len(found)} rows (limit 1000) in {(time.perf_counter()-t)*1000:.1f} ms')
+    t = time.perf_counter()
+    rows = store.page(limit=200)
+    rows = store.page(rows[-1].id, limit=200)
+    print(f'two pages: {(time.perf_counter()-t)*1000:.1f} ms')
+    store.close()
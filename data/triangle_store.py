@@ -0,0 +1,190 @@
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+from __future__ import annotations
+import os, json, struct
+import numpy as np
+
+# ---- Local addins
+from geometric_objects import TriangleBatch
+
+# Compact binary file for solved triangles
+#
+#   [ 8 byte magic | uint32 version | uint32 header length | JSON header ... ] padded to HEADER_SIZE
+#   [ column 1 ][ column 2 ] ...                                             each starts on a 64 byte boundary
+#
+# every column is one contiguous little-endian array (all side_a values, then all side_b values, ...)
+# so a column or a slice of rows can be memory mapped without reading the rest of the file
+MAGIC       = b'TRIDATA\0'
+VERSION     = 1
+HEADER_SIZE = 4096
+ALIGN       = 64
+
+# name: (dtype, per-row shape)
+COLUMNS:dict[str, tuple[str, tuple[int,...]]] = {
+    'side_a':    ('<f8', ()),
+    'side_b':    ('<f8', ()),
+    'side_c':    ('<f8', ()),
+    'angle_a':   ('<f8', ()),
+    'angle_b':   ('<f8', ()),
+    'angle_c':   ('<f8', ()),
+    'coords':    ('<f8', (3, 2)), # [A, B, C] points
+    'medians':   ('<f8', (3,)),   # lmA, lmB, lmC lengths
+    'area':      ('<f8', ()),
+    'perimeter': ('<f8', ()),
+    'inradius':  ('<f8', ()),
+    'status':    ('u1',  ()),     # TriangleBatch.STATUS_*
+}
+
+def batch_columns(batch:TriangleBatch) -> dict[str, np.ndarray]:
+    '''the COLUMNS arrays of a solved batch'''
+    return {'side_a':batch.side_a, 'side_b':batch.side_b, 'side_c':batch.side_c,
+            'angle_a':batch.Aϴ, 'angle_b':batch.Bϴ, 'angle_c':batch.Cϴ,
+            'coords':batch.triangle_coords, 'medians':batch.medians,
+            'area':batch.area, 'perimeter':batch.perimeter, 'inradius':batch.inradius,
+            'status':batch.status}
+
+def _layout(capacity:int) -> tuple[dict[str, dict], int]:
+    '''byte offset of every column for a file holding up to capacity rows, and the file size'''
+    rtn, offset = {}, HEADER_SIZE
+    for name, (dtype, shape) in COLUMNS.items():
+        rtn[name] = {'dtype':dtype, 'shape':list(shape), 'offset':offset}
+        size   = capacity*np.dtype(dtype).itemsize*int(np.prod(shape, dtype=int))
+        offset = -(-(offset+size)//ALIGN)*ALIGN
+    return rtn, offset
+
+def _write_header(file, header:dict):
+    raw = json.dumps(header).encode('utf-8')
+    if len(raw)+16 > HEADER_SIZE:
+        raise ValueError("triangle store header does not fit")
+    file.seek(0)
+    file.write(MAGIC+struct.pack('<II', header['version'], len(raw))+raw)
+    return
+
+def read_header(path:str) -> dict:
+    '''the JSON header of a triangle store file'''
+    with open(path, 'rb') as file:
+        head = file.read(16)
+        if len(head) < 16 or head[:8] != MAGIC:
+            raise ValueError(f"'{path}' is not a triangle store file")
+        version, size = struct.unpack('<II', head[8:])
+        if version > VERSION:
+            raise ValueError(f"'{path}' is triangle store version {version}; this reader supports up to {VERSION}")
+        return json.loads(file.read(size))
+
+class TriangleStoreWriter():
+    '''
+    Writes solved TriangleBatch chunks into a triangle store file
+
+    The file is sized for `capacity` rows up front and the chunks are copied straight into
+    memory mapped columns; close() records how many rows were actually written
+
+    Example
+    -------
+        with TriangleStoreWriter('out.tri', capacity=len(A)) as out:
+            for ...:
+                out.append(batch)
+    '''
+    def __init__(self, path:str, capacity:int) -> None:
+        self.__path     = path
+        self.__capacity = capacity
+        self.__count    = 0
+        columns, size   = _layout(capacity)
+        self.__header   = {'version':VERSION, 'count':0, 'capacity':capacity, 'columns':columns}
+        with open(path, 'wb') as file:
+            _write_header(file, self.__header)
+            file.truncate(size)
+        self.__columns = {name:np.memmap(path, dtype=c['dtype'], mode='r+', offset=c['offset'], shape=(capacity, *c['shape']))
+                          for name, c in self.__header['columns'].items()}
+        return
+    
+    def __enter__(self) -> TriangleStoreWriter:
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+        return
+    
+    def __len__(self) -> int:
+        return self.__count
+    
+    def append(self, batch:TriangleBatch|dict[str, np.ndarray]):
+        '''copy a solved batch (or a dict of COLUMNS arrays) in after the rows already written'''
+        data = batch_columns(batch) if isinstance(batch, TriangleBatch) else batch
+        n    = len(data['status'])
+        if self.__count+n > self.__capacity:
+            raise ValueError(f"triangle store is sized for {self.__capacity} rows; cannot add {n} more")
+        for name, col in self.__columns.items():
+            col[self.__count:self.__count+n] = data[name]
+        self.__count += n
+        return
+    
+    def close(self):
+        if self.__columns is None: return
+        for col in self.__columns.values():
+            col.flush()
+        self.__columns = None
+        self.__header['count'] = self.__count
+        with open(self.__path, 'r+b') as file:
+            _write_header(file, self.__header)
+        return
+
+class TriangleStore():
+    '''
+    Read-only, memory mapped view of a triangle store file
+
+    Opening only reads the header; each column is an np.memmap so slicing reads just the rows asked for
+    '''
+    def __init__(self, path:str) -> None:
+        self.__path   = path
+        self.__header = read_header(path)
+        n = self.__header['count']
+        self.__columns:dict[str, np.memmap] = {}
+        for name, c in self.__header['columns'].items():
+            if n:
+                self.__columns[name] = np.memmap(path, dtype=c['dtype'], mode='r', offset=c['offset'], shape=(n, *c['shape']))
+            else:
+                self.__columns[name] = np.empty((0, *c['shape']), dtype=c['dtype'])
+        return
+    
+    def __len__(self) -> int:
+        return self.__header['count']
+    
+    def __getitem__(self, key:str|int|slice|np.ndarray) -> np.ndarray|dict[str, np.ndarray]:
+        '''a column by name, or the given rows of every column as a dict'''
+        if isinstance(key, str):
+            return self.__columns[key]
+        return {name:col[key] for name, col in self.__columns.items()}
+    
+    @property
+    def version(self) -> int:
+        return self.__header['version']
+    
+    @property
+    def columns(self) -> list[str]:
+        return list(self.__columns.keys())
+    
+    @property
+    def valid(self) -> np.ndarray:
+        '''boolean mask of the rows that solved'''
+        return self.__columns['status'] == TriangleBatch.STATUS_OK
+
+def save_triangles(path:str, batch:TriangleBatch):
+    '''write a solved TriangleBatch to a triangle store file'''
+    with TriangleStoreWriter(path, len(batch)) as out:
+        out.append(batch)
+    return
+
+def load_triangles(path:str) -> TriangleStore:
+    '''open a triangle store file; nothing past the header is read until the columns are used'''
+    return TriangleStore(path)
+
+if __name__ == '__main__':
+    import tempfile
+    tb = TriangleBatch()
+    tb.solve_SSS([4, 6, 1], [3, 5, 1], [5, 7, 3])
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp: # the file is still mapped on Windows
+        path = os.path.join(tmp, 'triangles.tri')
+        save_triangles(path, tb)
+        ts = load_triangles(path)
+        print(len(ts), ts.columns, ts['area'], ts[0])
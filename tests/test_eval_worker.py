@@ -0,0 +1,97 @@
+'''
+Tests of the calculator worker processes: results, timeouts, cancels and the memory limit
+
+    python -m pytest tests
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, time, threading
+import pytest
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+from eval_worker import EvaluationPool
+
+WAIT = 30 # seconds to wait for a result; workers are spawned fresh python processes
+
+class _Results():
+    '''callback collecting (ok, value) by job'''
+    def __init__(self) -> None:
+        self.__results:dict[int, tuple[bool, object]] = {}
+        self.__changed = threading.Condition()
+        return
+
+    def __call__(self, job:int, ok:bool, value):
+        with self.__changed:
+            self.__results[job] = (ok, value)
+            self.__changed.notify_all()
+        return
+
+    def get(self, job:int) -> tuple[bool, object]:
+        with self.__changed:
+            assert self.__changed.wait_for(lambda: job in self.__results, WAIT), f'no result for job {job}'
+            return self.__results[job]
+
+@pytest.fixture
+def results():
+    return _Results()
+
+@pytest.fixture
+def pool(results):
+    pool = EvaluationPool(workers=1, timeout=1.0, callback=results)
+    yield pool
+    pool.close()
+
+def test_results(pool, results):
+    sqrt, square, zero = pool.submit('math.sqrt(2)'), pool.submit('x**2', x=3), pool.submit('1/0')
+    assert results.get(sqrt) == (True, 2**.5)
+    assert results.get(square) == (True, 9)
+    ok, msg = results.get(zero)
+    assert not ok and 'ZeroDivisionError' in msg
+
+def test_huge_int_results(pool, results):
+    assert results.get(pool.submit('2**4000')) == (True, 2**4000)
+    # past 4096 bits a result comes back as a float, or as an error when it doesn't fit one
+    assert results.get(pool.submit('2**4100')) == (False, 'result is too large')
+
+def test_timeout_then_recovery(pool, results):
+    slow = pool.submit('9**9**9')
+    ok, msg = results.get(slow)
+    assert not ok and 'took longer' in msg
+    # a fresh worker took the killed one's place
+    assert results.get(pool.submit('1+1')) == (True, 2)
+
+def test_cancel_running_and_queued(pool, results):
+    slow = pool.submit('9**9**9')
+    queued = pool.submit('2+2') # waits behind the slow job on the only worker
+    pool.cancel(queued)
+    pool.cancel(slow)
+    assert results.get(queued) == (False, 'cancelled')
+    assert results.get(slow) == (False, 'cancelled')
+    assert results.get(pool.submit('3+3')) == (True, 6)
+
+def test_memory_limit_then_recovery(results):
+    pytest.importorskip('resource') # POSIX only
+    # a small limit so the allocation fails before the squarings get slow
+    pool = EvaluationPool(workers=1, timeout=WAIT, memory_limit=16<<20, callback=results)
+    try:
+        ok, msg = results.get(pool.submit('2**(2**31)')) # a 256 MB int
+        assert not ok and 'memory' in msg
+        assert results.get(pool.submit('4+4')) == (True, 8)
+    finally:
+        pool.close()
+
+def test_close_cancels_every_job(results):
+    pool = EvaluationPool(workers=1, callback=results)
+    assert results.get(pool.submit('1+1')) == (True, 2) # worker is up
+    running, queued = pool.submit('9**9**9'), pool.submit('1+1')
+    time.sleep(.2)
+    pool.close()
+    assert results.get(running) == (False, 'cancelled')
+    assert results.get(queued) == (False, 'cancelled')
+    with pytest.raises(ValueError):
+        pool.submit('1')
+    pool.close() # twice is fine
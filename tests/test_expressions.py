@@ -0,0 +1,195 @@
+'''
+Tests of the calculator expression engine
+
+    python -m pytest tests
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys, math
+import pytest
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+import expressions
+from expressions import ExpressionCache, ExpressionError, Num
+
+#region parsing
+@pytest.mark.parametrize('text', ['', '2+', '(1+2', '1+2)', 'sin(', 'sin()', '2**', '*3', '1,2', '3 $ 4'])
+def test_parse_errors(text:str):
+    with pytest.raises(ExpressionError):
+        expressions.compile_expression(text)
+
+@pytest.mark.parametrize('text, value', [
+    ('1+2*3', 7), ('2^3^2', 512), ('-2**2', -4), ('(-2)**2', 4), ('7//2', 3), ('7%4', 3),
+    ('math.sqrt(3**2+4**2)', 5.0), ('sqrt(16)', 4.0), ('2*pi', 2*math.pi), ('math.e', math.e), ('log(8, 2)', 3.0),
+])
+def test_values(text:str, value):
+    assert expressions.evaluate(text) == pytest.approx(value)
+
+def test_variables():
+    expr = expressions.compile_expression('x**2 + y')
+    assert expr.variables == ('x', 'y')
+    assert expr.evaluate(x=3, y=1) == 10
+    with pytest.raises(ExpressionError):
+        expr.evaluate(x=3)
+
+def test_math_errors_are_expression_errors():
+    for text in ('1/0', 'sqrt(-1)', 'log(0)', 'x/0', 'sqrt(1, 2)'):
+        with pytest.raises(ExpressionError):
+            expressions.evaluate(text, x=1)
+#endregion
+
+#region whitelisting
+@pytest.mark.parametrize('text', [
+    '__import__("os")', 'os.system("ls")', 'math.os', 'math.__dict__', 'math.sys.exit()',
+    'x.y', 'sin.__class__', '(1).real', 'open("f")', 'eval("1")', 'getattr(x, "y")', 'x[0]', 'lambda: 1',
+])
+def test_not_whitelisted(text:str):
+    with pytest.raises(ExpressionError):
+        expressions.evaluate(text, x=1)
+
+def test_no_builtins_in_compiled_code():
+    # an unknown name is a variable, never a builtin
+    expr = expressions.compile_expression('open + len')
+    assert expr.variables == ('len', 'open')
+    assert expr.evaluate(open=1, len=2) == 3
+#endregion
+
+#region folding
+def test_constants_fold():
+    expr = expressions.compile_expression('2*math.pi + sqrt(4) + x')
+    assert not expr.is_constant
+    assert expressions.compile_expression('2*math.pi + sqrt(4)').is_constant
+
+@pytest.mark.parametrize('text', ['9**9**9', '9**1000*9**1000*9**1000*9**1000*9**1000', 'factorial(1000)', '2**5000'])
+def test_huge_ints_are_not_folded(text:str):
+    tree = expressions.compile_expression(text).tree
+    assert not (isinstance(tree, Num) and isinstance(tree.value, int) and tree.value.bit_length() > expressions._FOLD_INT_BITS)
+
+def test_complex_is_not_folded():
+    expr = expressions.compile_expression('(-8)**(1/3)')
+    assert not expr.is_constant
+    assert isinstance(expr.evaluate(), complex) # as python evaluates it, only not baked in at compile time
+
+def test_folded_source_evaluates_the_same():
+    for text in ('2-(3-4)', '2/(3*4)', '-(2**2)', '(-2)**2', '2**-1', '(1+2)*x', 'x-(1-2)', '-x**2'):
+        expr = expressions.compile_expression(text)
+        assert expr.evaluate(x=3) == pytest.approx(eval(text.replace('x', '3')))
+#endregion
+
+#region cache
+def test_cache_shares_normalized_key():
+    cache = ExpressionCache()
+    a = cache.compile('math.sin( 1 )')
+    b = cache.compile('sin(1)')
+    assert a is b
+    assert cache.cache_info()['hits'] == 1
+
+@pytest.mark.parametrize('malformed, lookalike', [('1 2', '12'), ('x y', 'xy'), ('2 .5', '2.5'), ('2* *3', '2**3'), ('2/ /3', '2//3')])
+def test_malformed_rejected_with_lookalike_cached(malformed:str, lookalike:str):
+    cache = ExpressionCache()
+    with pytest.raises(ExpressionError):
+        cache.compile(malformed)
+    cache.compile(lookalike)
+    with pytest.raises(ExpressionError):
+        cache.compile(malformed)
+    assert len(cache) == 1
+
+def test_normalize_round_trips():
+    for text in ('1+2*3', 'sin(x)**2+cos(x)**2', '2**-1', '-(-x)', 'log(8, 2)', '1e-05*x', '.5//2%3'):
+        tokens = expressions.tokenize(text)
+        again = expressions.tokenize(expressions.normalize(tokens))
+        assert [(k, v) for k, v, _ in again] == [(k, v) for k, v, _ in tokens]
+
+def test_cache_clear_and_eviction():
+    cache = ExpressionCache(maxsize=2)
+    cache.compile('x+1')
+    cache.compile('x+2')
+    cache.compile('x+1')
+    cache.compile('x+3') # evicts x+2, the least recently used
+    assert cache.cache_info() == {'hits':1, 'misses':3, 'evictions':1, 'size':2, 'maxsize':2}
+    cache.compile('x+2')
+    assert cache.cache_info()['misses'] == 4
+    cache.maxsize = 1
+    assert len(cache) == 1
+    cache.cache_clear()
+    assert cache.cache_info() == {'hits':0, 'misses':0, 'evictions':0, 'size':0, 'maxsize':1}
+    expr = cache.compile('x+2') # recompiled after the clear
+    assert cache.cache_info()['misses'] == 1 and expr.evaluate(x=1) == 3
+
+def test_parse_errors_are_not_cached():
+    cache = ExpressionCache()
+    for _ in range(2):
+        with pytest.raises(ExpressionError):
+            cache.compile('2+')
+    assert len(cache) == 0
+#endregion
+
+#region arrays
+def test_evaluate_array_matches_scalar():
+    import numpy as np
+    x = np.linspace(-3, 3, 101)
+    for text in ('x**3 - 2*x', 'sin(x)*exp(-x)', 'hypot(x, 2)', 'log(x**2+1, 2)', 'floor(x)%2', 'abs(x)//1'):
+        expr = expressions.compile_expression(text)
+        want = [expr.evaluate(x=float(v)) for v in x]
+        np.testing.assert_allclose(expr.evaluate_array(x=x), want, rtol=1e-12)
+
+def test_evaluate_array_float64_and_shape():
+    import numpy as np
+    out = expressions.compile_expression('x*y + 1').evaluate_array(x=np.arange(3)[:, None], y=np.arange(4))
+    assert out.dtype == np.float64 and out.shape == (3, 4)
+    assert expressions.compile_expression('5').evaluate_array(x=np.zeros(7)).shape == (7,)
+    # int inputs are cast before the arithmetic, so no integer overflow or floor division surprises
+    assert expressions.compile_expression('x**40').evaluate_array(x=np.array([10]))[0] == pytest.approx(1e40)
+
+def test_evaluate_array_domain_errors_are_nan():
+    import numpy as np
+    x = np.array([-1.0, 0.0, 4.0])
+    np.testing.assert_array_equal(expressions.compile_expression('sqrt(x)').evaluate_array(x=x), [np.nan, 0, 2])
+    np.testing.assert_array_equal(expressions.compile_expression('1/x').evaluate_array(x=x), [-1, np.inf, .25])
+    # left unfolded as complex / huge int; NaN and inf in float64, never a silently real or hanging result
+    assert np.isnan(expressions.compile_expression('(-8)**(1/3)*x').evaluate_array(x=x)).all()
+    assert np.isinf(expressions.compile_expression('9**9**9*x').evaluate_array(x=x[2:])).all()
+
+def test_chunks_give_the_same_result():
+    import numpy as np
+    x = np.linspace(-5, 5, 1001)
+    expr = expressions.compile_expression('sin(x)/x')
+    np.testing.assert_array_equal(expr.evaluate_array(x=x, chunk_size=64), expr.evaluate_array(x=x))
+#endregion
+
+#region incremental compile
+def _fresh(text:str):
+    '''value of text compiled from scratch, or the error type'''
+    try:
+        return ExpressionCache().compile(text).evaluate(x=.7)
+    except ExpressionError:
+        return ExpressionError
+
+def test_typing_matches_fresh_compiles():
+    # each prefix reuses the tokens and bracket groups of the one before
+    cache = ExpressionCache()
+    for formula in ('math.sqrt((1+2)*(3+4.5e-1))+sin(x)**2-(2*(3+x))', '1e+5*2+(1.5e3)', 'log((x+1)*(x+2), 10)//1'):
+        for i in range(1, len(formula)+1):
+            text = formula[:i]
+            try:
+                got = cache.compile(text).evaluate(x=.7)
+            except ExpressionError:
+                got = ExpressionError
+            want = _fresh(text)
+            assert got == want or (got == pytest.approx(want)), text
+
+def test_edits_in_the_middle():
+    cache = ExpressionCache()
+    assert cache.compile('(1+2)*(3+4)').evaluate() == 21
+    assert cache.compile('(1+2)*(3+5)').evaluate() == 24
+    with pytest.raises(ExpressionError):
+        cache.compile('(1+2)*(3 5)')
+    assert cache.compile('(1+9)*(3+5)').evaluate() == 80
+    assert cache.compile('(1+2)*(3+4)').evaluate() == 21
+    cache.cache_clear()
+    assert cache.compile('(1+2)*(3+4)').evaluate() == 21
+#endregion
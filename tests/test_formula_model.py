@@ -0,0 +1,116 @@
+'''
+Tests of the token list behind the calculator display
+
+    python -m pytest tests
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys
+import pytest
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+import expressions
+from formula_model import FormulaModel, int_text
+
+def _typed(*keys:str) -> FormulaModel:
+    model = FormulaModel()
+    for key in keys:
+        model.append(key)
+    return model
+
+def test_expression_html_and_text_agree():
+    model = _typed('2', '+')
+    model.sqrt_open()
+    model.append('9')
+    model.close()
+    assert model.expression == '2+math.sqrt(9)'
+    assert model.text == '2+√ 9 '
+    assert '&radic;' in model.html and 'overline' in model.html
+    assert expressions.evaluate(model.expression) == 5
+
+def test_edits():
+    model = _typed('2')
+    edit = model.append('+')
+    assert edit.at == 'end' and [t.formula for t in edit.tokens] == ['+']
+    start, end = model.wrap('math.sin(', 'Sin(')
+    assert start.at == 'start' and end.at == 'end'
+    assert model.expression == 'math.sin(2+)'
+    assert model.text == 'Sin(2+)'
+
+def test_groups_close_innermost_first():
+    model = FormulaModel()
+    model.sqrt_open()
+    model.append('(')
+    model.append('4')
+    model.close()
+    model.close()
+    assert model.expression == 'math.sqrt((4))'
+    # a surplus ')' is kept (the engine reports it) but closes nothing
+    model.close()
+    assert model.expression == 'math.sqrt((4)))'
+
+@pytest.mark.parametrize('key', ['7', '.', '('])
+def test_result_restarts_on_a_number(key:str):
+    model = _typed('2', '*', '3')
+    model.set_result(6)
+    edit = model.append(key)
+    assert edit.at == 'replace'
+    assert model.expression == key
+
+def test_result_restarts_on_sqrt():
+    model = FormulaModel()
+    model.set_result(6)
+    assert model.sqrt_open().at == 'replace'
+    assert model.expression == 'math.sqrt('
+
+@pytest.mark.parametrize('key', ['+', '*', '**', '%'])
+def test_result_continues_on_an_operator(key:str):
+    model = FormulaModel()
+    model.set_result(6)
+    assert model.append(key).at == 'end'
+    model.append('2')
+    assert model.expression == f'6{key}2'
+
+def test_negative_and_float_results():
+    model = FormulaModel()
+    model.set_result(-2)
+    model.append('**')
+    model.append('2')
+    assert expressions.evaluate(model.expression) == 4
+    model.set_result(0.1+0.2)
+    assert expressions.evaluate(model.expression) == 0.1+0.2 # repr, not the display text, goes on
+
+def test_huge_int_results():
+    model = FormulaModel()
+    model.set_result(9**5000) # past python's int to str limit
+    assert model.text == '1.631350185e+4771'
+    model.set_result(-(10**4500))
+    assert model.text == '(-1.000000000e+4500)'
+    model.set_result(2**100)
+    assert model.text == str(2**100)
+    assert int_text(7**100000) == '6.367976113e+84509'
+
+@pytest.mark.parametrize('value', [0, 7, -7, 10**19, 10**20-1, -(10**20-1)])
+def test_int_text_short(value:int):
+    assert int_text(value, max_digits=20) == str(value)
+
+@pytest.mark.parametrize('value, text', [
+    (10**20, '1.000000000e+20'), (-(10**25)+1, '-9.999999999e+24'), (123456789012345678901, '1.234567890e+20'),
+])
+def test_int_text_scientific(value:int, text:str):
+    assert int_text(value, max_digits=20) == text
+
+def test_closed_expression():
+    model = FormulaModel()
+    model.sqrt_open()
+    model.append('(')
+    model.append('2')
+    assert model.closed_expression == 'math.sqrt((2))'
+    assert model.expression == 'math.sqrt((2'
+    model.close()
+    model.close()
+    assert model.closed_expression == model.expression
@@ -0,0 +1,38 @@
+'''
+Tests of the adaptive sampling behind the Graph tab
+
+    python -m pytest tests
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys
+import numpy as np
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+import expressions
+from function_plot import adaptive_sample, TileSampleCache
+
+def _mirrored(x:np.ndarray, y:np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    '''the samples of an odd function reflected through the origin, in x order'''
+    return -x[::-1], -y[::-1]
+
+def test_adaptive_sample_odd_function_is_symmetric():
+    func = lambda x: expressions.compile_expression('x**3 - 2*x').evaluate_array(x=x)
+    for clip in (True, False):
+        x, y, _ = adaptive_sample(func, -10, 10, (-20, 20), clip=clip)
+        mx, my = _mirrored(x, y)
+        np.testing.assert_allclose(x, mx, atol=1e-12)
+        np.testing.assert_allclose(y, my, atol=1e-9)
+
+def test_tiles_refine_below_zero_like_above():
+    # tiles are sampled against (0, y span); the part of tan(x) under the axis must be refined as finely as above it
+    tiles = TileSampleCache()
+    x, y, _ = tiles.sample(expressions.compile_expression('tan(x)'), -8, 8, (-20, 20))
+    finite = np.isfinite(y)
+    with np.errstate(invalid='ignore'):
+        above, below = int((finite & (y > 0)).sum()), int((finite & (y < 0)).sum())
+    assert abs(above-below) <= .05*max(above, below)
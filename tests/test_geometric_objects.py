@@ -0,0 +1,57 @@
+'''
+Tests of the Line_Segment and Triangle geometry
+
+    python -m pytest tests
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys
+import pytest
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+
+# ---- Local addins
+from geometric_objects import Line_Segment, Triangle
+
+def _line(start:tuple, end:tuple) -> Line_Segment:
+    line = Line_Segment()
+    line.solve_points(start, end)
+    return line
+
+# slope is rise over run, m=(y₂-y₁)/(x₂-x₁); vertical lines (no run) give the equation as a string
+@pytest.mark.parametrize('start, end, slope, y_intercept', [
+    ((0, 1), (2, 1), 0.0, 1.0),    # horizontal
+    ((0, 1), (2, 5), 2.0, 1.0),
+    ((3, 3), (1, -1), 2.0, -3.0),  # same line either way round
+    ((2, 0), (0, 1), -0.5, 1.0),
+])
+def test_slope(start, end, slope, y_intercept):
+    line = _line(start, end)
+    assert line.slope == slope
+    assert line.y_intercept == y_intercept
+
+def test_vertical_slope_is_a_string():
+    line = _line((1, 0), (1, 3))
+    assert line.slope == '3.0/0.0'
+    assert line.y_intercept == '0.0-(3.0/0.0*1.0)'
+
+def test_unsolved_line():
+    assert Line_Segment().slope is None
+
+def test_triangle_coords_are_lists():
+    # cached per solve, but each call hands out new lists like before the cache
+    t = Triangle()
+    t.solve_SSS(3, 4, 5)
+    assert t.triangle_coords == [(0.0, 0.0), (4.0, 3.0), (4.0, 0.0)]
+    assert t.triangle_midpoint_coords == [(4.0, 1.5), (2.0, 0.0), (2.0, 1.5)]
+    x, y = t.triangle_matplotlib_coords
+    assert (x, y) == ([0.0, 4.0, 4.0], [0.0, 3.0, 0.0])
+    assert t.triangle_matplotlib_midpoint_coords == [[4.0, 2.0, 2.0], [1.5, 0.0, 1.5]]
+    x.append(x[0]) # closing the polygon for a plot
+    t.triangle_coords.clear()
+    assert t.triangle_matplotlib_coords == [[0.0, 4.0, 4.0], [0.0, 3.0, 0.0]]
+    assert len(t.triangle_coords) == 3
+    t.solve_SSS(5, 5, 5)
+    assert t.triangle_coords[1] == pytest.approx((2.5, 4.33), abs=1e-2) # recomputed after a new solve
@@ -0,0 +1,147 @@
+'''
+Tests of the SQLite calculation history and the list model paging it in
+
+    python -m pytest tests
+'''
+# =============================================================================
+# CODE IMPORTS
+# =============================================================================
+import os, sys
+import pytest
+
+PTH_APP = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.join(PTH_APP, 'data'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# ---- Local addins
+from history_store import HistoryStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path/'history.sqlite3'), batch_size=4, flush_interval=.05)
+    yield store
+    store.close()
+
+def _fill(store:HistoryStore, formulas:list[str]) -> list[int]:
+    ids = [store.add(f, '1', f) for f in formulas]
+    store.flush()
+    return ids
+
+#region store
+def test_rows_are_written_and_paged(store):
+    ids = _fill(store, [f'sin({i})' for i in range(10)])
+    assert ids == list(range(1, 11)) and len(store) == 10
+    first = store.page(limit=4)
+    assert [r.id for r in first] == [10, 9, 8, 7]
+    assert [r.id for r in store.page(first[-1].id, limit=4)] == [6, 5, 4, 3]
+    assert [r.id for r in store.page(3, limit=4)] == [2, 1]
+
+def test_rows_survive_a_reopen(tmp_path):
+    path = str(tmp_path/'history.sqlite3')
+    with_rows = HistoryStore(path)
+    _fill(with_rows, ['1+1', '2+2'])
+    with_rows.close()
+    again = HistoryStore(path)
+    assert again.last_id == 2 and again.add('3+3', '6', '3+3') == 3
+    again.close()
+    assert [r.text for r in HistoryStore(path).page()] == ['3+3', '2+2', '1+1']
+
+def test_search(store):
+    _fill(store, ['asin(0.5)', 'asinh(2)', 'sin(x)', 'sqrt(2)+asin(1)'])
+    assert [r.formula for r in store.search('asin')] == ['sqrt(2)+asin(1)', 'asin(0.5)']
+    assert {r.formula for r in store.search('as*')} == {'asin(0.5)', 'asinh(2)', 'sqrt(2)+asin(1)'}
+    assert [r.formula for r in store.search('sqrt asin')] == ['sqrt(2)+asin(1)']
+    assert store.search('cos') == []
+
+@pytest.mark.parametrize('term', ['', '   ', '*', '**', '()', '( )', '"'])
+def test_empty_search(store, term:str):
+    _fill(store, ['asin(0.5)'])
+    assert store.search(term) == []
+
+@pytest.mark.parametrize('term', ['"', '""', "'", '%', '_', '\\', '-', '+', '^', ':', '.', ',', '"asin', 'a"s',
+                                  'NOT', 'AND', 'OR', 'NEAR', 'asin OR', 'NEAR(', 'formula:asin', '{', '@', '*asin'])
+def test_special_character_search(store, term:str):
+    # the query is passed to FTS5 as quoted strings, never as its query syntax
+    _fill(store, ['asin(0.5)', '2%3', 'x_1+1'])
+    for full_text in (store.full_text, False):
+        store._HistoryStore__fts = full_text # the LIKE fallback too
+        assert isinstance(store.search(term), list)
+
+def test_like_fallback(store):
+    _fill(store, ['asin(0.5)', '2%3', 'x_1+1', 'x1+1'])
+    store._HistoryStore__fts = False
+    assert [r.formula for r in store.search('%')] == ['2%3']
+    assert [r.formula for r in store.search('x_')] == ['x_1+1']
+    assert [r.formula for r in store.search('asi*')] == ['asin(0.5)']
+
+def test_two_stores_on_one_file(tmp_path):
+    path = str(tmp_path/'history.sqlite3')
+    a, b = HistoryStore(path), HistoryStore(path)
+    # both hand out ids 1 and 2; the second batch written moves past the first
+    _fill(a, ['a1', 'a2'])
+    _fill(b, ['b1', 'b2'])
+    assert [r.text for r in a.page()] == ['b2', 'b1', 'a2', 'a1']
+    assert b.last_id == 4
+    a.close()
+    b.close()
+
+def test_closed_store(store):
+    store.close()
+    with pytest.raises(ValueError):
+        store.add('1', '1', '1')
+    store.close() # twice is fine
+#endregion
+
+#region list model
+@pytest.fixture
+def saved(store):
+    _fill(store, [f'{i}+0' for i in range(1, 11)]) # ids 1..10
+    return store
+
+def _ids(model) -> list[int]:
+    from PyQt5.QtCore import Qt
+    return [int(model.index(i).data(Qt.ItemDataRole.UserRole)[0].split('+')[0]) for i in range(model.rowCount())]
+
+def test_model_pages_saved_rows_in(saved):
+    from generic_widgets import QHistoryListModel
+    model = QHistoryListModel(limit=5, store=saved)
+    model.PAGE = 2
+    while model.canFetchMore():
+        model.fetchMore()
+    assert _ids(model) == [10, 9, 8, 7, 6]
+
+def test_model_edits_after_a_page_rollover(saved):
+    from generic_widgets import QHistoryListModel
+    model = QHistoryListModel(limit=5, store=saved)
+    model.PAGE = 2
+    while model.canFetchMore():
+        model.fetchMore()
+    # full: each new calculation drops the oldest row off the bottom
+    for i in range(11, 14):
+        model.add(f'{i}+0', '1')
+    assert _ids(model) == [13, 12, 11, 10, 9]
+    assert not model.canFetchMore()
+    # room again: the rows that dropped off are paged back in, once and in order
+    model.limit = 9
+    while model.canFetchMore():
+        model.fetchMore()
+    assert _ids(model) == [13, 12, 11, 10, 9, 8, 7, 6, 5]
+    model.limit = 20
+    while model.canFetchMore():
+        model.fetchMore()
+    assert _ids(model) == list(range(13, 0, -1))
+    saved.flush()
+    assert len(saved) == 13
+
+def test_model_shrinking_limit_pages_back(saved):
+    from generic_widgets import QHistoryListModel
+    model = QHistoryListModel(limit=10, store=saved)
+    while model.canFetchMore():
+        model.fetchMore()
+    model.limit = 3
+    assert _ids(model) == [10, 9, 8]
+    model.limit = 5
+    while model.canFetchMore():
+        model.fetchMore()
+    assert _ids(model) == [10, 9, 8, 7, 6]
+#endregion